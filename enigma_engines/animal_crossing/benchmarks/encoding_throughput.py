@@ -0,0 +1,181 @@
+"""
+Steps per second of the dict interface versus the encoded interface.
+
+Both paths apply the same actions through `ACNHEnvironment.step`; they differ
+in how a model-ready observation is produced. The dict path calls `get_state()`
+and converts the nested dict into arrays the way a training loop would, while
+the encoded path writes every environment into preallocated buffers with one
+`encode_batch()` call. Besides end-to-end steps per second, the time spent
+producing observations is reported on its own, since both paths share the
+action sampling and `step()` cost.
+
+Run with:
+    python -m enigma_engines.animal_crossing.benchmarks.encoding_throughput
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+import numpy as np
+
+from enigma_engines.animal_crossing.core.encoding import (
+    ActionDecoder,
+    ObservationEncoder,
+)
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+from enigma_engines.animal_crossing.core.load_data import ACNHItemDataset
+
+
+def _make_envs(dataset, batch_size, num_villagers, seed):
+    random.seed(seed)
+    return [
+        ACNHEnvironment(
+            num_villagers=num_villagers,
+            dataset=dataset,
+            villager_addition_percentage=0.0,
+        )
+        for _ in range(batch_size)
+    ]
+
+
+def _state_to_arrays(state):
+    """Naive conversion of a `get_state()` dict into arrays, as a trainer would do."""
+    island = np.array(
+        [
+            state["current_day"],
+            state["bells"],
+            state["nook_miles"],
+            state["avg_friendship"],
+            state["turnips_owned"],
+            state["turnip_buy_price"],
+            state["turnip_sell_price"],
+            state["current_turnip_saturation"],
+            state["current_catch_probability"],
+            state["current_villager_count"],
+        ],
+        dtype=np.float32,
+    )
+    friendship = np.array(list(state["villagers_friendship"].values()), np.float32)
+    tasks = np.array(
+        [
+            [task.get("miles", 0), task["criteria"].get("quantity") or 0]
+            for task in state["active_nook_tasks"].values()
+        ],
+        dtype=np.float32,
+    )
+    plots = np.array(
+        [
+            [plot["crop_name"] is not None, plot["ready_day"]]
+            for plot in state["farm_plots"].values()
+        ],
+        dtype=np.float32,
+    )
+    return island, friendship, tasks, plots
+
+
+def _sample_action_ids(decoder, envs, rng):
+    actor_slots = []
+    action_ids = []
+    for env in envs:
+        actor_slot = int(rng.integers(len(env.villagers)))
+        valid_ids = np.flatnonzero(decoder.action_mask(env, actor_slot))
+        actor_slots.append(actor_slot)
+        action_ids.append(int(rng.choice(valid_ids)))
+    return actor_slots, action_ids
+
+
+def run_dict_interface(envs, decoder, num_steps, seed):
+    rng = np.random.default_rng(seed)
+    observe_seconds = 0.0
+    start = time.perf_counter()
+    for step in range(num_steps):
+        observe_start = time.perf_counter()
+        states = [env.get_state() for env in envs]
+        for state in states:
+            _state_to_arrays(state)
+        observe_seconds += time.perf_counter() - observe_start
+        actor_slots, action_ids = _sample_action_ids(decoder, envs, rng)
+        for env, state, actor_slot, action_id in zip(
+            envs, states, actor_slots, action_ids
+        ):
+            action = decoder.decode(env, actor_slot, action_id)
+            action = dict(action, observed_day=state["current_day"])
+            env.step(action, env.villagers[actor_slot])
+        if step % 10 == 9:
+            for env in envs:
+                env.advance_day_cycle()
+    num_env_steps = len(envs) * num_steps
+    return (
+        num_env_steps / (time.perf_counter() - start),
+        observe_seconds / num_env_steps,
+    )
+
+
+def run_encoded_interface(envs, encoder, decoder, num_steps, seed):
+    rng = np.random.default_rng(seed)
+    buffers = encoder.allocate(len(envs))
+    observe_seconds = 0.0
+    start = time.perf_counter()
+    for step in range(num_steps):
+        observe_start = time.perf_counter()
+        encoder.encode_batch(envs, buffers)
+        observe_seconds += time.perf_counter() - observe_start
+        actor_slots, action_ids = _sample_action_ids(decoder, envs, rng)
+        actions = decoder.decode_batch(envs, actor_slots, action_ids)
+        for env, actor_slot, action in zip(envs, actor_slots, actions):
+            env.step(action, env.villagers[actor_slot])
+        if step % 10 == 9:
+            for env in envs:
+                env.advance_day_cycle()
+    num_env_steps = len(envs) * num_steps
+    return (
+        num_env_steps / (time.perf_counter() - start),
+        observe_seconds / num_env_steps,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--villagers", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    dataset = ACNHItemDataset()
+    encoder = ObservationEncoder(max_villagers=args.villagers)
+    decoder = ActionDecoder(max_villagers=args.villagers)
+
+    # The environment still prints debug output for some actions; keep it off the report.
+    with contextlib.redirect_stdout(io.StringIO()):
+        envs = _make_envs(dataset, args.batch_size, args.villagers, args.seed)
+        dict_sps, dict_observe = run_dict_interface(
+            envs, decoder, args.steps, args.seed
+        )
+        envs = _make_envs(dataset, args.batch_size, args.villagers, args.seed)
+        encoded_sps, encoded_observe = run_encoded_interface(
+            envs, encoder, decoder, args.steps, args.seed
+        )
+
+    print(
+        f"Batch size {args.batch_size}, {args.villagers} villagers, {args.steps} steps"
+    )
+    print(
+        f"  dict interface:    {dict_sps:,.0f} steps/s, "
+        f"{dict_observe * 1e6:.1f} us/observation"
+    )
+    print(
+        f"  encoded interface: {encoded_sps:,.0f} steps/s, "
+        f"{encoded_observe * 1e6:.1f} us/observation"
+    )
+    print(
+        f"  speedup:           {encoded_sps / dict_sps:.2f}x steps, "
+        f"{dict_observe / encoded_observe:.2f}x observations"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Load test of the ACNH environment server.
+
+Starts `remote.server` on a Unix socket in a subprocess, then opens several
+client connections. Each connection creates its islands and keeps
+`--pipeline` step batches in flight: every batch steps each of the
+connection's islands once with a random action (ADVANCE_DAY_ACTION with
+probability `--day-probability`). The report gives the steps per second the
+server sustained and the per-batch round-trip latency percentiles.
+
+Run with:
+    python -m enigma_engines.animal_crossing.benchmarks.env_server_load
+    python -m enigma_engines.animal_crossing.benchmarks.env_server_load --connections 4 --envs 64 --pipeline 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from enigma_engines.animal_crossing.remote.client import EnvironmentClient, make_steps
+from enigma_engines.animal_crossing.remote.protocol import ADVANCE_DAY_ACTION
+
+
+def _start_server(socket_path: str, max_villagers: int, data_path: str):
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "enigma_engines.animal_crossing.remote.server",
+            "--socket",
+            socket_path,
+            "--max-villagers",
+            str(max_villagers),
+            "--data-path",
+            data_path,
+        ],
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    line = process.stderr.readline()
+    if not line.startswith("Listening on"):
+        process.kill()
+        raise RuntimeError(f"Environment server failed to start: {line.strip()}")
+    return process
+
+
+async def _drive_connection(
+    socket_path: str,
+    seed: int,
+    num_envs: int,
+    num_villagers: int,
+    pipeline: int,
+    day_probability: float,
+    deadline: float,
+    latencies: List[float],
+) -> int:
+    rng = np.random.default_rng(seed)
+    steps = 0
+    async with await EnvironmentClient.connect(socket_path) as client:
+        env_ids = []
+        for index in range(num_envs):
+            env_id, _ = await client.create(num_villagers, seed * 10_000 + index)
+            env_ids.append(env_id)
+
+        async def lane():
+            nonlocal steps
+            while time.perf_counter() < deadline:
+                action_ids = rng.integers(0, client.num_actions, num_envs)
+                action_ids[rng.random(num_envs) < day_probability] = ADVANCE_DAY_ACTION
+                batch = make_steps(
+                    env_ids, rng.integers(0, num_villagers, num_envs), action_ids
+                )
+                start = time.perf_counter()
+                await client.step(batch)
+                latencies.append(time.perf_counter() - start)
+                steps += num_envs
+
+        await asyncio.gather(*(lane() for _ in range(pipeline)))
+    return steps
+
+
+async def _load(
+    socket_path: str,
+    connections: int,
+    num_envs: int,
+    num_villagers: int,
+    pipeline: int,
+    day_probability: float,
+    duration: float,
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    start = time.perf_counter()
+    deadline = start + duration
+    steps = await asyncio.gather(
+        *(
+            _drive_connection(
+                socket_path,
+                seed,
+                num_envs,
+                num_villagers,
+                pipeline,
+                day_probability,
+                deadline,
+                latencies,
+            )
+            for seed in range(connections)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    latency_ms = np.asarray(latencies) * 1e3
+    return {
+        "steps": int(sum(steps)),
+        "batches": len(latencies),
+        "seconds": elapsed,
+        "steps_per_second": sum(steps) / elapsed,
+        "latency_ms": {
+            "p50": float(np.percentile(latency_ms, 50)),
+            "p90": float(np.percentile(latency_ms, 90)),
+            "p99": float(np.percentile(latency_ms, 99)),
+            "max": float(latency_ms.max()),
+        },
+    }
+
+
+def run_load_test(
+    connections: int = 2,
+    num_envs: int = 32,
+    num_villagers: int = 10,
+    pipeline: int = 4,
+    day_probability: float = 0.02,
+    duration: float = 10.0,
+    max_villagers: int = 100,
+    data_path: str = "data",
+) -> Dict[str, Any]:
+    """Starts a server, drives it for `duration` seconds and returns a report."""
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = os.path.join(tmp, "acnh.sock")
+        process = _start_server(socket_path, max_villagers, data_path)
+        try:
+            report = asyncio.run(
+                _load(
+                    socket_path,
+                    connections,
+                    num_envs,
+                    num_villagers,
+                    pipeline,
+                    day_probability,
+                    duration,
+                )
+            )
+        finally:
+            process.terminate()
+            process.wait()
+    report.update(
+        connections=connections,
+        envs_per_connection=num_envs,
+        villagers=num_villagers,
+        pipeline=pipeline,
+        max_villagers=max_villagers,
+    )
+    return report
+
+
+def print_report(report: Dict[str, Any]):
+    latency = report["latency_ms"]
+    print(
+        f"{report['connections']} connections x {report['envs_per_connection']} "
+        f"islands ({report['villagers']} villagers), pipeline depth "
+        f"{report['pipeline']}, observations padded to "
+        f"{report['max_villagers']} villagers"
+    )
+    print(
+        f"{report['steps']:,} steps in {report['batches']:,} batches over "
+        f"{report['seconds']:.1f}s: {report['steps_per_second']:,.0f} steps/s"
+    )
+    print(
+        f"Batch latency p50 {latency['p50']:.2f} ms, p90 {latency['p90']:.2f} ms, "
+        f"p99 {latency['p99']:.2f} ms, max {latency['max']:.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--connections", type=int, default=2)
+    parser.add_argument("--envs", type=int, default=32, help="Islands per connection.")
+    parser.add_argument("--villagers", type=int, default=10)
+    parser.add_argument(
+        "--pipeline", type=int, default=4, help="Batches in flight per connection."
+    )
+    parser.add_argument("--day-probability", type=float, default=0.02)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--max-villagers", type=int, default=100)
+    parser.add_argument("--data-path", default="data")
+    parser.add_argument(
+        "--output", help="Also write the full report to this JSON file."
+    )
+    args = parser.parse_args()
+
+    report = run_load_test(
+        args.connections,
+        args.envs,
+        args.villagers,
+        args.pipeline,
+        args.day_probability,
+        args.duration,
+        args.max_villagers,
+        args.data_path,
+    )
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
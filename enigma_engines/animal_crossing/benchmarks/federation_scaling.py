@@ -0,0 +1,155 @@
+"""
+Throughput of `federation.Federation` as the process count grows.
+
+Plays the same seeded federation once per process count and reports the
+simulated island-days per second of the daily loop (startup excluded), the
+speedup over the first count, and the trade and migration volume. Every run
+plays the same trajectory, so the totals double as a consistency check.
+
+Run with:
+    python -m enigma_engines.animal_crossing.benchmarks.federation_scaling
+    python -m enigma_engines.animal_crossing.benchmarks.federation_scaling --islands 400 --processes 1 2 4 8
+"""
+
+import argparse
+import json
+import os
+from typing import Any, Dict, List
+
+from enigma_engines.animal_crossing.federation import Federation
+
+
+def _play(
+    num_islands: int,
+    processes: int,
+    days: int,
+    num_villagers: int,
+    max_villagers: int,
+    migration_rate: float,
+    seed: int,
+    data_path: str,
+) -> Dict[str, Any]:
+    with Federation(
+        num_islands,
+        processes=processes,
+        num_villagers=num_villagers,
+        max_villagers=max_villagers,
+        migration_rate=migration_rate,
+        seed=seed,
+        data_path=data_path,
+    ) as federation:
+        migrants = fish_shipped = turnips_shipped = 0
+        result: Dict[str, Any] = {}
+        seconds = 0.0
+        for _ in range(days):
+            result = federation.run(1)
+            seconds += result["seconds"]
+            migrants += result["migrants"]
+            fish_shipped += result["fish_shipped"]
+            turnips_shipped += result["turnips_shipped"]
+    return {
+        "processes": processes,
+        "seconds": seconds,
+        "island_days_per_second": num_islands * days / max(seconds, 1e-9),
+        "villagers": result["villagers"],
+        "bells": result["bells"],
+        "migrants": migrants,
+        "fish_shipped": fish_shipped,
+        "turnips_shipped": turnips_shipped,
+    }
+
+
+def run_scaling(
+    num_islands: int,
+    process_counts: List[int],
+    days: int,
+    num_villagers: int = 10,
+    max_villagers: int = 100,
+    migration_rate: float = 0.05,
+    seed: int = 0,
+    data_path: str = "data",
+) -> Dict[str, Any]:
+    """Plays the federation once per process count and returns a report."""
+    runs = [
+        _play(
+            num_islands,
+            processes,
+            days,
+            num_villagers,
+            max_villagers,
+            migration_rate,
+            seed,
+            data_path,
+        )
+        for processes in process_counts
+    ]
+    baseline = runs[0]["island_days_per_second"]
+    for run in runs:
+        run["speedup"] = run["island_days_per_second"] / baseline
+    return {
+        "islands": num_islands,
+        "days": days,
+        "villagers": num_villagers,
+        "cpu_count": os.cpu_count(),
+        "runs": runs,
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(
+        f"{report['islands']} islands x {report['days']} days "
+        f"({report['villagers']} initial villagers each), "
+        f"{report['cpu_count']} CPUs"
+    )
+    print(
+        f"{'procs':>5} {'island-days/s':>14} {'speedup':>8} {'seconds':>8} "
+        f"{'migrants':>9} {'fish':>7} {'turnips':>8} {'bells':>13}"
+    )
+    for run in report["runs"]:
+        print(
+            f"{run['processes']:>5} {run['island_days_per_second']:>14,.1f} "
+            f"{run['speedup']:>7.2f}x {run['seconds']:>8.2f} "
+            f"{run['migrants']:>9,} {run['fish_shipped']:>7,} "
+            f"{run['turnips_shipped']:>8,} {run['bells']:>13,}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--islands", type=int, default=100)
+    parser.add_argument(
+        "--processes",
+        type=int,
+        nargs="+",
+        default=[0, 1, 2, 4],
+        help="Process counts to compare; 0 plays every island in-process.",
+    )
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--villagers", type=int, default=10)
+    parser.add_argument("--max-villagers", type=int, default=100)
+    parser.add_argument("--migration-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-path", default="data")
+    parser.add_argument(
+        "--output", help="Also write the full report to this JSON file."
+    )
+    args = parser.parse_args()
+
+    report = run_scaling(
+        args.islands,
+        args.processes,
+        args.days,
+        args.villagers,
+        args.max_villagers,
+        args.migration_rate,
+        args.seed,
+        args.data_path,
+    )
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
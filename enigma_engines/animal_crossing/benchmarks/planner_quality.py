@@ -0,0 +1,159 @@
+"""
+Solution quality and decision throughput of RolloutPlanner versus the greedy agent.
+
+Both agents play the same seeded islands for the same number of days through
+`run_day`. For each seed the report gives the final bells, Nook Miles, average
+friendship and the combined objective (`planner.evaluate_state`), plus decisions
+per second, so planning gains can be weighed against their cost.
+
+Run with:
+    python -m enigma_engines.animal_crossing.benchmarks.planner_quality
+    python -m enigma_engines.animal_crossing.benchmarks.planner_quality --workers 4 --rollouts 64
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+from enigma_engines.animal_crossing.core.agent import Multi_Objective_Agent
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+from enigma_engines.animal_crossing.core.load_data import ACNHItemDataset
+from enigma_engines.animal_crossing.core.planner import RolloutPlanner, evaluate_state
+from enigma_engines.animal_crossing.simulation import run_day
+
+
+def _play(
+    dataset: ACNHItemDataset,
+    seed: int,
+    num_villagers: int,
+    days: int,
+    planner_kwargs: Dict[str, Any] = None,
+) -> Dict[str, Any]:
+    random.seed(seed)
+    env = ACNHEnvironment(num_villagers=num_villagers, dataset=dataset)
+    agent = Multi_Objective_Agent(
+        dataset=dataset, num_villagers_on_island=len(env.villagers)
+    )
+    planner = None
+    if planner_kwargs is not None:
+        planner = RolloutPlanner(env, agent, seed=seed, **planner_kwargs)
+
+    decisions = 0
+    start = time.perf_counter()
+    try:
+        for _ in range(days):
+            actions, _ = run_day(env, planner or agent, len(env.villagers))
+            decisions += len(actions)
+    finally:
+        if planner is not None:
+            planner.close()
+    seconds = time.perf_counter() - start
+
+    state = env.get_state()
+    result = {
+        "bells": state["bells"],
+        "nook_miles": state["nook_miles"],
+        "avg_friendship": state["avg_friendship"],
+        "objective": evaluate_state(state, agent.weights),
+        "decisions": decisions,
+        "seconds": seconds,
+        "decisions_per_second": decisions / seconds,
+    }
+    if planner is not None:
+        result["planner"] = planner.stats.to_dict()
+    return result
+
+
+def run_comparison(
+    seeds: List[int],
+    num_villagers: int,
+    days: int,
+    planner_kwargs: Dict[str, Any],
+    data_path: str = "data",
+) -> Dict[str, Any]:
+    """Plays every seed with both agents and returns a JSON-serializable report."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        dataset = ACNHItemDataset(data_path=data_path)
+
+    runs = []
+    for seed in seeds:
+        # The environment prints per-action debug output; keep it off the report.
+        with contextlib.redirect_stdout(io.StringIO()):
+            greedy = _play(dataset, seed, num_villagers, days)
+            planned = _play(dataset, seed, num_villagers, days, planner_kwargs)
+        runs.append({"seed": seed, "greedy": greedy, "planner": planned})
+
+    wins = sum(run["planner"]["objective"] > run["greedy"]["objective"] for run in runs)
+    return {
+        "villagers": num_villagers,
+        "days": days,
+        "planner_config": planner_kwargs,
+        "runs": runs,
+        "planner_wins": wins,
+        "mean_objective_gain": sum(
+            run["planner"]["objective"] - run["greedy"]["objective"] for run in runs
+        )
+        / len(runs),
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(
+        f"{'seed':>5} {'agent':>8} {'objective':>10} {'bells':>9} {'miles':>7} "
+        f"{'friend':>7} {'dec/s':>9}"
+    )
+    for run in report["runs"]:
+        for name in ("greedy", "planner"):
+            result = run[name]
+            print(
+                f"{run['seed']:>5} {name:>8} {result['objective']:>10.2f} "
+                f"{result['bells']:>9,} {result['nook_miles']:>7,} "
+                f"{result['avg_friendship']:>7.1f} "
+                f"{result['decisions_per_second']:>9,.1f}"
+            )
+    print(
+        f"Planner beat greedy on {report['planner_wins']}/{len(report['runs'])} seeds; "
+        f"mean objective gain {report['mean_objective_gain']:+.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--villagers", type=int, default=10)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--candidates", type=int, default=4)
+    parser.add_argument("--horizon", type=int, default=2)
+    parser.add_argument("--rollouts", type=int, default=24)
+    parser.add_argument(
+        "--time-budget", type=float, help="Wall-clock seconds per decision."
+    )
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--data-path", default="data")
+    parser.add_argument(
+        "--output", help="Also write the full report to this JSON file."
+    )
+    args = parser.parse_args()
+
+    planner_kwargs = {
+        "num_candidates": args.candidates,
+        "horizon_days": args.horizon,
+        "rollout_budget": args.rollouts,
+        "time_budget": args.time_budget,
+        "max_workers": args.workers,
+    }
+    report = run_comparison(
+        args.seeds, args.villagers, args.days, planner_kwargs, args.data_path
+    )
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Training cost, fidelity and decision speed of the distilled linear Q policy.
+
+Trains `LinearQPolicy` from teacher rollouts, then plays held-out seeded
+islands with both the teacher (`Multi_Objective_Agent`) and the policy through
+`run_day`. For each seed the report gives the combined objective
+(`planner.evaluate_state`) and the mean time spent inside `choose_action`,
+so the speedup can be weighed against any loss in solution quality.
+
+Run with:
+    python -m enigma_engines.animal_crossing.benchmarks.policy_distillation
+    python -m enigma_engines.animal_crossing.benchmarks.policy_distillation --workers 4 --episodes 32
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+from enigma_engines.animal_crossing.core.agent import Multi_Objective_Agent
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+from enigma_engines.animal_crossing.core.load_data import ACNHItemDataset
+from enigma_engines.animal_crossing.core.planner import evaluate_state
+from enigma_engines.animal_crossing.core.policy import (
+    LinearQPolicy,
+    train_distilled_policy,
+)
+from enigma_engines.animal_crossing.simulation import run_day
+
+
+def _play(
+    dataset: ACNHItemDataset,
+    seed: int,
+    num_villagers: int,
+    days: int,
+    policy: LinearQPolicy = None,
+) -> Dict[str, Any]:
+    random.seed(seed)
+    env = ACNHEnvironment(num_villagers=num_villagers, dataset=dataset)
+    teacher = Multi_Objective_Agent(
+        dataset=dataset, num_villagers_on_island=len(env.villagers)
+    )
+    agent = policy.attach(env) if policy is not None else teacher
+
+    # Time decisions only, not the environment steps between them
+    choose_action = agent.choose_action
+    decision_seconds = 0.0
+    decisions = 0
+
+    def timed_choose_action(*args, **kwargs):
+        nonlocal decision_seconds, decisions
+        start = time.perf_counter()
+        action = choose_action(*args, **kwargs)
+        decision_seconds += time.perf_counter() - start
+        decisions += 1
+        return action
+
+    agent.choose_action = timed_choose_action
+    try:
+        for _ in range(days):
+            run_day(env, agent, len(env.villagers))
+    finally:
+        del agent.choose_action
+
+    state = env.get_state()
+    return {
+        "bells": state["bells"],
+        "nook_miles": state["nook_miles"],
+        "avg_friendship": state["avg_friendship"],
+        "objective": evaluate_state(state, teacher.weights),
+        "decisions": decisions,
+        "decision_us": decision_seconds / max(decisions, 1) * 1e6,
+    }
+
+
+def run_comparison(
+    seeds: List[int],
+    num_villagers: int,
+    days: int,
+    train_kwargs: Dict[str, Any],
+    data_path: str = "data",
+) -> Dict[str, Any]:
+    """Trains the policy, plays every seed with both agents and returns a report."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        dataset = ACNHItemDataset(data_path=data_path)
+        policy, training = train_distilled_policy(
+            data_path=data_path, dataset=dataset, **train_kwargs
+        )
+
+    runs = []
+    for seed in seeds:
+        # The environment prints per-action debug output; keep it off the report.
+        with contextlib.redirect_stdout(io.StringIO()):
+            teacher = _play(dataset, seed, num_villagers, days)
+            distilled = _play(dataset, seed, num_villagers, days, policy)
+        runs.append({"seed": seed, "teacher": teacher, "policy": distilled})
+
+    teacher_us = sum(run["teacher"]["decision_us"] for run in runs) / len(runs)
+    policy_us = sum(run["policy"]["decision_us"] for run in runs) / len(runs)
+    return {
+        "villagers": num_villagers,
+        "days": days,
+        "training": training,
+        "runs": runs,
+        "speedup": teacher_us / policy_us,
+        "mean_objective_gap": sum(
+            run["policy"]["objective"] - run["teacher"]["objective"] for run in runs
+        )
+        / len(runs),
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    training = report["training"]
+    print(
+        f"Trained on {training['train_samples']:,} decisions in "
+        f"{training['collect_seconds'] + training['fit_seconds']:.1f}s; "
+        f"held-out agreement {training.get('eval_agreement', float('nan')):.1%}"
+    )
+    print(
+        f"{'seed':>5} {'agent':>8} {'objective':>10} {'bells':>9} {'miles':>7} "
+        f"{'friend':>7} {'us/dec':>9}"
+    )
+    for run in report["runs"]:
+        for name in ("teacher", "policy"):
+            result = run[name]
+            print(
+                f"{run['seed']:>5} {name:>8} {result['objective']:>10.2f} "
+                f"{result['bells']:>9,} {result['nook_miles']:>7,} "
+                f"{result['avg_friendship']:>7.1f} {result['decision_us']:>9.1f}"
+            )
+    print(
+        f"Policy decisions {report['speedup']:.1f}x faster; "
+        f"mean objective gap {report['mean_objective_gap']:+.3f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[100, 101, 102])
+    parser.add_argument("--villagers", type=int, default=20)
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument("--episodes", type=int, default=16)
+    parser.add_argument("--episode-days", type=int, default=20)
+    parser.add_argument("--epsilon", type=float, default=0.1)
+    parser.add_argument("--ridge", type=float, default=1.0)
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--data-path", default="data")
+    parser.add_argument(
+        "--output", help="Also write the full report to this JSON file."
+    )
+    args = parser.parse_args()
+
+    train_kwargs = {
+        "num_episodes": args.episodes,
+        "days": args.episode_days,
+        "epsilon": args.epsilon,
+        "ridge": args.ridge,
+        "max_workers": args.workers,
+    }
+    report = run_comparison(
+        args.seeds, args.villagers, args.days, train_kwargs, args.data_path
+    )
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
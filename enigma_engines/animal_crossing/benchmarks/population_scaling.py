@@ -0,0 +1,362 @@
+"""
+Headless scaling benchmark of the simulation loop across island populations.
+
+For each population size the benchmark runs whole simulated days through
+`run_day` and attributes wall time to the four phases that dominate a day:
+`ACNHEnvironment.step`, `ACNHEnvironment.get_state`,
+`Multi_Objective_Agent.choose_action` and `ACNHEnvironment.advance_day_cycle`.
+Every size runs at least `--min-villager-days` of work per timed pass (small
+islands simulate more days), and the timed pass is repeated on identically
+seeded runs; the median pass is reported. Throughput varies by about 10%
+between interpreter processes (memory layout, CPU contention), far more than
+between passes in one process, so the suite runs in `--runs` fresh
+interpreters and each size keeps its median run. Only then is it compared
+against the baseline. Allocations are measured in a separate, traced pass so
+tracemalloc overhead does not distort the timings. Results can be stored as a
+baseline JSON and later runs are compared against it.
+
+The dataset has fewer villagers than the largest requested size; sizes are
+capped at the number of available villagers and the cap is reported.
+
+Run with:
+    python -m enigma_engines.animal_crossing.benchmarks.population_scaling
+    python -m enigma_engines.animal_crossing.benchmarks.population_scaling --save-baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from enigma_engines.animal_crossing.core.agent import Multi_Objective_Agent
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+from enigma_engines.animal_crossing.core.load_data import ACNHItemDataset
+from enigma_engines.animal_crossing.simulation import run_day
+
+DEFAULT_SIZES = (10, 50, 100, 250, 500)
+PHASES = ("step", "get_state", "choose_action", "advance_day_cycle")
+DEFAULT_BASELINE_PATH = os.path.join(
+    os.path.dirname(__file__), "baselines", "population_scaling.json"
+)
+
+
+class _PhaseTimer:
+    """Wraps bound methods on an instance and accumulates their wall time."""
+
+    def __init__(self):
+        self.seconds = {phase: 0.0 for phase in PHASES}
+        self.calls = {phase: 0 for phase in PHASES}
+
+    def wrap(self, obj, method_name: str):
+        method = getattr(obj, method_name)
+        seconds = self.seconds
+        calls = self.calls
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                seconds[method_name] += perf_counter() - start
+                calls[method_name] += 1
+
+        setattr(obj, method_name, timed)
+
+
+def _build_run(dataset: ACNHItemDataset, num_villagers: int, seed: int):
+    random.seed(seed)
+    env = ACNHEnvironment(
+        num_villagers=num_villagers,
+        dataset=dataset,
+        villager_addition_percentage=0.0,
+        max_total_villagers=num_villagers,
+    )
+    agent = Multi_Objective_Agent(
+        dataset=dataset, num_villagers_on_island=len(env.villagers)
+    )
+    return env, agent
+
+
+def _timed_pass(dataset: ACNHItemDataset, num_villagers: int, days: int, seed: int):
+    env, agent = _build_run(dataset, num_villagers, seed)
+    population = len(env.villagers)
+    timer = _PhaseTimer()
+    for method_name in ("step", "get_state", "advance_day_cycle"):
+        timer.wrap(env, method_name)
+    timer.wrap(agent, "choose_action")
+
+    start = time.perf_counter()
+    for _ in range(days):
+        run_day(env, agent, population)
+    return time.perf_counter() - start, timer, population
+
+
+def benchmark_population(
+    dataset: ACNHItemDataset,
+    num_villagers: int,
+    days: int,
+    seed: int,
+    repeats: int = 5,
+) -> Dict[str, Any]:
+    """
+    Runs `days` simulated days at a fixed population and returns the measurements.
+
+    Args:
+        dataset: Shared dataset instance.
+        num_villagers: Island population; every villager acts once per day.
+        days: Number of simulated days per pass.
+        seed: Seed for the `random` module, identical for every pass.
+        repeats: Timed passes; the median one is reported.
+    Returns:
+        Dict[str, Any]: Phase seconds and call counts of the median pass, its
+        villager-days per second, every pass's throughput and tracemalloc figures.
+    """
+    passes = sorted(
+        (_timed_pass(dataset, num_villagers, days, seed) for _ in range(repeats)),
+        key=lambda timed: timed[0],
+    )
+    wall_seconds, timer, population = passes[len(passes) // 2]
+
+    # Traced pass on a fresh, identically seeded run
+    env, agent = _build_run(dataset, num_villagers, seed)
+    tracemalloc.start()
+    try:
+        baseline_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(days):
+            run_day(env, agent, population)
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    villager_days = population * days
+    return {
+        "villagers": population,
+        "days": days,
+        "repeats": repeats,
+        "wall_seconds": wall_seconds,
+        "villager_days_per_second": villager_days / wall_seconds,
+        "throughput_samples": [villager_days / timed[0] for timed in passes],
+        "phase_seconds": timer.seconds,
+        "phase_calls": timer.calls,
+        "other_seconds": wall_seconds - sum(timer.seconds.values()),
+        "peak_alloc_bytes": peak_bytes - baseline_bytes,
+        "retained_alloc_bytes": current_bytes - baseline_bytes,
+    }
+
+
+def run_suite(
+    sizes: List[int],
+    days: int,
+    seed: int,
+    data_path: str = "data",
+    repeats: int = 5,
+    min_villager_days: int = 2000,
+) -> Dict[str, Any]:
+    """
+    Benchmarks every population size and returns a JSON-serializable report.
+
+    Each size simulates `days` days, or more if that is needed to reach
+    `min_villager_days` villager-days per timed pass.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        dataset = ACNHItemDataset(data_path=data_path)
+    available = len(dataset.villager_names)
+
+    results = {}
+    for size in sizes:
+        capped = min(size, available)
+        size_days = max(days, math.ceil(min_villager_days / max(capped, 1)))
+        # The environment prints per-action debug output; keep it off the report.
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[str(size)] = benchmark_population(
+                dataset, capped, size_days, seed, repeats
+            )
+        results[str(size)]["requested_villagers"] = size
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "days": days,
+        "min_villager_days": min_villager_days,
+        "repeats": repeats,
+        "seed": seed,
+        "available_villagers": available,
+        "results": results,
+    }
+
+
+def run_isolated_suites(runs: int, **suite_kwargs) -> Dict[str, Any]:
+    """
+    Runs `run_suite` in `runs` fresh interpreters and keeps, per size, the
+    result with the median throughput.
+
+    Args:
+        runs: Interpreter processes to run the suite in.
+        **suite_kwargs: Forwarded to `run_suite`.
+    Returns:
+        Dict[str, Any]: A `run_suite` report built from the median results.
+    """
+    code = (
+        "import json, sys\n"
+        "from enigma_engines.animal_crossing.benchmarks.population_scaling "
+        "import run_suite\n"
+        "print(json.dumps(run_suite(**json.loads(sys.argv[1]))))"
+    )
+    reports = []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-c", code, json.dumps(suite_kwargs)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        reports.append(json.loads(completed.stdout.splitlines()[-1]))
+
+    merged = reports[0]
+    for size in merged["results"]:
+        ordered = sorted(
+            (report["results"][size] for report in reports),
+            key=lambda result: result["villager_days_per_second"],
+        )
+        merged["results"][size] = ordered[len(ordered) // 2]
+    merged["runs"] = runs
+    return merged
+
+
+def compare_to_baseline(
+    report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """
+    Returns one message per population size whose throughput regressed.
+
+    A regression is a median villager-days-per-second value more than
+    `tolerance` (a fraction) below the baseline.
+    """
+    regressions = []
+    for size, result in report["results"].items():
+        reference = baseline.get("results", {}).get(size)
+        if reference is None:
+            continue
+        ratio = (
+            result["villager_days_per_second"] / reference["villager_days_per_second"]
+        )
+        result["baseline_ratio"] = ratio
+        if ratio < 1.0 - tolerance:
+            regressions.append(
+                f"{size} villagers: {ratio:.2f}x baseline throughput "
+                f"({result['villager_days_per_second']:,.0f} vs "
+                f"{reference['villager_days_per_second']:,.0f} villager-days/s)"
+            )
+    return regressions
+
+
+def print_report(report: Dict[str, Any]):
+    header = f"{'villagers':>9} {'vd/s':>10} " + " ".join(
+        f"{phase:>17}" for phase in PHASES
+    )
+    header += f" {'peak MiB':>9} {'vs base':>8}"
+    print(header)
+    for result in report["results"].values():
+        phases = " ".join(
+            f"{result['phase_seconds'][phase]:>16.3f}s" for phase in PHASES
+        )
+        ratio = result.get("baseline_ratio")
+        print(
+            f"{result['villagers']:>9} {result['villager_days_per_second']:>10,.0f} "
+            f"{phases} {result['peak_alloc_bytes'] / 2**20:>9.2f} "
+            f"{(f'{ratio:.2f}x' if ratio is not None else '-'):>8}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument(
+        "--days", type=int, default=2, help="Minimum days per timed pass."
+    )
+    parser.add_argument(
+        "--min-villager-days",
+        type=int,
+        default=2000,
+        help="Work per timed pass; small islands simulate more days to reach it.",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Timed passes per size in each run; the median pass is kept.",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=3,
+        help="Fresh interpreter runs; each size keeps its median run (1: in-process).",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-path", default="data")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write this run's results to the baseline file.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed fractional throughput drop before a size counts as regressed.",
+    )
+    parser.add_argument(
+        "--output", help="Also write the full report to this JSON file."
+    )
+    args = parser.parse_args()
+
+    suite_kwargs = {
+        "sizes": args.sizes,
+        "days": args.days,
+        "seed": args.seed,
+        "data_path": args.data_path,
+        "repeats": args.repeats,
+        "min_villager_days": args.min_villager_days,
+    }
+    if args.runs > 1:
+        report = run_isolated_suites(args.runs, **suite_kwargs)
+    else:
+        report = run_suite(**suite_kwargs)
+
+    regressions = []
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_to_baseline(report, json.load(f), args.tolerance)
+
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+
+    if regressions:
+        print("Regressions against baseline:")
+        for message in regressions:
+            print(f"  {message}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
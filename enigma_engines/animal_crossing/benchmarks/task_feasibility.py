@@ -0,0 +1,133 @@
+"""
+Wasted steps avoided by feasibility-aware Nook Miles task candidates.
+
+Plays the same seeded islands twice through `run_day`: once with
+`Multi_Objective_Agent.PRUNE_INFEASIBLE_TASKS` off, so every active task with
+positive miles is a candidate, and once with it on, so only tasks the
+environment's `task_feasibility` mask marks as completable are. For each run
+the report gives the DO_NOOK_MILES_TASK steps that awarded nothing
+(`ACNHEnvironment.wasted_task_steps`), the task candidates pruned, the combined
+objective (`planner.evaluate_state`) and the mean time per decision.
+
+Run with:
+    python -m enigma_engines.animal_crossing.benchmarks.task_feasibility
+    python -m enigma_engines.animal_crossing.benchmarks.task_feasibility --villagers 50 --days 30
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+from enigma_engines.animal_crossing.core.agent import Multi_Objective_Agent
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+from enigma_engines.animal_crossing.core.load_data import ACNHItemDataset
+from enigma_engines.animal_crossing.core.planner import evaluate_state
+from enigma_engines.animal_crossing.simulation import run_day
+
+
+def _play(
+    dataset: ACNHItemDataset, seed: int, num_villagers: int, days: int, prune: bool
+) -> Dict[str, Any]:
+    random.seed(seed)
+    env = ACNHEnvironment(num_villagers=num_villagers, dataset=dataset)
+    agent = Multi_Objective_Agent(
+        dataset=dataset, num_villagers_on_island=len(env.villagers)
+    )
+    agent.PRUNE_INFEASIBLE_TASKS = prune
+
+    steps = 0
+    decision_seconds = 0.0
+    for _ in range(days):
+        start = time.perf_counter()
+        actions, state = run_day(env, agent, len(env.villagers))
+        decision_seconds += time.perf_counter() - start
+        steps += len(actions)
+
+    return {
+        "steps": steps,
+        "wasted_task_steps": env.wasted_task_steps,
+        "pruned_task_candidates": agent.pruned_task_candidates,
+        "bells": state["bells"],
+        "nook_miles": state["nook_miles"],
+        "avg_friendship": state["avg_friendship"],
+        "objective": evaluate_state(state, agent.weights),
+        "step_us": decision_seconds / max(steps, 1) * 1e6,
+    }
+
+
+def run_comparison(
+    seeds: List[int], num_villagers: int, days: int, data_path: str = "data"
+) -> Dict[str, Any]:
+    """Plays every seed with and without task pruning and returns a report."""
+    runs = []
+    # The environment prints per-action debug output; keep it off the report.
+    with contextlib.redirect_stdout(io.StringIO()):
+        dataset = ACNHItemDataset(data_path=data_path)
+        for seed in seeds:
+            runs.append(
+                {
+                    "seed": seed,
+                    "all_tasks": _play(dataset, seed, num_villagers, days, False),
+                    "feasible_only": _play(dataset, seed, num_villagers, days, True),
+                }
+            )
+    return {
+        "villagers": num_villagers,
+        "days": days,
+        "runs": runs,
+        "wasted_steps_saved": sum(
+            run["all_tasks"]["wasted_task_steps"]
+            - run["feasible_only"]["wasted_task_steps"]
+            for run in runs
+        ),
+        "total_steps": sum(run["all_tasks"]["steps"] for run in runs),
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(
+        f"{'seed':>5} {'tasks':>13} {'steps':>6} {'wasted':>7} {'pruned':>7} "
+        f"{'objective':>10} {'miles':>7} {'friend':>7} {'us/step':>8}"
+    )
+    for run in report["runs"]:
+        for name in ("all_tasks", "feasible_only"):
+            result = run[name]
+            print(
+                f"{run['seed']:>5} {name:>13} {result['steps']:>6} "
+                f"{result['wasted_task_steps']:>7} "
+                f"{result['pruned_task_candidates']:>7} "
+                f"{result['objective']:>10.3f} {result['nook_miles']:>7,} "
+                f"{result['avg_friendship']:>7.1f} {result['step_us']:>8.1f}"
+            )
+    saved = report["wasted_steps_saved"]
+    total = report["total_steps"]
+    print(
+        f"Feasibility pruning saved {saved:,} of {total:,} steps "
+        f"({saved / max(total, 1):.1%}) that would have failed a task check."
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[100, 101, 102])
+    parser.add_argument("--villagers", type=int, default=20)
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument("--data-path", default="data")
+    parser.add_argument(
+        "--output", help="Also write the full report to this JSON file."
+    )
+    args = parser.parse_args()
+
+    report = run_comparison(args.seeds, args.villagers, args.days, args.data_path)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
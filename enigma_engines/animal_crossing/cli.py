@@ -0,0 +1,242 @@
+"""
+Command line interface for ACNH simulations.
+
+Installed as `acnh` (see `[project.scripts]`), or run with
+`python -m enigma_engines.animal_crossing.cli`:
+
+    acnh run --days 365 --villagers 20 --seed 7 --render none --quiet
+    acnh run --days 1000 --checkpoint run.ckpt --checkpoint-every 100 --metrics metrics/
+    acnh sweep --days 60 --villagers 10 --villagers 50 --runs 8 --workers 4
+    acnh federation --islands 200 --workers 4 --days 30
+
+Every command takes `--profile PATH` to run under cProfile and write the
+stats to PATH (read them with `python -m pstats PATH`); worker processes are
+not profiled, only the process that runs the command. Simulation modules are
+imported by the command that needs them, so `--help` stays fast.
+"""
+
+import cProfile
+import json
+import pstats
+from enum import Enum
+from typing import Annotated, Any, Callable, List, Optional
+
+import typer
+
+app = typer.Typer(
+    help="Run Animal Crossing simulations, sweeps and federations.",
+    no_args_is_help=True,
+)
+
+ProfileOption = Annotated[
+    Optional[str],
+    typer.Option(
+        "--profile",
+        help="Run under cProfile and write the stats to this file.",
+    ),
+]
+DataPathOption = Annotated[
+    str, typer.Option("--data-path", help="Directory with the ACNH CSV data.")
+]
+
+
+class RenderPolicy(str, Enum):
+    every = "every"
+    final = "final"
+    none = "none"
+
+
+def _run_profiled(profile_path: Optional[str], func: Callable[[], Any]) -> Any:
+    """Calls `func`, under cProfile when `profile_path` is set."""
+    if not profile_path:
+        return func()
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func)
+    finally:
+        profiler.dump_stats(profile_path)
+        typer.echo(f"Profile written to {profile_path}; top functions:", err=True)
+        stats = pstats.Stats(profiler, stream=typer.get_text_stream("stderr"))
+        stats.sort_stats("cumulative").print_stats(15)
+
+
+@app.command()
+def run(
+    days: Annotated[int, typer.Option(min=1, help="Days to simulate.")] = 5,
+    villagers: Annotated[
+        Optional[int],
+        typer.Option(
+            min=1,
+            help="Villagers on the island at the start (10 when omitted); "
+            "taken from the checkpoint with --resume.",
+        ),
+    ] = None,
+    seed: Annotated[
+        Optional[int], typer.Option(help="Seed for a reproducible run.")
+    ] = None,
+    actions_per_day: Annotated[
+        Optional[int],
+        typer.Option(min=1, help="Villagers that act per day; all when omitted."),
+    ] = None,
+    render: Annotated[
+        RenderPolicy, typer.Option(help="When to render the daily report.")
+    ] = RenderPolicy.every,
+    render_every: Annotated[
+        int, typer.Option(min=1, help="Days between reports with --render every.")
+    ] = 1,
+    quiet: Annotated[
+        bool, typer.Option(help="Plain-text metrics lines only, no rendering.")
+    ] = False,
+    progress_every: Annotated[
+        int, typer.Option(min=1, help="Days between progress lines with --quiet.")
+    ] = 100,
+    checkpoint: Annotated[
+        Optional[str], typer.Option(help="Checkpoint file, written after the run.")
+    ] = None,
+    checkpoint_every: Annotated[
+        int, typer.Option(min=0, help="Days between checkpoints (0: final only).")
+    ] = 0,
+    resume: Annotated[
+        bool, typer.Option(help="Continue from --checkpoint if it exists.")
+    ] = False,
+    metrics: Annotated[
+        Optional[str],
+        typer.Option(help="Directory to stream daily metrics to (columnar)."),
+    ] = None,
+    instrumentation: Annotated[
+        Optional[str],
+        typer.Option(help="Record step and day-phase latencies to this JSON file."),
+    ] = None,
+    profile: ProfileOption = None,
+    data_path: DataPathOption = "data",
+):
+    """Simulate one island."""
+    if checkpoint_every and not checkpoint:
+        raise typer.BadParameter(
+            "--checkpoint-every needs --checkpoint", param_hint="--checkpoint-every"
+        )
+    from enigma_engines.animal_crossing.simulation import run_simulation
+
+    _run_profiled(
+        profile,
+        lambda: run_simulation(
+            days_to_simulate=days,
+            actions_per_day=actions_per_day,
+            render_policy=render.value,
+            render_every=render_every,
+            quiet=quiet,
+            progress_every=progress_every,
+            instrument=instrumentation is not None,
+            instrumentation_path=instrumentation,
+            checkpoint_path=checkpoint,
+            checkpoint_every=checkpoint_every,
+            resume=resume,
+            metrics_path=metrics,
+            num_villagers=villagers,
+            seed=seed,
+            data_path=data_path,
+        ),
+    )
+
+
+@app.command()
+def sweep(
+    results_dir: Annotated[
+        str, typer.Argument(help="Directory for the manifest and metric files.")
+    ],
+    days: Annotated[int, typer.Option(min=1, help="Days per run.")] = 30,
+    villagers: Annotated[
+        Optional[List[int]],
+        typer.Option(help="Initial villagers; repeat to sweep several sizes."),
+    ] = None,
+    seed: Annotated[int, typer.Option(help="First seed.")] = 0,
+    runs: Annotated[
+        int, typer.Option(min=1, help="Seeds per configuration, from --seed.")
+    ] = 4,
+    workers: Annotated[
+        Optional[int],
+        typer.Option(min=1, help="Worker processes; one per CPU when omitted."),
+    ] = None,
+    resume: Annotated[
+        bool, typer.Option(help="Skip runs already in the manifest.")
+    ] = True,
+    profile: ProfileOption = None,
+    data_path: DataPathOption = "data",
+):
+    """Run many seeded islands in parallel worker processes."""
+    from enigma_engines.animal_crossing.experiments import run_experiments
+
+    records = _run_profiled(
+        profile,
+        lambda: run_experiments(
+            {"num_villagers": villagers or [10]},
+            seeds=range(seed, seed + runs),
+            days=days,
+            results_dir=results_dir,
+            max_workers=workers,
+            data_path=data_path,
+            resume=resume,
+        ),
+    )
+    for record in records:
+        typer.echo(
+            f"villagers={record['config']['num_villagers']} seed={record['seed']} "
+            f"bells={record['final_bells']} nook_miles={record['final_nook_miles']} "
+            f"friendship={record['final_avg_friendship']:.1f} "
+            f"({record['runtime_seconds']:.1f}s)"
+        )
+
+
+@app.command()
+def federation(
+    islands: Annotated[int, typer.Option(min=1, help="Islands to simulate.")] = 100,
+    workers: Annotated[
+        int,
+        typer.Option(min=0, help="Worker processes; 0 runs every island in-process."),
+    ] = 0,
+    days: Annotated[int, typer.Option(min=1, help="Days to simulate.")] = 10,
+    villagers: Annotated[
+        int, typer.Option(min=1, help="Initial villagers per island.")
+    ] = 10,
+    max_villagers: Annotated[
+        int, typer.Option(min=1, help="Population cap of every island.")
+    ] = 100,
+    migration_rate: Annotated[
+        float,
+        typer.Option(min=0.0, max=1.0, help="Daily chance an island loses a villager."),
+    ] = 0.05,
+    seed: Annotated[int, typer.Option(help="Federation seed.")] = 0,
+    output: Annotated[
+        Optional[str], typer.Option(help="Also write the totals to this JSON file.")
+    ] = None,
+    profile: ProfileOption = None,
+    data_path: DataPathOption = "data",
+):
+    """Simulate trading islands sharded across worker processes."""
+    from enigma_engines.animal_crossing.federation import Federation
+
+    def play():
+        with Federation(
+            islands,
+            processes=workers,
+            num_villagers=villagers,
+            max_villagers=max_villagers,
+            migration_rate=migration_rate,
+            seed=seed,
+            data_path=data_path,
+        ) as fed:
+            return fed.run(days)
+
+    totals = _run_profiled(profile, play)
+    typer.echo(
+        f"{islands} islands x {days} days on {workers} workers: "
+        f"{totals['island_days_per_second']:,.1f} island-days/s, "
+        f"{totals['villagers']:,} villagers, {totals['bells']:,} bells"
+    )
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(totals, f, indent=2)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,66 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+class DailyActionCounter:
+    """
+    Running counts of the actions taken on the current logical day.
+
+    Counts are kept per action type, per (action type, target villager) and per
+    Nook Miles task, and updated with `record` as each action is taken, so the
+    agent's crowding checks ("how many villagers went fishing?", "was Raymond
+    already gifted today?") are dict lookups rather than scans of the day's
+    action list.
+    """
+
+    __slots__ = ("by_type", "by_target", "by_task", "total")
+
+    def __init__(self, actions: Optional[Iterable[Dict[str, Any]]] = None):
+        """
+        Args:
+            actions: Actions already taken today, counted immediately.
+        """
+        self.by_type: Dict[str, int] = {}
+        self.by_target: Dict[Tuple[str, str], int] = {}
+        self.by_task: Dict[str, int] = {}
+        self.total = 0
+        for action in actions or ():
+            self.record(action)
+
+    def record(self, action: Dict[str, Any]):
+        """Counts one action; actions without a type are ignored."""
+        action_type = action.get("type")
+        if not action_type:
+            return
+        self.total += 1
+        self.by_type[action_type] = self.by_type.get(action_type, 0) + 1
+
+        target_name = action.get("target_villager_name")
+        if target_name is not None:
+            key = (action_type, target_name)
+            self.by_target[key] = self.by_target.get(key, 0) + 1
+
+        task_name = action.get("task_name")
+        if task_name is not None:
+            self.by_task[task_name] = self.by_task.get(task_name, 0) + 1
+
+    def count(self, action_type: str) -> int:
+        """Times `action_type` was taken today."""
+        return self.by_type.get(action_type, 0)
+
+    def target_count(self, action_type: str, target_name: str) -> int:
+        """Times `action_type` was aimed at `target_name` today, e.g. gifts to Raymond."""
+        return self.by_target.get((action_type, target_name), 0)
+
+    def task_count(self, task_name: str) -> int:
+        """Times `task_name` was attempted today."""
+        return self.by_task.get(task_name, 0)
+
+    def reset(self):
+        """Clears every count, ready for the next day."""
+        self.by_type.clear()
+        self.by_target.clear()
+        self.by_task.clear()
+        self.total = 0
+
+    def __len__(self) -> int:
+        return self.total
@@ -1,10 +1,159 @@
+import heapq
 import math
+import os
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
+import numpy as np
+
+from enigma_engines.animal_crossing.core.action_counter import DailyActionCounter
+from enigma_engines.animal_crossing.core.decision_cache import DecisionCache
 from enigma_engines.animal_crossing.core.load_data import ACNHItemDataset
+from enigma_engines.animal_crossing.core.turnip_market import (
+    SUNDAY,
+    TURNIP_TABLE_FILENAME,
+    TurnipExpectationTable,
+    load_or_build_turnip_table,
+)
 from enigma_engines.animal_crossing.core.villager import ACNHVillager
 
+# Candidate action types, indexed by the type ids used in vectorized scoring
+ACTION_TYPES = (
+    "SELL_TURNIPS",
+    "BUY_TURNIPS",
+    "WORK_FOR_BELLS_ISLAND",
+    "GO_FISHING",
+    "SELL_ITEMS",
+    "GIVE_GIFT",
+    "TALK_TO_VILLAGER",
+    "DO_NOOK_MILES_TASK",
+    "PLANT_CROP",
+    "HARVEST_CROP",
+)
+# Candidate columns (type ids, raw values, payloads) for part of a decision
+CandidateBlock = Tuple[List[int], List[float], List[Any]]
+ACTION_TYPE_IDS = {name: type_id for type_id, name in enumerate(ACTION_TYPES)}
+(
+    SELL_TURNIPS_ID,
+    BUY_TURNIPS_ID,
+    WORK_FOR_BELLS_ID,
+    GO_FISHING_ID,
+    SELL_ITEMS_ID,
+    GIVE_GIFT_ID,
+    TALK_TO_VILLAGER_ID,
+    DO_NOOK_MILES_TASK_ID,
+    PLANT_CROP_ID,
+    HARVEST_CROP_ID,
+) = range(len(ACTION_TYPES))
+
+# Objective whose weight and urgency scale each action type's raw value
+ACTION_WEIGHT_KEYS = {
+    "SELL_TURNIPS": "bells",
+    "BUY_TURNIPS": "bells",
+    "WORK_FOR_BELLS_ISLAND": "bells",
+    "GO_FISHING": "bells",
+    "SELL_ITEMS": "bells",
+    "GIVE_GIFT": "friendship",
+    "TALK_TO_VILLAGER": "friendship",
+    "DO_NOOK_MILES_TASK": "nook_miles",
+    "PLANT_CROP": "bells",
+    "HARVEST_CROP": "bells",
+}
+# Fixed per-type preference: high incentive to sell turnips; fishing and
+# farming pay off more slowly than direct work
+ACTION_SCORE_FACTORS = np.ones(len(ACTION_TYPES), dtype=np.float64)
+ACTION_SCORE_FACTORS[SELL_TURNIPS_ID] = 1.5
+ACTION_SCORE_FACTORS[BUY_TURNIPS_ID] = 0.8
+ACTION_SCORE_FACTORS[GO_FISHING_ID] = 0.7
+ACTION_SCORE_FACTORS[PLANT_CROP_ID] = 0.7
+
+
+def get_urgency_multiplier(
+    current_value,
+    target_min,
+    default=1.0,
+    low_multiplier=5,
+    very_low_multiplier=10,
+):
+    if current_value < target_min / 2:
+        return very_low_multiplier
+    if current_value < target_min:
+        return low_multiplier
+    return default
+
+
+@dataclass
+class DayContext:
+    """
+    Decision inputs that stay fixed for one logical day, plus running counts.
+
+    Built once per day by `Multi_Objective_Agent.build_day_context` and updated
+    with `record` after every decision, so each `choose_action` call reads the
+    weekday, fishing limit, designated planters and crowding counts in O(1)
+    instead of re-deriving them from the state and the day's action list.
+    """
+
+    weekday: int
+    fishing_spots_limit: int
+    planter_names: FrozenSet[str]
+    counter: DailyActionCounter = field(default_factory=DailyActionCounter)
+
+    def record(self, action: Dict[str, Any]):
+        """Counts an action taken today towards the crowding penalties."""
+        self.counter.record(action)
+
+
+def plan_day(
+    choose_action: Callable[..., Dict[str, Any]],
+    day_context: DayContext,
+    state: Dict[str, Any],
+    villagers_details_list: List[ACNHVillager],
+    acting_villagers: Optional[List[ACNHVillager]] = None,
+    max_actions: Optional[int] = None,
+    on_action: Optional[
+        Callable[[ACNHVillager, Dict[str, Any]], Optional[Dict[str, Any]]]
+    ] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Sequential decide, record, execute loop shared by day planners.
+
+    Args:
+        choose_action (Callable): Called as `choose_action(state, villagers,
+            agent_name, day_context=day_context)` for each acting villager.
+        day_context (DayContext): The day's constants and running counts; every
+            decision is recorded in it.
+        state (Dict[str, Any]): The environment state at the start of the day.
+        villagers_details_list (List[ACNHVillager]): Villagers on the island.
+        acting_villagers (Optional[List[ACNHVillager]]): Who acts, in order.
+            Defaults to `villagers_details_list`.
+        max_actions (Optional[int]): Stop after this many decisions.
+        on_action (Optional[Callable]): See `Multi_Objective_Agent.choose_actions_for_day`.
+    Returns:
+        List[Dict[str, Any]]: The chosen actions, in acting order.
+    """
+    if acting_villagers is None:
+        acting_villagers = villagers_details_list
+    if max_actions is None:
+        max_actions = len(acting_villagers)
+
+    actions: List[Dict[str, Any]] = []
+    for villager in acting_villagers:
+        if len(actions) >= max_actions:
+            break
+        action = choose_action(
+            state, villagers_details_list, villager.name, day_context=day_context
+        )
+        # The returned list gets its own copy, as before plan_day existed, so
+        # `on_action` (which passes the action to env.step) cannot alias it
+        actions.append(action.copy())
+        day_context.record(action)
+        if on_action is not None:
+            state = on_action(villager, action)
+            if state is None:
+                break
+    return actions
+
 
 class Multi_Objective_Agent:
     # Define constants for new constraints
@@ -12,8 +161,27 @@ class Multi_Objective_Agent:
     PLANTER_SCORE_BONUS_FACTOR = 1.8
     FORCE_GIFT_SCORE_BONUS_FACTOR = 250
     FISHING_SPOT_POPULATION_RATIO = 0.25
+    # Score multiplier per earlier gift/talk aimed at the same villager today.
+    # Repeat gifts earn no friendship in the environment; 1.0 disables it.
+    REPEAT_TARGET_PENALTY = 1.0
+    # Social (gift/talk) candidates per decision: the k least-friendly villagers.
+    # None evaluates every villager, which is O(N) per decision.
+    SOCIAL_TARGET_LIMIT = 8
+    # Draw those k from the actor's most neglected bonds in the environment's
+    # relationship matrix rather than the least friendly villagers overall.
+    RELATIONSHIP_TARGETING = True
+    # Island states whose candidates are memoized (0 disables the cache)
+    DECISION_CACHE_SIZE = 256
+    # Skip Nook Miles tasks the environment's `task_feasibility` masks mark as
+    # failing for the acting villager; such a step would award nothing.
+    PRUNE_INFEASIBLE_TASKS = True
 
-    def __init__(self, dataset: ACNHItemDataset, num_villagers_on_island: int):
+    def __init__(
+        self,
+        dataset: ACNHItemDataset,
+        num_villagers_on_island: int,
+        turnip_table: Optional[TurnipExpectationTable] = None,
+    ):
         self.dataset = dataset
 
         self.weights = {
@@ -31,6 +199,157 @@ class Multi_Objective_Agent:
         self.villager_action_repetition_counter: Dict[str, int] = {}
         self.num_villagers_on_island = num_villagers_on_island
 
+        # Expected-value table for stalk market decisions, cached next to the data
+        self.turnip_table = turnip_table or load_or_build_turnip_table(
+            os.path.join(dataset.data_path, TURNIP_TABLE_FILENAME)
+        )
+        # Villager-independent candidates, keyed by `_island_signature`
+        self.decision_cache = DecisionCache(self.DECISION_CACHE_SIZE)
+        # Task candidates dropped by PRUNE_INFEASIBLE_TASKS
+        self.pruned_task_candidates = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickles decision state only; the dataset is reattached on restore."""
+        state = self.__dict__.copy()
+        state["dataset"] = None
+        # Cached candidates are cheap to rebuild; keep checkpoints small
+        state["decision_cache"] = DecisionCache(self.decision_cache.maxsize)
+        return state
+
+    def _select_social_targets(
+        self, villagers_details_list: List[ACNHVillager], agent_name: str
+    ) -> Tuple[List[ACNHVillager], Optional[np.ndarray]]:
+        """
+        Picks the villagers to evaluate GIVE_GIFT/TALK_TO_VILLAGER candidates for.
+
+        The target-dependent part of a social score (the urgency multiplier)
+        only grows as the target's friendship falls, so the strongest social
+        candidates come from the least friendly villagers. Keeping the `SOCIAL_TARGET_LIMIT` lowest makes each
+        decision O(k) in Python instead of O(N). With `RELATIONSHIP_TARGETING`
+        the k are instead the villagers the actor has the weakest bonds with
+        (`VillagerStore.most_neglected`), least friendly first among equals,
+        so different actors spread their attention over the island.
+
+        Args:
+            villagers_details_list (List[ACNHVillager]): All villagers on the island.
+            agent_name (str): The acting villager, never its own target.
+        Returns:
+            Tuple[List[ACNHVillager], Optional[np.ndarray]]: Targets ordered by
+                friendship, then island order, and their store slots when every
+                target lives in the same `VillagerStore` (else None).
+        """
+        first = villagers_details_list[0] if villagers_details_list else None
+        store = first.store if isinstance(first, ACNHVillager) else None
+
+        limit = self.SOCIAL_TARGET_LIMIT
+        if limit is None or len(villagers_details_list) <= limit:
+            targets = [v for v in villagers_details_list if v.name != agent_name]
+        elif store is not None and store.size == len(villagers_details_list):
+            # Environment order: slot i is villagers_details_list[i]
+            actor_slot = next(
+                (
+                    v.slot
+                    for v in villagers_details_list
+                    if v.name == agent_name and v.store is store
+                ),
+                None,
+            )
+            if self.RELATIONSHIP_TARGETING and actor_slot is not None:
+                slots = store.most_neglected(actor_slot, limit)
+            else:
+                slots = store.lowest_friendship_slots(limit, exclude_slot=actor_slot)
+            return [villagers_details_list[slot] for slot in slots.tolist()], slots
+        else:
+            ordered = heapq.nsmallest(
+                limit,
+                (
+                    (v.friendship_level, index, v)
+                    for index, v in enumerate(villagers_details_list)
+                    if v.name != agent_name
+                ),
+            )
+            targets = [v for _, _, v in ordered]
+
+        if store is not None and all(
+            isinstance(v, ACNHVillager) and v.store is store for v in targets
+        ):
+            return targets, np.array([v.slot for v in targets], dtype=np.int64)
+        return targets, None
+
+    def _crowding_penalties(self, action_type_counts: Dict[str, int]) -> np.ndarray:
+        """
+        Per-action-type score multipliers for actions other villagers already took today.
+
+        Each repeat costs a factor of 0.85 (floored at 0.1), except that the first
+        gift of the day is free so several villagers can still give gifts.
+
+        Args:
+            action_type_counts (Dict[str, int]): Times each action type was taken today.
+        Returns:
+            np.ndarray: One multiplier per entry of `ACTION_TYPES`.
+        """
+        penalties = np.ones(len(ACTION_TYPES), dtype=np.float64)
+        for action_type, num_times_taken in action_type_counts.items():
+            type_id = ACTION_TYPE_IDS.get(action_type)
+            if type_id is None:
+                continue
+            if action_type != "GIVE_GIFT" or num_times_taken > 1:
+                penalties[type_id] = max(0.1, 0.85**num_times_taken)
+        return penalties
+
+    @staticmethod
+    def build_action(type_id: int, payload: Any, agent_name: str) -> Dict[str, Any]:
+        """Builds the environment action dict for a `score_candidates` candidate."""
+        if type_id == SELL_TURNIPS_ID or type_id == BUY_TURNIPS_ID:
+            return {
+                "type": ACTION_TYPES[type_id],
+                "quantity": payload,
+                "villager_name": agent_name,
+            }
+        if type_id == SELL_ITEMS_ID:
+            return {
+                "type": "SELL_ITEMS",
+                "villager_name": agent_name,
+                # Payloads may be shared through the decision cache
+                "items_to_sell_list": [dict(item) for item in payload],
+            }
+        if type_id == GIVE_GIFT_ID:
+            target_name, gift_name = payload
+            return {
+                "type": "GIVE_GIFT",
+                "villager_name": agent_name,  # The agent performing the action
+                "target_villager_name": target_name,
+                "gift_name": gift_name,
+            }
+        if type_id == TALK_TO_VILLAGER_ID:
+            return {
+                "type": "TALK_TO_VILLAGER",
+                "villager_name": agent_name,
+                "target_villager_name": payload,
+            }
+        if type_id == DO_NOOK_MILES_TASK_ID:
+            return {
+                "type": "DO_NOOK_MILES_TASK",
+                "task_name": payload,
+                "villager_name": agent_name,
+            }
+        if type_id == PLANT_CROP_ID:
+            crop_name, plot_id = payload
+            return {
+                "type": "PLANT_CROP",
+                "crop_name": crop_name,
+                "plot_id": plot_id,
+                "villager_name": agent_name,
+            }
+        if type_id == HARVEST_CROP_ID:
+            return {
+                "type": "HARVEST_CROP",
+                "plot_id": payload,
+                "villager_name": agent_name,
+            }
+        # WORK_FOR_BELLS_ISLAND and GO_FISHING carry no payload
+        return {"type": ACTION_TYPES[type_id], "villager_name": agent_name}
+
     def _is_action_repetitive(
         self, current_action_details: Dict[str, Any], agent_name: str
     ) -> bool:
@@ -58,12 +377,101 @@ class Multi_Objective_Agent:
         # Could add more checks for other action types if needed
         return False
 
+    def build_day_context(
+        self,
+        state: Dict[str, Any],
+        villagers_details_list: List[ACNHVillager],
+        actions_taken_today: Optional[List[Dict[str, Any]]] = None,
+        action_counter: Optional[DailyActionCounter] = None,
+    ) -> DayContext:
+        """
+        Computes the per-day decision constants for `state`'s day.
+
+        Args:
+            state (Dict[str, Any]): The environment state at the start of the day.
+            villagers_details_list (List[ACNHVillager]): Villagers on the island.
+            actions_taken_today (Optional[List[Dict[str, Any]]]): Actions already
+                taken today, counted towards crowding penalties.
+            action_counter (Optional[DailyActionCounter]): Today's running counts,
+                used as-is instead of counting `actions_taken_today`.
+        Returns:
+            DayContext: The shared context for the day's decisions.
+        """
+        num_total_villagers = len(villagers_details_list)
+        # Fishing limit: Calculate based on current population
+        fishing_spots_limit = math.ceil(
+            num_total_villagers * self.FISHING_SPOT_POPULATION_RATIO
+        )
+        # The first PLANTER_FOCUS_PERCENTAGE of villagers (island order) get a planting bonus
+        planter_candidate_count = math.ceil(
+            num_total_villagers * self.PLANTER_FOCUS_PERCENTAGE
+        )
+        planter_names = frozenset(
+            getattr(v, "name", None)
+            for v in villagers_details_list[:planter_candidate_count]
+        )
+        weekday = datetime.strptime(
+            state.get("date_str", "2025-01-01 (Monday)")[:10], "%Y-%m-%d"
+        ).weekday()
+
+        if action_counter is None:
+            action_counter = DailyActionCounter(actions_taken_today)
+        return DayContext(weekday, fishing_spots_limit, planter_names, action_counter)
+
+    def choose_actions_for_day(
+        self,
+        state: Dict[str, Any],
+        villagers_details_list: List[ACNHVillager],
+        acting_villagers: Optional[List[ACNHVillager]] = None,
+        max_actions: Optional[int] = None,
+        on_action: Optional[
+            Callable[[ACNHVillager, Dict[str, Any]], Optional[Dict[str, Any]]]
+        ] = None,
+        action_counter: Optional[DailyActionCounter] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Plans one action per acting villager for a whole day.
+
+        The day's constants are computed once (`build_day_context`) and the
+        crowding counts are updated after each decision, so later villagers see
+        earlier villagers' choices exactly as with repeated `choose_action` calls.
+
+        Args:
+            state (Dict[str, Any]): The environment state at the start of the day.
+            villagers_details_list (List[ACNHVillager]): Villagers on the island.
+            acting_villagers (Optional[List[ACNHVillager]]): Who acts, in order.
+                Defaults to `villagers_details_list`.
+            max_actions (Optional[int]): Stop after this many decisions.
+            on_action (Optional[Callable]): Called as `on_action(villager, action)`
+                after each decision, e.g. to execute it. It returns the state for
+                the next decision, or None to end the day early. Without it, every
+                decision sees the initial `state`.
+            action_counter (Optional[DailyActionCounter]): Counter for the day,
+                e.g. owned by the simulation loop. Every decision is recorded in it.
+        Returns:
+            List[Dict[str, Any]]: The chosen actions, in acting order.
+        """
+        context = self.build_day_context(
+            state, villagers_details_list, action_counter=action_counter
+        )
+        return plan_day(
+            self.choose_action,
+            context,
+            state,
+            villagers_details_list,
+            acting_villagers,
+            max_actions,
+            on_action,
+        )
+
     def choose_action(
         self,
         state: Dict[str, Any],
         villagers_details_list: List[ACNHVillager],
         agent_name: str = "Player",
         actions_taken_today_by_others: Optional[List[Dict[str, Any]]] = None,
+        day_context: Optional[DayContext] = None,
+        action_counter: Optional[DailyActionCounter] = None,
     ) -> Dict[str, Any]:
         """
         Choose the best action based on the current state, villagers' details, and actions taken by others.
@@ -74,111 +482,239 @@ class Multi_Objective_Agent:
             agent_name (str): The name of the villager performing the action.
             actions_taken_today_by_others (Optional[List[Dict[str, Any]]]):
                 List of actions already performed by other villagers on the current day.
+                Ignored when `day_context` or `action_counter` is given.
+            day_context (Optional[DayContext]): Precomputed day constants and
+                crowding counts, as maintained by `choose_actions_for_day`.
+            action_counter (Optional[DailyActionCounter]): Today's running counts,
+                read in O(1) instead of scanning `actions_taken_today_by_others`.
         Returns:
             Dict[str, Any]: The chosen action details.
         """
-        possible_actions_with_scores: List[Dict[str, Any]] = []
-
-        # --- Pre-calculation for new constraints ---
-        num_total_villagers = len(villagers_details_list)
-        # Fishing limit: Calculate based on current population
-        fishing_spots_limit_today = math.ceil(
-            num_total_villagers * self.FISHING_SPOT_POPULATION_RATIO
+        if day_context is None:
+            day_context = self.build_day_context(
+                state,
+                villagers_details_list,
+                actions_taken_today_by_others,
+                action_counter,
+            )
+        type_ids, payloads, scores = self.score_candidates(
+            state, villagers_details_list, agent_name, day_context
         )
 
-        go_fishing_actions_count = 0
-        give_gift_actions_count = 0
-
-        if actions_taken_today_by_others:
-            for action_info in actions_taken_today_by_others:
-                action_type_taken = action_info.get("type")
-                if action_type_taken == "GO_FISHING":
-                    go_fishing_actions_count += 1
-                elif action_type_taken == "GIVE_GIFT":
-                    give_gift_actions_count += 1
+        # --- Action Selection ---
+        if not np.isfinite(scores).any():
+            chosen_action_details = {"type": "IDLE"}
+        else:
+            # argmax returns the first maximum, matching a stable descending sort
+            best_index = int(np.argmax(scores))
 
-        # Determine if this agent should be a "designated planter" for bonus
-        is_designated_planter_for_bonus = False
-        if num_total_villagers > 0:
-            planter_candidate_count = math.ceil(
-                num_total_villagers * self.PLANTER_FOCUS_PERCENTAGE
+            # Anti-repetition logic: if top action is repetitive, try next best non-repetitive one
+            current_agent_repetition_counter = (
+                self.villager_action_repetition_counter.get(agent_name, 0)
             )
-            try:
-                agent_index_in_list = [v.name for v in villagers_details_list].index(
-                    agent_name
-                )
-                if agent_index_in_list < planter_candidate_count:
-                    is_designated_planter_for_bonus = True
-            except (ValueError, AttributeError):
-                # Agent not found in list or villagers don't have name attribute
-                pass
-
-        def get_urgency_multiplier(
-            current_value,
-            target_min,
-            default=1.0,
-            low_multiplier=5,
-            very_low_multiplier=10,
-        ):
-            if current_value < target_min / 2:
-                return very_low_multiplier
-            if current_value < target_min:
-                return low_multiplier
-            return default
+            chosen_action_details = self.build_action(
+                type_ids[best_index], payloads[best_index], agent_name
+            )
+            if current_agent_repetition_counter >= 2 and self._is_action_repetitive(
+                chosen_action_details, agent_name
+            ):
+                remaining = scores.copy()
+                remaining[best_index] = -np.inf
+                while np.isfinite(remaining.max()):
+                    alt_index = int(np.argmax(remaining))
+                    alt_action = self.build_action(
+                        type_ids[alt_index], payloads[alt_index], agent_name
+                    )
+                    if not self._is_action_repetitive(alt_action, agent_name):
+                        chosen_action_details = alt_action
+                        break
+                    remaining[alt_index] = -np.inf
+                # All high-scoring options are repetitive: keep the best of them
 
-        friendship_urgency = get_urgency_multiplier(
-            state.get("avg_friendship", 100), self.friendship_target_min
+        self.remember_action(agent_name, chosen_action_details)
+
+        # Debug prints (optional)
+        # print(f"Agent Choosing: Day {state.get('day')}, Bells {state.get('bells')}, AvgFriend {state.get('avg_friendship',0):.1f}")
+        # print(f"Chosen action: {chosen_action_details}")
+
+        return chosen_action_details
+
+    def rank_actions(
+        self,
+        state: Dict[str, Any],
+        villagers_details_list: List[ACNHVillager],
+        agent_name: str,
+        k: int,
+        day_context: Optional[DayContext] = None,
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Returns the `k` best-scoring candidate actions without committing to one.
+
+        Unlike `choose_action`, this applies no anti-repetition filter and leaves
+        the repetition bookkeeping untouched, so planners can use the greedy
+        scores as a candidate generator and prior.
+
+        Args:
+            state (Dict[str, Any]): The current state of the environment.
+            villagers_details_list (List[ACNHVillager]): List of villagers' details.
+            agent_name (str): The name of the villager performing the action.
+            k (int): Maximum number of candidates to return.
+            day_context (Optional[DayContext]): Shared day constants and counts.
+        Returns:
+            List[Tuple[Dict[str, Any], float]]: `(action, score)` pairs, best first.
+        """
+        if day_context is None:
+            day_context = self.build_day_context(state, villagers_details_list)
+        type_ids, payloads, scores = self.score_candidates(
+            state, villagers_details_list, agent_name, day_context
         )
-        bells_urgency = get_urgency_multiplier(
-            state.get("bells", 0), self.bells_target_min, very_low_multiplier=2.5
-        )  # Higher urgency if very broke
-        nook_miles_urgency = get_urgency_multiplier(
-            state.get("nook_miles", 0), self.nook_miles_target_min
+        # Stable descending order: ties keep candidate generation order
+        order = np.argsort(-scores, kind="stable")[:k]
+        return [
+            (
+                self.build_action(type_ids[index], payloads[index], agent_name),
+                float(scores[index]),
+            )
+            for index in order.tolist()
+            if np.isfinite(scores[index])
+        ]
+
+    def remember_action(self, agent_name: str, action: Dict[str, Any]):
+        """
+        Updates the repetition bookkeeping after `agent_name` commits to `action`.
+
+        Ensures the action names its villager, as the environment expects.
+        """
+        # Update repetition counter and last action details for this specific agent
+        if action["type"] != "IDLE" and self._is_action_repetitive(action, agent_name):
+            self.villager_action_repetition_counter[agent_name] = (
+                self.villager_action_repetition_counter.get(agent_name, 0) + 1
+            )
+        else:
+            self.villager_action_repetition_counter[agent_name] = 0
+
+        self.villager_last_action_details[agent_name] = action.copy()  # Store a copy
+
+        # Ensure agent_name is in the action for the environment
+        if "villager_name" not in action and action["type"] != "IDLE":
+            action["villager_name"] = agent_name
+
+    def _island_signature(
+        self,
+        state: Dict[str, Any],
+        day_context: DayContext,
+        task_mask: Optional[int] = None,
+    ) -> Tuple:
+        """
+        Compact, hashable key of every input `_island_candidates` reads.
+
+        Villagers acting on the same island state (same bells, turnip market,
+        inventory, tasks and free plot) and able to complete the same tasks
+        share a key, whatever their name.
+        """
+        return (
+            day_context.weekday,
+            state.get("bells", 0),
+            self.bells_target_min,
+            state.get("turnips_owned", 0),
+            state.get("turnip_sell_price", 0),
+            state.get("turnip_buy_price", 0),
+            state.get("current_turnip_saturation", 1.0),
+            day_context.counter.count("GO_FISHING") < day_context.fishing_spots_limit,
+            tuple(
+                (
+                    item["name"],
+                    item.get("quantity", 0),
+                    item.get("sell_price", 0),
+                    item.get("is_tool", False),
+                    item.get("is_gift_candidate", False),
+                )
+                for item in state.get("player_inventory", [])
+            ),
+            tuple(
+                (task_name, task_details.get("miles", 0))
+                for task_name, task_details in state.get(
+                    "active_nook_tasks", {}
+                ).items()
+            ),
+            next(
+                (
+                    plot_id
+                    for plot_id, status in state.get("farm_plots", {}).items()
+                    if status.get("crop_name") is None
+                ),
+                None,
+            ),
+            task_mask,
         )
 
-        current_day = state.get("day", -1)
+    def _island_candidates(
+        self,
+        state: Dict[str, Any],
+        day_context: DayContext,
+        bells_urgency: float,
+        task_mask: Optional[int] = None,
+    ) -> Tuple[CandidateBlock, CandidateBlock, int]:
+        """
+        Candidates that do not depend on the acting villager's identity.
+
+        Args:
+            state (Dict[str, Any]): The current state of the environment.
+            day_context (DayContext): Shared day constants and counts.
+            bells_urgency (float): Urgency multiplier of the bells objective.
+            task_mask (Optional[int]): The acting villager's task feasibility
+                bitmask over `state["nook_task_bits"]`; None proposes every task.
+        Returns:
+            Tuple[CandidateBlock, CandidateBlock, int]: The economic block
+            (turnips, work, fishing, item sales), which precedes the social
+            candidates, the Nook Miles and planting block, which follows them,
+            and the number of task candidates pruned as infeasible. Each block
+            is `(type_ids, raw_values, payloads)`.
+        """
+        economic: CandidateBlock = ([], [], [])
+        nook_and_farming: CandidateBlock = ([], [], [])
+
+        def add_candidate(
+            block: CandidateBlock,
+            action_type_id: int,
+            raw_value: float,
+            payload: Any = None,
+        ):
+            block[0].append(action_type_id)
+            block[1].append(raw_value)
+            block[2].append(payload)
+
+        go_fishing_actions_count = day_context.counter.count("GO_FISHING")
         current_bells = state.get("bells", 0)
         player_inventory = state.get(
             "player_inventory", []
         )  # Assumed format: [{"name": str, "quantity": int, "sell_price": int, ...}]
 
-        # --- 1. Evaluate Economic Actions (Bells & Turnips) ---
+        # --- Economic Actions (Bells & Turnips) ---
+        # Turnip decisions compare today's price with the expected value of the
+        # best remaining sell opportunity this week (precomputed lookup table).
+        turnip_saturation = state.get("current_turnip_saturation", 1.0)
+
         # SELL_TURNIPS
         if state.get("turnips_owned", 0) > 0 and state.get("turnip_sell_price", 0) > 0:
-            is_saturday = (
-                datetime.strptime(
-                    state.get("date_str", "2025-01-01 (Monday)")[:10], "%Y-%m-%d"
-                ).weekday()
-                == 5
+            hold_value = self.turnip_table.expected_best_remaining(
+                day_context.weekday, turnip_saturation
             )
-            # Sell if price is good or it's Saturday (last chance)
-            # Assume turnip_buy_price_paid_by_agent is available in state if turnips were bought
-            agent_turnip_buy_price = state.get(
-                "turnip_buy_price_paid_by_agent", 100
-            )  # Default if not tracked
-            if state["turnip_sell_price"] > 120 or (
-                is_saturday and state["turnip_sell_price"] > agent_turnip_buy_price
-            ):
-                profit = (state["turnip_sell_price"] - agent_turnip_buy_price) * state[
+            # Sell when today's price beats the expected value of waiting
+            if state["turnip_sell_price"] > hold_value:
+                expected_gain = (state["turnip_sell_price"] - hold_value) * state[
                     "turnips_owned"
                 ]
-                score = (
-                    self.weights["bells"] * profit * bells_urgency * 1.5
-                )  # High incentive
-                possible_actions_with_scores.append(
-                    {
-                        "action": {
-                            "type": "SELL_TURNIPS",
-                            "quantity": state["turnips_owned"],
-                            "villager_name": agent_name,
-                        },
-                        "score": score,
-                    }
+                add_candidate(
+                    economic, SELL_TURNIPS_ID, expected_gain, state["turnips_owned"]
                 )
 
         # BUY_TURNIPS
         if state.get("turnip_buy_price", 0) > 0:  # It's Sunday
-            if state["turnip_buy_price"] <= 105:
+            expected_turnip_value = self.turnip_table.expected_best_remaining(
+                SUNDAY, turnip_saturation
+            )
+            if expected_turnip_value > state["turnip_buy_price"]:
                 max_turnips_can_buy = current_bells // state["turnip_buy_price"]
                 # Buy a significant portion, e.g., up to 200 or 1/4th of bells
                 quantity_to_buy = min(
@@ -187,57 +723,26 @@ class Multi_Objective_Agent:
                     current_bells // (4 * state["turnip_buy_price"]),
                 )
                 if quantity_to_buy >= 10:  # Minimum sensible purchase
-                    # Heuristic score: potential gain, inversely related to buy price
-                    buy_score = (150 - state["turnip_buy_price"]) * quantity_to_buy
-                    possible_actions_with_scores.append(
-                        {
-                            "action": {
-                                "type": "BUY_TURNIPS",
-                                "quantity": quantity_to_buy,
-                                "villager_name": agent_name,
-                            },
-                            "score": self.weights["bells"]
-                            * buy_score
-                            * bells_urgency
-                            * 0.8,
-                        }
-                    )
+                    # Expected profit of holding the turnips through the week
+                    buy_score = (
+                        expected_turnip_value - state["turnip_buy_price"]
+                    ) * quantity_to_buy
+                    add_candidate(economic, BUY_TURNIPS_ID, buy_score, quantity_to_buy)
 
         # WORK_FOR_BELLS_ISLAND
         work_bells_score = (
             150  # Base estimated earning, less than specific activities usually
         )
-        possible_actions_with_scores.append(
-            {
-                "action": {
-                    "type": "WORK_FOR_BELLS_ISLAND",
-                    "villager_name": agent_name,
-                },
-                "score": self.weights["bells"] * work_bells_score * bells_urgency,
-            }
-        )
+        add_candidate(economic, WORK_FOR_BELLS_ID, work_bells_score)
 
         # GO_FISHING - only if fishing spots limit not reached
-        if go_fishing_actions_count < fishing_spots_limit_today:
+        if go_fishing_actions_count < day_context.fishing_spots_limit:
             estimated_fish_value = (
                 self.dataset.get_estimated_fish_value()
             )  # Get this from dataset
-            probability_of_catch = state.get(
-                "fishing_probability", 0.5
-            )  # Assume a default catch probability
-            fishing_score = (
-                self.weights["bells"] * estimated_fish_value * bells_urgency * 0.7
-            )  # Slightly less than direct work
-            possible_actions_with_scores.append(
-                {
-                    "action": {"type": "GO_FISHING", "villager_name": agent_name},
-                    "score": fishing_score,
-                }
-            )
+            add_candidate(economic, GO_FISHING_ID, estimated_fish_value)
 
         # SELL_ITEMS
-        items_to_propose_selling_list = []
-        potential_sell_value = 0
         # Prudent selling: sell common items, or items if bells are very low
         # Keep some items for gifts or if they are rare/valuable for other reasons
         # For simplicity, let's assume items in player_inventory are just {name: str, quantity: int, sell_price: int}
@@ -295,114 +800,35 @@ class Multi_Objective_Agent:
                 current_batch_value += item_to_sell_proposal["value"]
 
             if final_items_to_sell_list:
-                possible_actions_with_scores.append(
-                    {
-                        "action": {
-                            "type": "SELL_ITEMS",
-                            "villager_name": agent_name,
-                            "items_to_sell_list": final_items_to_sell_list,
-                        },
-                        "score": self.weights["bells"]
-                        * current_batch_value
-                        * bells_urgency,
-                    }
+                add_candidate(
+                    economic,
+                    SELL_ITEMS_ID,
+                    current_batch_value,
+                    final_items_to_sell_list,
                 )
 
-        # --- 2. Evaluate Friendship Actions (Iterate through ALL villagers) ---
-        for villager in villagers_details_list:
-            if villager.name == agent_name:
-                continue  # Agent doesn't interact with itself
-
-            # GIVE_GIFT to this villager
-            # if villager.last_gifted_day != current_day:
-            gift_name, gift_details = (
-                self.dataset.get_random_gift_option()
-            )  # Agent has "infinite" access to random gifts for now
-            if gift_details["friendship_points"] > 0:
-                cost = gift_details.get("cost", 0)
-                if current_bells >= cost:
-                    friendship_gain_potential = gift_details["friendship_points"]
-                    urgency_for_this_villager = get_urgency_multiplier(
-                        villager.friendship_level, self.friendship_target_min
-                    )
-                    score = (
-                        (friendship_gain_potential / (cost + 1.0))
-                        * self.weights["friendship"]
-                        * friendship_urgency
-                        * urgency_for_this_villager
-                    )
-
-                    # Apply bonus if no gifts have been given today
-                    if give_gift_actions_count == 0:
-                        score *= self.FORCE_GIFT_SCORE_BONUS_FACTOR
-                    possible_actions_with_scores.append(
-                        {
-                            "action": {
-                                "type": "GIVE_GIFT",
-                                "villager_name": agent_name,  # The agent performing the action
-                                "target_villager_name": villager.name,
-                                "gift_name": gift_name,
-                            },
-                            "score": score,
-                        }
-                    )
-
-            # TALK_TO_VILLAGER (New action type, environment must support it)
-            # Assume talking gives a small, fixed friendship boost.
-            # Agent might have a daily talk limit per villager (not modeled here, env might handle)
-            base_talk_friendship_gain = 5
-            talk_score_raw = base_talk_friendship_gain
-            urgency_for_this_villager_talk = get_urgency_multiplier(
-                villager.friendship_level,
-                self.friendship_target_min,
-                low_multiplier=1.2,
-                very_low_multiplier=1.5,
-            )
-
-            # Reduce score if talked recently (requires agent to remember talk history, simplified)
-            # For now, just consider it as an option
-            score = (
-                talk_score_raw
-                * self.weights["friendship"]
-                * friendship_urgency
-                * urgency_for_this_villager_talk
-            )
-            possible_actions_with_scores.append(
-                {
-                    "action": {
-                        "type": "TALK_TO_VILLAGER",
-                        "villager_name": agent_name,
-                        "target_villager_name": villager.name,
-                    },
-                    "score": score,
-                }
-            )
-
-        # --- 3. Evaluate Nook Miles Actions ---
+        # --- Nook Miles Actions ---
         available_tasks_dict = state.get(
             "active_nook_tasks", {}
         )  # Should be {task_name: details_dict}
+        task_bits = state.get("nook_task_bits", {})
+        num_pruned = 0
         if available_tasks_dict:
             for task_name, task_details in available_tasks_dict.items():
                 miles_reward = task_details.get("miles", 0)
                 if miles_reward > 0:
-                    # Simplistic: Agent assumes it can attempt. A real agent would check criteria.
-                    # The environment's _check_task_criteria will gate this.
-                    score = (
-                        miles_reward * self.weights["nook_miles"] * nook_miles_urgency
-                    )
-                    possible_actions_with_scores.append(
-                        {
-                            "action": {
-                                "type": "DO_NOOK_MILES_TASK",
-                                "task_name": task_name,
-                                "villager_name": agent_name,
-                            },
-                            "score": score,
-                        }
+                    # The environment's _check_task_criteria gates completion;
+                    # its feasibility mask tells in advance which tasks would fail.
+                    bit = task_bits.get(task_name)
+                    if task_mask is not None and bit is not None:
+                        if not task_mask >> bit & 1:
+                            num_pruned += 1
+                            continue
+                    add_candidate(
+                        nook_and_farming, DO_NOOK_MILES_TASK_ID, miles_reward, task_name
                     )
 
-        # --- 4. Evaluate Farming Actions ---
+        # --- Farming Actions ---
         farm_plots_status = state.get("farm_plots", {})
         empty_plots = [
             pid
@@ -421,26 +847,115 @@ class Multi_Objective_Agent:
                     crop_def.get("SellPrice", 20) * crop_def.get("Yield", 1)
                 ) - crop_def["SeedCost"]
                 if potential_profit > 0:
-                    score = (
-                        self.weights["bells"] * potential_profit * bells_urgency * 0.7
-                    )  # Farming is longer term
+                    add_candidate(
+                        nook_and_farming,
+                        PLANT_CROP_ID,
+                        potential_profit,
+                        (crop_to_plant, empty_plots[0]),
+                    )
 
-                    # Apply planting bonus for designated planters
-                    if is_designated_planter_for_bonus:
-                        score *= self.PLANTER_SCORE_BONUS_FACTOR
+        return economic, nook_and_farming, num_pruned
 
-                    possible_actions_with_scores.append(
-                        {
-                            "action": {
-                                "type": "PLANT_CROP",
-                                "crop_name": crop_to_plant,
-                                "plot_id": empty_plots[0],
-                                "villager_name": agent_name,
-                            },
-                            "score": score,
-                        }
-                    )
+    def score_candidates(
+        self,
+        state: Dict[str, Any],
+        villagers_details_list: List[ACNHVillager],
+        agent_name: str,
+        day_context: DayContext,
+    ) -> Tuple[List[int], List[Any], np.ndarray]:
+        """
+        Generates and scores every candidate action for `agent_name`.
+
+        Like `rank_actions`, scoring applies no anti-repetition filter and
+        leaves the repetition bookkeeping untouched; pass a candidate's type id
+        and payload to `build_action` to get its action dict.
 
+        Args:
+            state (Dict[str, Any]): The current state of the environment.
+            villagers_details_list (List[ACNHVillager]): List of villagers' details.
+            agent_name (str): The name of the villager performing the action.
+            day_context (DayContext): Shared day constants and counts.
+        Returns:
+            Tuple[List[int], List[Any], np.ndarray]: Action type ids, payloads for
+            `build_action`, and scores, with -inf for infeasible candidates.
+        """
+        counter = day_context.counter
+
+        # Candidates are collected column-wise (type id, raw value, per-target
+        # urgency, validity, payload) and scored in a few NumPy operations.
+        # Action dicts are only built for the candidate that is chosen.
+        type_ids: List[int] = []
+        raw_values: List[float] = []
+        payloads: List[Any] = []
+
+        def add_candidate(action_type_id: int, raw_value: float, payload: Any = None):
+            type_ids.append(action_type_id)
+            raw_values.append(raw_value)
+            payloads.append(payload)
+
+        # --- Pre-calculation for new constraints ---
+        give_gift_actions_count = counter.count("GIVE_GIFT")
+        # Determine if this agent should be a "designated planter" for bonus
+        is_designated_planter_for_bonus = agent_name in day_context.planter_names
+
+        friendship_urgency = get_urgency_multiplier(
+            state.get("avg_friendship", 100), self.friendship_target_min
+        )
+        bells_urgency = get_urgency_multiplier(
+            state.get("bells", 0), self.bells_target_min, very_low_multiplier=2.5
+        )  # Higher urgency if very broke
+        nook_miles_urgency = get_urgency_multiplier(
+            state.get("nook_miles", 0), self.nook_miles_target_min
+        )
+
+        current_day = state.get("day", -1)
+        current_bells = state.get("bells", 0)
+
+        # --- 1. Economic, Nook Miles and planting candidates ---
+        # These do not depend on the acting villager, so they are memoized by
+        # a signature of the island state; only the social and harvest
+        # candidates and the score multipliers are recomputed for each villager.
+        task_mask = None
+        if self.PRUNE_INFEASIBLE_TASKS:
+            task_mask = state.get("task_feasibility", {}).get(agent_name)
+        signature = self._island_signature(state, day_context, task_mask)
+        blocks = self.decision_cache.get(signature)
+        if blocks is None:
+            blocks = self._island_candidates(
+                state, day_context, bells_urgency, task_mask
+            )
+            self.decision_cache.put(signature, blocks)
+        economic, nook_and_farming, num_pruned = blocks
+        self.pruned_task_candidates += num_pruned
+        type_ids.extend(economic[0])
+        raw_values.extend(economic[1])
+        payloads.extend(economic[2])
+
+        # --- 2. Evaluate Friendship Actions (top-k least friendly villagers) ---
+        # GIVE_GIFT and TALK_TO_VILLAGER candidates are interleaved per target so
+        # ties resolve in the same order as evaluating target by target.
+        social_targets, target_slots = self._select_social_targets(
+            villagers_details_list, agent_name
+        )
+        num_economic = len(type_ids)
+        gift_points = []
+        gift_costs = []
+        for villager in social_targets:
+            # Agent has "infinite" access to random gifts for now
+            gift_name, gift_details = self.dataset.get_random_gift_option()
+            gift_points.append(gift_details["friendship_points"])
+            gift_costs.append(gift_details.get("cost", 0))
+            add_candidate(GIVE_GIFT_ID, 0.0, (villager.name, gift_name))
+            # Assume talking gives a small, fixed friendship boost.
+            base_talk_friendship_gain = 5
+            add_candidate(TALK_TO_VILLAGER_ID, base_talk_friendship_gain, villager.name)
+
+        # --- 3. Nook Miles and planting candidates (memoized above) ---
+        type_ids.extend(nook_and_farming[0])
+        raw_values.extend(nook_and_farming[1])
+        payloads.extend(nook_and_farming[2])
+
+        farm_plots_status = state.get("farm_plots", {})
         # HARVEST_CROP
         if farm_plots_status:
             for plot_id, status in farm_plots_status.items():
@@ -455,101 +970,96 @@ class Multi_Objective_Agent:
                         harvest_value = crop_def.get("SellPrice", 20) * crop_def.get(
                             "Yield", 1
                         )
-                        score = (
-                            self.weights["bells"] * harvest_value * bells_urgency
-                        )  # Direct gain
-                        possible_actions_with_scores.append(
-                            {
-                                "action": {
-                                    "type": "HARVEST_CROP",
-                                    "plot_id": plot_id,
-                                    "villager_name": agent_name,
-                                },
-                                "score": score,
-                            }
-                        )
-                        # Consider harvesting multiple plots if available, but for now, one per decision cycle if good.
+                        add_candidate(HARVEST_CROP_ID, harvest_value, plot_id)
 
-        # --- Apply Diversity Penalty ---
-        # Penalize actions that have been taken frequently by other villagers today
-        if actions_taken_today_by_others and possible_actions_with_scores:
-            action_type_counts = {}
-            for act_info in actions_taken_today_by_others:
-                act_type = act_info.get("type")
-                if act_type:
-                    action_type_counts[act_type] = (
-                        action_type_counts.get(act_type, 0) + 1
-                    )
+        # --- Vectorized scoring ---
+        # score = raw * weight * urgency * target urgency * factor * bonus * penalty,
+        # multiplied in that order so results match scalar evaluation exactly.
+        type_id_array = np.array(type_ids, dtype=np.int64)
+        scores = np.array(raw_values, dtype=np.float64)
+        valid = np.ones(len(type_ids), dtype=bool)
+        target_urgency = np.ones(len(type_ids), dtype=np.float64)
 
-            for scored_action in possible_actions_with_scores:
-                action_type = scored_action["action"]["type"]
-                num_times_taken = action_type_counts.get(action_type, 0)
-                if num_times_taken > 0:
-                    # Apply a penalty factor, e.g., 0.85 for 1st repeat, 0.85^2 for 2nd, etc.
-                    # Exception: Gift giving might be okay if multiple villagers want to give gifts
-                    if (
-                        action_type != "GIVE_GIFT" or num_times_taken > 1
-                    ):  # Allow at least one gift without penalty
-                        # Max penalty factor to avoid scores becoming too small
-                        penalty_multiplier = max(0.1, 0.85**num_times_taken)
-                        scored_action["score"] *= penalty_multiplier
+        num_social = 2 * len(social_targets)
+        if num_social:
+            social = slice(num_economic, num_economic + num_social)
+            points = np.array(gift_points, dtype=np.float64)
+            costs = np.array(gift_costs, dtype=np.float64)
+            gift_raw = scores[social]
+            gift_raw[0::2] = points / (costs + 1.0)
+            valid[social][0::2] = (points > 0) & (current_bells >= costs)
 
-        # --- Action Selection ---
-        if not possible_actions_with_scores:
-            chosen_action_details = {"type": "IDLE"}
-        else:
-            # Sort by score to pick the best
-            possible_actions_with_scores.sort(key=lambda x: x["score"], reverse=True)
+            if target_slots is not None:
+                store = social_targets[0].store
+                gift_urgency = store.friendship_urgency(
+                    self.friendship_target_min, slots=target_slots
+                )
+                talk_urgency = store.friendship_urgency(
+                    self.friendship_target_min,
+                    low_multiplier=1.2,
+                    very_low_multiplier=1.5,
+                    slots=target_slots,
+                )
+            else:
+                levels = [v.friendship_level for v in social_targets]
+                gift_urgency = [
+                    get_urgency_multiplier(level, self.friendship_target_min)
+                    for level in levels
+                ]
+                talk_urgency = [
+                    get_urgency_multiplier(
+                        level,
+                        self.friendship_target_min,
+                        low_multiplier=1.2,
+                        very_low_multiplier=1.5,
+                    )
+                    for level in levels
+                ]
+            social_urgency = target_urgency[social]
+            social_urgency[0::2] = gift_urgency
+            social_urgency[1::2] = talk_urgency
 
-            # Anti-repetition logic: if top action is repetitive, try next best non-repetitive one
-            current_agent_repetition_counter = (
-                self.villager_action_repetition_counter.get(agent_name, 0)
-            )
-            best_action_info = possible_actions_with_scores[0]
-            if current_agent_repetition_counter >= 2 and self._is_action_repetitive(
-                best_action_info["action"], agent_name
-            ):
-                found_alternative = False
-                for alt_action_info in possible_actions_with_scores[1:]:
-                    if not self._is_action_repetitive(
-                        alt_action_info["action"], agent_name
-                    ):
-                        best_action_info = alt_action_info
-                        found_alternative = True
-                        break
-                if (
-                    not found_alternative
-                ):  # All high-scoring options are repetitive, pick the best of them
-                    pass  # best_action_info is already set to the top one
+        weight_by_type = np.array(
+            [self.weights[ACTION_WEIGHT_KEYS[name]] for name in ACTION_TYPES],
+            dtype=np.float64,
+        )
+        urgency_by_objective = {
+            "bells": bells_urgency,
+            "friendship": friendship_urgency,
+            "nook_miles": nook_miles_urgency,
+        }
+        urgency_by_type = np.array(
+            [urgency_by_objective[ACTION_WEIGHT_KEYS[name]] for name in ACTION_TYPES],
+            dtype=np.float64,
+        )
+        bonus_by_type = np.ones(len(ACTION_TYPES), dtype=np.float64)
+        if give_gift_actions_count == 0:
+            # Apply bonus if no gifts have been given today
+            bonus_by_type[GIVE_GIFT_ID] = self.FORCE_GIFT_SCORE_BONUS_FACTOR
+        if is_designated_planter_for_bonus:
+            # Apply planting bonus for designated planters
+            bonus_by_type[PLANT_CROP_ID] = self.PLANTER_SCORE_BONUS_FACTOR
 
-            chosen_action_details = best_action_info["action"]
+        scores *= weight_by_type[type_id_array]
+        scores *= urgency_by_type[type_id_array]
+        scores *= target_urgency
+        scores *= ACTION_SCORE_FACTORS[type_id_array]
+        scores *= bonus_by_type[type_id_array]
 
-        # Update repetition counter and last action details for this specific agent
-        if chosen_action_details["type"] != "IDLE" and self._is_action_repetitive(
-            chosen_action_details, agent_name
-        ):
-            self.villager_action_repetition_counter[agent_name] = (
-                self.villager_action_repetition_counter.get(agent_name, 0) + 1
+        # --- Apply Diversity Penalty ---
+        # Penalize actions that have been taken frequently by other villagers today
+        if counter.by_type:
+            scores *= self._crowding_penalties(counter.by_type)[type_id_array]
+        if num_social and counter.by_target and self.REPEAT_TARGET_PENALTY != 1.0:
+            # Per-target crowding: villagers already gifted/talked to today
+            repeats = np.array(
+                [
+                    counter.target_count(type_name, villager.name)
+                    for villager in social_targets
+                    for type_name in ("GIVE_GIFT", "TALK_TO_VILLAGER")
+                ],
+                dtype=np.float64,
             )
-        else:
-            self.villager_action_repetition_counter[agent_name] = 0
-
-        self.villager_last_action_details[agent_name] = (
-            chosen_action_details.copy()
-        )  # Store a copy
-
-        # Ensure agent_name is in the action for the environment
-        if (
-            "villager_name" not in chosen_action_details
-            and chosen_action_details["type"] != "IDLE"
-        ):
-            chosen_action_details["villager_name"] = agent_name
-
-        # Debug prints (optional)
-        # print(f"Agent Choosing: Day {current_day}, Bells {current_bells}, AvgFriend {state.get('avg_friendship',0):.1f}")
-        # print(f"Top 3 considered actions:")
-        # for i, pa in enumerate(possible_actions_with_scores[:3]):
-        # print(f"  {i+1}. {pa['action']['type']} (Target: {pa['action'].get('target_villager_name', 'N/A')}, Item: {pa['action'].get('gift_name', pa['action'].get('task_name','N/A'))}) - Score: {pa['score']:.2f}")
-        # print(f"Chosen action: {chosen_action_details}")
-
-        return chosen_action_details
+            scores[social] *= self.REPEAT_TARGET_PENALTY**repeats
+        scores[~valid] = -np.inf
+        return type_ids, payloads, scores
@@ -0,0 +1,120 @@
+"""
+Compact binary checkpoints of a running ACNH simulation.
+
+A checkpoint holds the environment (villagers and their store, inventories,
+markets, farm plots, tasks), the agent (weights, targets, repetition counters)
+and the state of the `random` module, so a resumed run continues bit-for-bit.
+The item dataset is not stored; it is reloaded from CSV and reattached.
+
+Payloads are pickled and zlib-compressed, then written to a temporary file and
+moved into place with `os.replace`, so a crash mid-write never leaves a torn
+checkpoint behind; a failed write removes its temporary file.
+
+Loading unpickles the payload, which can run arbitrary code: only load
+checkpoints this package wrote, from a location you trust.
+"""
+
+import contextlib
+import os
+import pickle
+import random
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+from enigma_engines.animal_crossing.core.agent import Multi_Objective_Agent
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+from enigma_engines.animal_crossing.core.load_data import ACNHItemDataset
+
+CHECKPOINT_MAGIC = b"ACNHCKPT"
+CHECKPOINT_VERSION = 2  # 2: villager counters moved into VillagerStore
+
+
+def save_checkpoint(
+    path: str,
+    env: ACNHEnvironment,
+    agent: Multi_Objective_Agent,
+    extra: Optional[Dict[str, Any]] = None,
+    compression_level: int = 6,
+) -> Dict[str, Any]:
+    """
+    Atomically writes a checkpoint of `env`, `agent` and the RNG state to `path`.
+
+    Args:
+        path: Destination file.
+        env: The environment to capture.
+        agent: The agent to capture.
+        extra: Additional picklable run state (e.g. the day counter).
+        compression_level: zlib level, 0-9.
+    Returns:
+        Dict[str, Any]: The checkpoint size in bytes and the write time in seconds.
+    """
+    start = time.perf_counter()
+    payload = {
+        "version": CHECKPOINT_VERSION,
+        "environment": env,
+        "agent": agent,
+        "random_state": random.getstate(),
+        "extra": extra or {},
+    }
+    blob = CHECKPOINT_MAGIC + zlib.compress(
+        pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), compression_level
+    )
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+    return {"bytes": len(blob), "seconds": time.perf_counter() - start}
+
+
+def load_checkpoint(
+    path: str,
+    dataset: Optional[ACNHItemDataset] = None,
+    restore_random_state: bool = True,
+) -> Tuple[ACNHEnvironment, Multi_Objective_Agent, Dict[str, Any]]:
+    """
+    Restores an environment and agent from a checkpoint written by `save_checkpoint`.
+
+    The file is unpickled, so it must come from a trusted source.
+
+    Args:
+        path: Checkpoint file.
+        dataset: Dataset to reattach. Loaded from the default data path when None.
+        restore_random_state: Also restore the `random` module's state, which is
+                              required for a bit-for-bit continuation.
+    Returns:
+        Tuple[ACNHEnvironment, Multi_Objective_Agent, Dict[str, Any]]: The restored
+        environment, agent and the `extra` run state.
+    """
+    with open(path, "rb") as f:
+        blob = f.read()
+    if not blob.startswith(CHECKPOINT_MAGIC):
+        raise ValueError(f"'{path}' is not an ACNH checkpoint")
+    # Checkpoints are trusted local files written by save_checkpoint
+    payload = pickle.loads(zlib.decompress(blob[len(CHECKPOINT_MAGIC) :]))  # noqa: S301
+    if payload.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(
+            f"Unsupported checkpoint version {payload.get('version')} in '{path}'"
+        )
+
+    if dataset is None:
+        dataset = ACNHItemDataset()
+    env = payload["environment"]
+    agent = payload["agent"]
+    env.dataset = dataset
+    agent.dataset = dataset
+    if restore_random_state:
+        random.setstate(payload["random_state"])
+    return env, agent, payload["extra"]
@@ -1,10 +1,36 @@
 import datetime
 import math  # For math.ceil
 import random
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
+from enigma_engines.animal_crossing.core.instrumentation import (
+    EnvironmentInstrumentation,
+)
 from enigma_engines.animal_crossing.core.load_data import ACNHItemDataset
 from enigma_engines.animal_crossing.core.villager import ACNHVillager
+from enigma_engines.animal_crossing.core.villager_store import VillagerStore
+
+# Nook Miles criteria types `_check_task_criteria` can evaluate. Tasks without
+# criteria always complete; tasks with any other criteria type never do.
+TASK_CRITERIA_TYPES = frozenset(
+    {
+        "collect_item",
+        "sell_item_category",
+        "catch_specific_fish",
+        "earn_bells_selling",
+        "plant_crop",
+        "talk_to_villagers",
+        "spend_bells",
+    }
+)
+# Actions that act on island resources. They are applied whether or not an
+# acting villager is passed to `step`.
+ISLAND_ACTION_TYPES = frozenset(
+    {"WORK_FOR_BELLS_ISLAND", "BUY_TURNIPS", "SELL_TURNIPS", "ADVANCE_DAY"}
+)
 
 
 class ACNHEnvironment:
@@ -12,6 +38,8 @@ class ACNHEnvironment:
     BASE_FISH_CATCH_PROBABILITY = 0.6
     FISHING_PROBABILITY_DECREMENT_PER_ATTEMPT = 0.05  # 10% reduction per attempt
     MIN_FISH_CATCH_PROBABILITY = 0.10  # Minimum 10% chance
+    # Share of every pairwise bond kept overnight (VillagerStore.relationships)
+    RELATIONSHIP_DAILY_DECAY = 0.95
 
     def __init__(
         self,
@@ -23,6 +51,7 @@ class ACNHEnvironment:
         villager_addition_interval_days: int = 3,
         villager_addition_percentage: float = 0.20,  # e.g., 20% of current, or at least 1
         max_total_villagers: int = 500,
+        instrument: bool = False,
     ):
         self.dataset = dataset if dataset else ACNHItemDataset(data_path=data_path)
         self._initial_num_villagers = num_villagers
@@ -44,16 +73,67 @@ class ACNHEnvironment:
         self.TURNIP_SATURATION_DAILY_RECOVERY_RATE = 0.03  # Additive recovery
         self.TURNIP_SATURATION_MAX_FACTOR = 1.2  # Allows for "good market" days
 
-        # Tracker for fishing attempts per villager per day
-        self.fishing_attempts_today: Dict[str, int] = {}
-
         # Villager addition dynamics
         self.VILLAGER_ADDITION_INTERVAL_DAYS = villager_addition_interval_days
         self.VILLAGER_ADDITION_PERCENTAGE = villager_addition_percentage
         self.MAX_TOTAL_VILLAGERS = max_total_villagers
 
+        # Latency instrumentation. When off, step() is the plain method and the
+        # day cycle only pays an `is not None` check per phase.
+        self.instrumentation: Optional[EnvironmentInstrumentation] = None
+        if instrument:
+            self.instrumentation = EnvironmentInstrumentation()
+            self._uninstrumented_step = self.step
+            self._uninstrumented_check_task_criteria = self._check_task_criteria
+            self.step = self._instrumented_step
+            self._check_task_criteria = self._instrumented_check_task_criteria
+
         self.reset()  # Calls most initializations
 
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickles simulation state only; the dataset is reattached on restore."""
+        state = self.__dict__.copy()
+        state["dataset"] = None
+        # Instance-bound instrumentation wrappers are rebuilt in __setstate__
+        for name in (
+            "step",
+            "_check_task_criteria",
+            "_uninstrumented_step",
+            "_uninstrumented_check_task_criteria",
+        ):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        if self.instrumentation is not None:
+            self._uninstrumented_step = self.step
+            self._uninstrumented_check_task_criteria = self._check_task_criteria
+            self.step = self._instrumented_step
+            self._check_task_criteria = self._instrumented_check_task_criteria
+
+    def _instrumented_step(
+        self, action: Dict, agent_obj: Optional[ACNHVillager] = None
+    ):
+        start = time.perf_counter_ns()
+        try:
+            return self._uninstrumented_step(action, agent_obj)
+        finally:
+            self.instrumentation.record_action(
+                action.get("type"), time.perf_counter_ns() - start
+            )
+
+    def _instrumented_check_task_criteria(
+        self, agent: "ACNHVillager", task_name: str
+    ) -> bool:
+        start = time.perf_counter_ns()
+        try:
+            return self._uninstrumented_check_task_criteria(agent, task_name)
+        finally:
+            self.instrumentation.record_phase(
+                "task_criteria", time.perf_counter_ns() - start
+            )
+
     def _populate_initial_villagers(self, num_to_populate: int):
         if not self.dataset.villager_names:
             self.villagers = []
@@ -71,7 +151,63 @@ class ACNHEnvironment:
         if num_can_add > 0:
             names_to_add = random.sample(potential_new_names, num_can_add)
             for name in names_to_add:
-                self.villagers.append(ACNHVillager(name))
+                villager = ACNHVillager(name, store=self.villager_store)
+                self.villagers.append(villager)
+                self._update_task_feasibility(villager)
+
+    def add_villager(self, villager: ACNHVillager):
+        """
+        Moves a villager from elsewhere, e.g. another island, onto this island.
+
+        Its friendship, bells, Nook Miles, inventory and today's log are kept;
+        it gets a new slot at the end of `villager_store`.
+
+        Raises:
+            ValueError: If the island is full or already has a villager of that name.
+        """
+        if len(self.villagers) >= self.MAX_TOTAL_VILLAGERS:
+            raise ValueError(
+                f"Island is full ({self.MAX_TOTAL_VILLAGERS} villagers), "
+                f"cannot add '{villager.name}'"
+            )
+        if any(v.name == villager.name for v in self.villagers):
+            raise ValueError(f"Villager '{villager.name}' already lives here")
+        villager.rehome(self.villager_store)
+        self.villagers.append(villager)
+        self._update_task_feasibility(villager)
+
+    def remove_villager(self, name: str) -> ACNHVillager:
+        """
+        Moves a villager off the island and returns it, detached.
+
+        The returned villager keeps its numeric state in a private store and
+        can be handed to another island's `add_villager`. Its bonds on this
+        island are dropped and its unharvested crops are cleared, since only
+        a plot's owner can harvest it.
+
+        Raises:
+            ValueError: If no villager of that name lives here.
+        """
+        index = next((i for i, v in enumerate(self.villagers) if v.name == name), None)
+        if index is None:
+            raise ValueError(f"No villager named '{name}' lives here")
+        villager = self.villagers.pop(index)
+        slot = villager.slot
+        villager.rehome(VillagerStore(capacity=1))
+        self.villager_store.remove(slot)
+        for later in self.villagers[index:]:
+            later.slot -= 1
+
+        self.task_feasibility.pop(name, None)
+        for plot_id, plot in self.farm_plots.items():
+            if plot["owner_villager"] == name:
+                self.farm_plots[plot_id] = {
+                    "crop_name": None,
+                    "plant_day": -1,
+                    "ready_day": -1,
+                    "owner_villager": None,
+                }
+        return villager
 
     def _conditionally_add_new_villagers(self):
         """
@@ -120,17 +256,25 @@ class ACNHEnvironment:
         )  # Reset to base probability
         self.current_date = datetime.date(2025, 4, 6)  # Example start date
         self.villagers: List[ACNHVillager] = []
+        # Columnar numeric state shared by all villagers; slot i is villagers[i]
+        self.villager_store = VillagerStore(capacity=max(16, self.MAX_TOTAL_VILLAGERS))
+        # Per-villager bitmask of the active Nook Miles tasks whose criteria
+        # currently pass; bit `nook_task_bits[task]`. See `_reset_task_feasibility`.
+        self.active_nook_tasks: Dict[str, Dict] = {}
+        self.nook_task_bits: Dict[str, int] = {}
+        self.task_feasibility: Dict[str, int] = {}
+        self._always_feasible_task_mask = 0
+        self._criteria_task_bits: List[Tuple[str, int]] = []
+        # DO_NOOK_MILES_TASK steps that awarded no miles
+        self.wasted_task_steps = 0
 
         # Ensure initial population respects MAX_TOTAL_VILLAGERS
         num_for_reset = min(self._initial_num_villagers, self.MAX_TOTAL_VILLAGERS)
         if self.dataset.villager_names:
             self._populate_initial_villagers(num_for_reset)
 
-        for v in self.villagers:
-            v.reset_daily_log()
-
-        # Reset fishing attempts tracker
-        self.fishing_attempts_today.clear()
+        # Also resets today's fishing attempts and items sold
+        self.villager_store.reset_daily_logs()
 
         self.bells = 1000
         self.nook_miles = 500
@@ -150,7 +294,6 @@ class ACNHEnvironment:
             }
             for i in range(self.max_farm_plots)
         }
-        self.active_nook_tasks: Dict[str, Dict] = {}
 
         self.update_turnip_prices()  # Sets initial turnip prices for day 0
         self.assign_daily_nook_tasks()
@@ -208,12 +351,109 @@ class ACNHEnvironment:
         )
         # print(f"DEBUG: Turnip market updated. Factor: {self.turnip_market_saturation_factor:.2f} (sold {quantity_sold})")
 
+    def sell_visitor_turnips(self, quantity: int) -> int:
+        """
+        Buys turnips brought by a visitor from another island.
+
+        Pays today's sell price and saturates this island's market like a
+        local sale; the bells go to the visitor, not to this island.
+
+        Returns:
+            int: Bells paid to the visitor (0 while the market is closed).
+        """
+        if quantity <= 0 or self.turnip_sell_price <= 0:
+            return 0
+        earnings = quantity * self.turnip_sell_price
+        self._update_turnip_market_on_sale(quantity)
+        return earnings
+
+    def sell_visitor_fish(self, fish_name: str, quantity: int) -> int:
+        """
+        Buys fish brought by a visitor from another island at this island's
+        saturated price, saturating the market further.
+
+        Returns:
+            int: Bells paid to the visitor (0 for unknown fish).
+        """
+        details = self.dataset.get_fish_details(fish_name)
+        if quantity <= 0 or details is None:
+            return 0
+        earnings = quantity * self._get_saturated_fish_price(fish_name, details["Sell"])
+        self._update_fish_market_on_sale(fish_name, quantity)
+        return earnings
+
+    def remove_villager_items(
+        self, villager: ACNHVillager, item_name: str, quantity: int
+    ) -> bool:
+        """
+        Takes items out of a villager's inventory outside `step`, e.g. to ship
+        them to another island, keeping the villager's task feasibility current.
+
+        Returns:
+            bool: False, removing nothing, if the villager holds fewer items.
+        """
+        removed = villager.remove_from_inventory(item_name, quantity)
+        if removed:
+            self._update_task_feasibility(villager)
+        return removed
+
     def assign_daily_nook_tasks(
         self, count=20
     ):  # Reduced default count for quicker testing
         self.active_nook_tasks = self.dataset.get_daily_nook_miles_task_templates(
             count=count
         )
+        self._reset_task_feasibility()
+
+    def _reset_task_feasibility(self):
+        """
+        Assigns each active task a bit and recomputes every villager's mask.
+
+        Called when tasks are (re)assigned, which is also when daily logs have
+        just been reset. Tasks without criteria are set in every mask and tasks
+        whose criteria type cannot be evaluated in none, once per assignment;
+        only the remaining tasks are re-checked as villagers act.
+        """
+        self.nook_task_bits = {
+            task_name: bit for bit, task_name in enumerate(self.active_nook_tasks)
+        }
+        self._always_feasible_task_mask = 0
+        self._criteria_task_bits = []
+        for task_name, bit in self.nook_task_bits.items():
+            criteria = (self.active_nook_tasks[task_name] or {}).get("criteria")
+            if not criteria:
+                self._always_feasible_task_mask |= 1 << bit
+            elif criteria.get("type") in TASK_CRITERIA_TYPES:
+                self._criteria_task_bits.append((task_name, bit))
+        self.task_feasibility = {}
+        for villager in self.villagers:
+            self._update_task_feasibility(villager)
+
+    def _update_task_feasibility(self, villager: ACNHVillager):
+        """Re-checks the criteria-bearing tasks for one villager."""
+        mask = self._always_feasible_task_mask
+        for task_name, bit in self._criteria_task_bits:
+            if task_name in self.active_nook_tasks and self._check_task_criteria(
+                villager, task_name
+            ):
+                mask |= 1 << bit
+        self.task_feasibility[villager.name] = mask
+
+    def _strengthen_bond(
+        self, actor: ACNHVillager, target: ACNHVillager, points: float
+    ):
+        """Records a social interaction in the pairwise relationship matrix."""
+        if points and actor.store is target.store is self.villager_store:
+            self.villager_store.add_relationship(actor.slot, target.slot, points)
+
+    def is_task_feasible(self, villager_name: str, task_name: str) -> bool:
+        """Whether `task_name` is active and `villager_name` meets its criteria."""
+        bit = self.nook_task_bits.get(task_name)
+        return (
+            bit is not None
+            and task_name in self.active_nook_tasks
+            and bool(self.task_feasibility.get(villager_name, 0) >> bit & 1)
+        )
 
     def _check_task_criteria(self, agent: "ACNHVillager", task_name: str) -> bool:
         task_details = self.active_nook_tasks.get(task_name)
@@ -318,8 +558,8 @@ class ACNHEnvironment:
         action_type = action.get("type")
         # print(f"DEBUG ENV (Day {self.current_day}): Action '{action_type}' by '{action.get('villager_name', 'N/A')}'")
 
-        # --- Actions primarily affecting the acting_villager or island resources ---
-        if acting_villager:
+        # --- Actions primarily affecting the acting_villager ---
+        if acting_villager and action_type not in ISLAND_ACTION_TYPES:
             if action_type == "RECEIVE_GIFT":
                 villager_name = action.get("villager_name")
                 # gift_details should be a dictionary, for example:
@@ -383,9 +623,7 @@ class ACNHEnvironment:
                 gift_name = action.get("gift_name")
 
                 # --- DEBUG Lines for GIVE_GIFT ---
-                print(
-                    f"DEBUG ENV: Attempting GIVE_GIFT. Actor: {acting_villager.name}, Target: {target_villager_name}, Gift: {gift_name}"
-                )
+                # print(f"DEBUG ENV: Attempting GIVE_GIFT. Actor: {acting_villager.name}, Target: {target_villager_name}, Gift: {gift_name}")
 
                 target_villager = next(
                     (v for v in self.villagers if v.name == target_villager_name), None
@@ -396,7 +634,7 @@ class ACNHEnvironment:
                 # print(f"DEBUG ENV: Gift Details from dataset for '{gift_name}': {gift_details}")
 
                 if target_villager and gift_details:
-                    print(gift_details)
+                    # print(gift_details)
                     cost_of_gift = gift_details.get("cost", 0)
                     friendship_points_potential = gift_details.get(
                         "friendship_points", 0
@@ -434,6 +672,9 @@ class ACNHEnvironment:
                                 friendship_gain = 0
 
                             delta_friendship_total += friendship_gain
+                            self._strengthen_bond(
+                                acting_villager, target_villager, friendship_gain
+                            )
                             # print(f"DEBUG ENV: Gift given. delta_friendship_total is now: {delta_friendship_total}. Target {target_villager.name} new friendship: {target_villager.friendship_level} (check villager's internal state)")
 
             elif action_type == "TALK_TO_VILLAGER":  # New action
@@ -449,6 +690,9 @@ class ACNHEnvironment:
                         255, target_villager.friendship_level + base_friendship_gain
                     )
                     delta_friendship_total += base_friendship_gain
+                    self._strengthen_bond(
+                        acting_villager, target_villager, base_friendship_gain
+                    )
                     # print(f"DEBUG: {acting_villager.name} talked to {target_villager.name}. Friendship +{base_friendship_gain}")
 
             elif action_type == "DO_NOOK_MILES_TASK":
@@ -463,8 +707,12 @@ class ACNHEnvironment:
                         # Nook Miles awarded to the island pool or player agent
                         self.nook_miles += task_info["miles"]
                         delta_nook_miles += task_info["miles"]
-                    # else: print(f"DEBUG: Criteria not met for task {task_name} by {acting_villager.name}")
-                # else: print(f"DEBUG: Task {task_name} not active or already completed.")
+                    else:
+                        # Criteria not met for this villager
+                        self.wasted_task_steps += 1
+                else:
+                    # Task not active or already completed
+                    self.wasted_task_steps += 1
 
             elif action_type == "SELL_ITEMS":
                 items_to_sell_list = action.get(
@@ -562,10 +810,9 @@ class ACNHEnvironment:
             elif action_type == "GO_FISHING":
                 fish_name = self.dataset.get_random_fish()
                 if fish_name:
-                    villager_id = acting_villager.name
-
-                    # Get the number of attempts already made today by this villager
-                    attempts_this_day = self.fishing_attempts_today.get(villager_id, 0)
+                    # Attempts made today are counted in the villager's store slot
+                    attempts = acting_villager.store.fishing_attempts
+                    attempts_this_day = int(attempts[acting_villager.slot])
 
                     # Calculate current catch probability - decreases with each attempt today
                     current_catch_probability = max(
@@ -581,7 +828,7 @@ class ACNHEnvironment:
                     )
 
                     # Increment attempts for this villager for today
-                    self.fishing_attempts_today[villager_id] = attempts_this_day + 1
+                    attempts[acting_villager.slot] = attempts_this_day + 1
 
                     if (
                         random.random() < current_catch_probability
@@ -645,17 +892,19 @@ class ACNHEnvironment:
         elif action_type == "ADVANCE_DAY":
             self.advance_day_cycle()  # This method now handles all daily updates including saturation recovery
 
-        elif not acting_villager and action_type not in [
-            "WORK_FOR_BELLS_ISLAND",
-            "BUY_TURNIPS",
-            "SELL_TURNIPS",
-            "ADVANCE_DAY",
-            "IDLE",
-        ]:
+        elif (
+            not acting_villager
+            and action_type not in ISLAND_ACTION_TYPES
+            and action_type != "IDLE"
+        ):
             print(
                 f"WARN: Action '{action_type}' might require a specific acting_villager but none was resolved or action is unhandled for island."
             )
 
+        # Inventories and activity logs only change for the acting villager
+        if acting_villager is not None and self._criteria_task_bits:
+            self._update_task_feasibility(acting_villager)
+
         # Calculate average friendship delta based on total points gained this step
         avg_friendship_delta = (
             delta_friendship_total / len(self.villagers)
@@ -689,13 +938,17 @@ class ACNHEnvironment:
                 self._populate_initial_villagers(actual_num_to_add)
 
     def advance_day_cycle(self):
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            mark = day_start = time.perf_counter_ns()
+
         self.current_day += 1
         self.current_date += datetime.timedelta(days=1)
-        for villager in self.villagers:
-            villager.reset_daily_log()
-
-        # Reset fishing attempts tracker for the new day
-        self.fishing_attempts_today.clear()
+        # Also resets the fishing attempts tracker for the new day
+        self.villager_store.reset_daily_logs()
+        self.villager_store.decay_relationships(self.RELATIONSHIP_DAILY_DECAY)
+        if instrumentation is not None:
+            mark = instrumentation.lap("day.reset_daily_logs", mark)
 
         # Recover Fish Market Saturation
         for fish_name in list(
@@ -719,8 +972,15 @@ class ACNHEnvironment:
             + self.TURNIP_SATURATION_DAILY_RECOVERY_RATE,
         )
 
+        if instrumentation is not None:
+            mark = instrumentation.lap("day.market_recovery", mark)
+
         self.update_turnip_prices()  # This will use the recovered saturation factor
+        if instrumentation is not None:
+            mark = instrumentation.lap("day.turnip_prices", mark)
         self.assign_daily_nook_tasks()
+        if instrumentation is not None:
+            mark = instrumentation.lap("day.assign_nook_tasks", mark)
 
         # Conditionally add new villagers
         if (
@@ -728,13 +988,156 @@ class ACNHEnvironment:
             and self.current_day % self.VILLAGER_ADDITION_INTERVAL_DAYS == 0
         ):
             self._conditionally_add_new_villagers()
+        if instrumentation is not None:
+            instrumentation.lap("day.villager_addition", mark)
+            instrumentation.lap("day.total", day_start)
+
+    def _next_event_day(self, start_day: int, end_day: int) -> Optional[int]:
+        """First day in (start_day, end_day] on which a crop ripens or villagers may arrive."""
+        candidates = [
+            plot["ready_day"]
+            for plot in self.farm_plots.values()
+            if plot["crop_name"] is not None
+            and start_day < plot["ready_day"] <= end_day
+        ]
+        interval = self.VILLAGER_ADDITION_INTERVAL_DAYS
+        if (
+            interval > 0
+            and self.VILLAGER_ADDITION_PERCENTAGE > 0
+            and len(self.villagers) < self.MAX_TOTAL_VILLAGERS
+        ):
+            next_addition = (start_day // interval + 1) * interval
+            if next_addition <= end_day:
+                candidates.append(next_addition)
+        return min(candidates) if candidates else None
 
-    def get_state(self) -> Dict[str, Any]:  # Added type hint for clarity
-        avg_friendship = (
-            sum(v.friendship_level for v in self.villagers) / len(self.villagers)
-            if self.villagers
-            else 0
+    def _draw_turnip_prices(self, first_day_offset: int, num_days: int):
+        """
+        Draws turnip prices for `num_days` consecutive idle days in one batch.
+
+        Uses the same distribution as `update_turnip_prices`, with the
+        saturation factor recovering along the way. The NumPy generator is
+        seeded from `random`, so runs stay reproducible under `random.seed`.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Buy and sell prices per day.
+        """
+        rng = np.random.default_rng(random.getrandbits(64))
+        offsets = np.arange(first_day_offset, first_day_offset + num_days)
+        start_weekday = self.current_date.weekday()
+        weekdays = (start_weekday + offsets) % 7
+        factors = np.minimum(
+            self.TURNIP_SATURATION_MAX_FACTOR,
+            self.turnip_market_saturation_factor
+            + self.TURNIP_SATURATION_DAILY_RECOVERY_RATE * offsets,
+        )
+
+        base_prices = rng.integers(40, 151, size=num_days)
+        spikes = rng.random(num_days) < 0.15
+        base_prices[spikes] = rng.integers(150, 601, size=int(spikes.sum()))
+        sell_prices = np.maximum(
+            10, (base_prices * np.minimum(1.0, factors)).astype(np.int64)
         )
+        buy_prices = np.zeros(num_days, dtype=np.int64)
+
+        sundays = weekdays == 6
+        sell_prices[sundays] = 0
+        buy_prices[sundays] = rng.integers(90, 111, size=int(sundays.sum()))
+        return buy_prices, sell_prices
+
+    def fast_forward(self, days: int, stop_on_event: bool = False) -> Dict[str, Any]:
+        """
+        Advances `days` idle days in aggregate instead of one cycle at a time.
+
+        Market saturation recovers and relationships decay in closed form,
+        turnip prices for the skipped days are drawn in one batch, daily logs
+        are reset once and Nook Miles tasks are assigned for the landing day
+        only. Villager immigration is
+        applied event by event on the days `advance_day_cycle` would apply it,
+        so an idle stretch costs O(events) rather than O(days) Python work.
+
+        The RNG stream differs from stepping day by day, so trajectories match
+        `advance_day_cycle` in distribution, not draw for draw.
+
+        Args:
+            days: Number of days to skip.
+            stop_on_event: Stop at the first day a crop becomes ready or
+                           villagers may arrive, instead of skipping all `days`.
+        Returns:
+            Dict[str, Any]: Days advanced, the event stopped on (if any), the
+            number of villagers added and the buy/sell prices of every skipped day.
+        """
+        if days <= 0:
+            return {
+                "days_advanced": 0,
+                "stopped_on": None,
+                "villagers_added": 0,
+                "turnip_buy_prices": np.zeros(0, dtype=np.int64),
+                "turnip_sell_prices": np.zeros(0, dtype=np.int64),
+            }
+
+        start_day = self.current_day
+        target_day = start_day + days
+        stopped_on = None
+        if stop_on_event:
+            event_day = self._next_event_day(start_day, target_day)
+            if event_day is not None:
+                target_day = event_day
+                is_crop_day = any(
+                    plot["crop_name"] is not None and plot["ready_day"] == event_day
+                    for plot in self.farm_plots.values()
+                )
+                stopped_on = "crop_ready" if is_crop_day else "villager_addition"
+        days = target_day - start_day
+
+        buy_prices, sell_prices = self._draw_turnip_prices(1, days)
+
+        # Villager immigration, applied once per addition day within the stretch
+        villagers_before = len(self.villagers)
+        interval = self.VILLAGER_ADDITION_INTERVAL_DAYS
+        if interval > 0 and self.VILLAGER_ADDITION_PERCENTAGE > 0:
+            addition_day = (start_day // interval + 1) * interval
+            while (
+                addition_day <= target_day
+                and len(self.villagers) < self.MAX_TOTAL_VILLAGERS
+            ):
+                self._conditionally_add_new_villagers()
+                addition_day += interval
+
+        # Closed-form market recovery (additive, capped)
+        self.turnip_market_saturation_factor = min(
+            self.TURNIP_SATURATION_MAX_FACTOR,
+            self.turnip_market_saturation_factor
+            + self.TURNIP_SATURATION_DAILY_RECOVERY_RATE * days,
+        )
+        fish_recovery = self.FISH_SATURATION_DAILY_RECOVERY_RATE * days
+        for fish_name in list(self.fish_market_saturation.keys()):
+            recovered_factor = min(
+                1.0, self.fish_market_saturation[fish_name] + fish_recovery
+            )
+            if recovered_factor >= 0.99:
+                del self.fish_market_saturation[fish_name]
+            else:
+                self.fish_market_saturation[fish_name] = recovered_factor
+
+        self.current_day = target_day
+        self.current_date += datetime.timedelta(days=days)
+        self.villager_store.reset_daily_logs()
+        self.villager_store.decay_relationships(self.RELATIONSHIP_DAILY_DECAY**days)
+        self.turnip_buy_price = int(buy_prices[-1])
+        self.turnip_sell_price = int(sell_prices[-1])
+        self.assign_daily_nook_tasks()
+
+        return {
+            "days_advanced": days,
+            "stopped_on": stopped_on,
+            "villagers_added": len(self.villagers) - villagers_before,
+            "turnip_buy_prices": buy_prices,
+            "turnip_sell_prices": sell_prices,
+        }
+
+    def get_state(self) -> Dict[str, Any]:  # Added type hint for clarity
+        avg_friendship = self.villager_store.mean_friendship()
         # Ensure player_inventory is part of the state if agent needs it
         # This assumes 'Player' is an ACNHVillager instance in self.villagers or handled separately.
         player_obj = next(
@@ -762,19 +1165,20 @@ class ACNHEnvironment:
             "bells": self.bells,
             "nook_miles": self.nook_miles,
             "avg_friendship": avg_friendship,
-            "villagers_friendship": {
-                v.name: v.friendship_level for v in self.villagers
-            },  # For agent to see individual levels
+            "avg_relationship": self.villager_store.mean_relationship(),
+            "villagers_friendship": self.villager_store.friendship_by_name(),  # For agent to see individual levels
             "player_inventory": player_inv_for_state,  # Crucial for SELL_ITEMS
             "turnips_owned": self.turnips_owned_by_island,  # Assuming island owns turnips
             "turnip_buy_price": self.turnip_buy_price,
             "turnip_sell_price": self.turnip_sell_price,
             "active_nook_tasks": self.active_nook_tasks.copy(),  # Return a copy
+            "nook_task_bits": self.nook_task_bits.copy(),
+            "task_feasibility": self.task_feasibility.copy(),
             "farm_plots": self.farm_plots.copy(),  # Return a copy
             # Potentially add market saturation factors if agent needs to be aware of them directly
             "current_turnip_saturation": self.turnip_market_saturation_factor,
             # "current_fish_saturation": self.fish_market_saturation.copy(), # Could be large
-            "fishing_attempts_today": self.fishing_attempts_today.copy(),  # For debugging or UI feedback
+            "fishing_attempts_today": self.villager_store.fishing_attempts_by_name(),  # For debugging or UI feedback
             "current_catch_probability": self.current_catch_probability,  # For debugging or UI feedback
             "max_total_villagers": self.MAX_TOTAL_VILLAGERS,
             "current_villager_count": len(self.villagers),
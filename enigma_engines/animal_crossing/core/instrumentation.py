@@ -0,0 +1,128 @@
+import json
+import time
+from typing import Any, Dict, Optional
+
+# Power-of-two nanosecond buckets: bucket b holds latencies in [2**(b-1), 2**b).
+# 40 buckets reach ~9 minutes, far beyond any single step or day phase.
+NUM_BUCKETS = 40
+
+
+class LatencyHistogram:
+    """
+    Fixed-size log2 histogram of nanosecond latencies.
+
+    Recording is an `int.bit_length()` and a list increment, so it is cheap
+    enough to run on every `step()` call. Percentiles are reported as the upper
+    edge of the bucket they fall in, i.e. within a factor of two.
+    """
+
+    __slots__ = ("buckets", "count", "total_ns", "min_ns", "max_ns")
+
+    def __init__(self):
+        self.buckets = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+
+    def record(self, elapsed_ns: int):
+        bucket = elapsed_ns.bit_length()
+        if bucket >= NUM_BUCKETS:
+            bucket = NUM_BUCKETS - 1
+        self.buckets[bucket] += 1
+        if self.count == 0 or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.count += 1
+        self.total_ns += elapsed_ns
+
+    def percentile(self, q: float) -> int:
+        """Upper bucket edge (ns) below which at least `q` (0-1) of samples fall."""
+        if self.count == 0:
+            return 0
+        threshold = q * self.count
+        seen = 0
+        for bucket, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if bucket_count and seen >= threshold:
+                return min(1 << bucket, self.max_ns)
+        return self.max_ns
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ns": self.total_ns,
+            "mean_ns": self.total_ns / self.count if self.count else 0.0,
+            "min_ns": self.min_ns,
+            "max_ns": self.max_ns,
+            "p50_ns": self.percentile(0.50),
+            "p90_ns": self.percentile(0.90),
+            "p99_ns": self.percentile(0.99),
+            # Sparse {upper_edge_ns: count} so exports stay small
+            "buckets": {
+                str(1 << bucket): bucket_count
+                for bucket, bucket_count in enumerate(self.buckets)
+                if bucket_count
+            },
+        }
+
+
+class EnvironmentInstrumentation:
+    """
+    Per-action-type and per-phase latency histograms for an ACNHEnvironment.
+
+    Actions are keyed by their `type`; phases are named sections of
+    `advance_day_cycle` (prefixed `day.`) and nested checks such as
+    `task_criteria`.
+    """
+
+    def __init__(self):
+        self.actions: Dict[str, LatencyHistogram] = {}
+        self.phases: Dict[str, LatencyHistogram] = {}
+
+    def record_action(self, action_type: Optional[str], elapsed_ns: int):
+        histogram = self.actions.get(action_type)
+        if histogram is None:
+            histogram = self.actions[action_type] = LatencyHistogram()
+        histogram.record(elapsed_ns)
+
+    def record_phase(self, phase: str, elapsed_ns: int):
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = LatencyHistogram()
+        histogram.record(elapsed_ns)
+
+    def lap(self, phase: str, start_ns: int) -> int:
+        """Records the time since `start_ns` under `phase` and returns the current time."""
+        now = time.perf_counter_ns()
+        self.record_phase(phase, now - start_ns)
+        return now
+
+    def reset(self):
+        self.actions.clear()
+        self.phases.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "actions": {
+                str(action_type): histogram.to_dict()
+                for action_type, histogram in sorted(
+                    self.actions.items(), key=lambda item: -item[1].total_ns
+                )
+            },
+            "phases": {
+                phase: histogram.to_dict()
+                for phase, histogram in sorted(
+                    self.phases.items(), key=lambda item: -item[1].total_ns
+                )
+            },
+        }
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """Serializes the histograms; also writes them to `path` when given."""
+        payload = json.dumps(self.to_dict(), indent=2)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(payload)
+        return payload
@@ -1,11 +1,40 @@
+import hashlib
+import json
 import os
 import random
 from typing import Any, Dict, List, Optional, Union
 
-import pandas as pd
-
 from enigma_engines.animal_crossing.core.data_simulation import generate_crops_dataset
 
+# Overrides the snapshot directory (default: $XDG_CACHE_HOME/enigma_engines)
+SNAPSHOT_DIR_ENV = "ENIGMA_ENGINES_CACHE_DIR"
+# Bump when the parsed layout changes so stale snapshots are rebuilt
+DATASET_SNAPSHOT_VERSION = 2
+_SNAPSHOT_FIELDS = (
+    "villager_names",
+    "gift_options",
+    "nook_miles_task_templates",
+    "fish_data",
+    "crop_definitions",
+)
+# Stored as [key, value] pairs: item names parsed from the CSVs are not all strings
+_SNAPSHOT_DICT_FIELDS = (
+    "gift_options",
+    "nook_miles_task_templates",
+    "crop_definitions",
+)
+
+
+def default_snapshot_dir() -> str:
+    """The user cache directory for dataset snapshots."""
+    directory = os.environ.get(SNAPSHOT_DIR_ENV)
+    if directory:
+        return directory
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "enigma_engines")
+
 
 class ACNHItemDataset:
     """
@@ -16,10 +45,33 @@ class ACNHItemDataset:
     stored in a specified data path. It provides methods to retrieve random
     or specific pieces of this data. If data files are missing or corrupted,
     it falls back to default placeholder data and issues warnings.
+
+    Parsing the CSVs needs pandas and takes a few hundred milliseconds, so a
+    complete load is snapshotted as JSON to the user cache directory (see
+    `default_snapshot_dir`), one file per data path. Later loads (every sweep
+    or federation worker) read the snapshot instead, without importing pandas,
+    for as long as no CSV in the data path has changed. The data path itself
+    is never written to.
     """
 
-    def __init__(self, data_path="data"):
+    def __init__(
+        self,
+        data_path="data",
+        use_snapshot: bool = True,
+        snapshot_dir: Optional[str] = None,
+    ):
         self.data_path = data_path
+        self._gift_option_names: Optional[List[str]] = None
+        key = hashlib.blake2b(
+            os.path.abspath(data_path).encode("utf-8"), digest_size=8
+        ).hexdigest()
+        snapshot_path = os.path.join(
+            snapshot_dir or default_snapshot_dir(), f"acnh_dataset_{key}.json"
+        )
+        self.snapshot_path = snapshot_path if use_snapshot else None
+        if use_snapshot and self._load_snapshot(snapshot_path):
+            return
+
         self.villager_names = self._load_villager_names()
         self.gift_options = (
             self._load_item_data_for_gifts()
@@ -29,6 +81,8 @@ class ACNHItemDataset:
         )  # Achievement/task templates
         self.fish_data = self._load_fish_data()
         self.crop_definitions = self._load_crop_data()
+        # Only a load that needed no fallback data is worth snapshotting
+        complete = all(getattr(self, field) for field in _SNAPSHOT_FIELDS)
 
         if not self.villager_names:
             print("Warning: Villager names could not be loaded. Using fallback data.")
@@ -73,6 +127,74 @@ class ACNHItemDataset:
                 }
             }
 
+        if use_snapshot and complete:
+            try:
+                self._save_snapshot(snapshot_path)
+            except OSError as e:
+                print(
+                    f"Warning: Could not write dataset snapshot '{snapshot_path}': {e}"
+                )
+
+    def _csv_fingerprint(self) -> List[List[Union[str, int]]]:
+        """Name, size and modification time of every CSV in the data path."""
+        fingerprint = []
+        for entry in sorted(os.scandir(self.data_path), key=lambda e: e.name):
+            if entry.name.endswith(".csv") and entry.is_file():
+                stat = entry.stat()
+                fingerprint.append([entry.name, stat.st_size, stat.st_mtime_ns])
+        return fingerprint
+
+    def _load_snapshot(self, path: str) -> bool:
+        """
+        Restores the parsed data from the snapshot at `path` if it is current.
+
+        Args:
+            path: Location of the snapshot.
+        Returns:
+            bool: True if the snapshot matched the CSVs on disk and was loaded.
+        """
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            if (
+                snapshot.get("version") != DATASET_SNAPSHOT_VERSION
+                or snapshot.get("fingerprint") != self._csv_fingerprint()
+            ):
+                return False
+            data = snapshot["data"]
+            for field in _SNAPSHOT_FIELDS:
+                value = data[field]
+                setattr(
+                    self,
+                    field,
+                    dict(value) if field in _SNAPSHOT_DICT_FIELDS else value,
+                )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Warning: Could not read dataset snapshot '{path}': {e}")
+            return False
+        return True
+
+    def _save_snapshot(self, path: str):
+        """Writes the parsed data to `path` atomically, keyed by the CSV fingerprint."""
+        data = {}
+        for field in _SNAPSHOT_FIELDS:
+            value = getattr(self, field)
+            data[field] = (
+                list(value.items()) if field in _SNAPSHOT_DICT_FIELDS else value
+            )
+        snapshot = {
+            "version": DATASET_SNAPSHOT_VERSION,
+            "fingerprint": self._csv_fingerprint(),
+            "data": data,
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+
     def _load_csv_data(
         self, filename: str, required_columns: Optional[List[str]] = None
     ) -> Union[List[Any], List[Dict[str, Any]]]:
@@ -81,6 +203,9 @@ class ACNHItemDataset:
         based on the number of columns specified in `required_columns`.
         Handles potential NaN values by converting them to None.
         """
+        # pandas is only needed to parse CSVs; snapshot loads never import it
+        import pandas as pd
+
         file_path = os.path.join(self.data_path, filename)
         try:
             # Read CSV, explicitly keep empty strings as is initially, then handle NaNs
@@ -447,7 +572,11 @@ class ACNHItemDataset:
                 "sell_price": 10,
                 "category": "unknown",
             }
-        name = random.choice(list(self.gift_options.keys()))
+        # Cache the key list; rebuilding it per call dominated agent decisions
+        names = self._gift_option_names
+        if names is None or len(names) != len(self.gift_options):
+            names = self._gift_option_names = list(self.gift_options.keys())
+        name = random.choice(names)
         return name, self.gift_options[name]
 
     def get_daily_nook_miles_task_templates(self, count=5):  # Renamed for clarity
@@ -0,0 +1,191 @@
+"""
+Streaming, bounded-memory storage for per-day simulation metrics.
+
+`MetricsWriter` buffers rows in fixed-size NumPy chunks and appends each full
+chunk to one raw binary file per column (`<column>.bin`), alongside a small
+`meta.json` that records the column dtypes and the number of committed rows.
+`MetricsReader` memory-maps those files, so plotting and summaries read only
+the pages they touch, however long the run was.
+"""
+
+import json
+import os
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+META_FILENAME = "meta.json"
+
+# Column layout used by run_simulation for total_rewards_log
+REWARD_COLUMNS: Dict[str, str] = {
+    "friendship": "float64",
+    "bells": "int64",
+    "nook_miles": "int64",
+}
+
+
+class MetricsWriter:
+    """
+    Appends per-day metric rows to a columnar directory in fixed-size chunks.
+
+    Memory use is bounded by `chunk_size` rows per column. `meta.json` is only
+    updated after a chunk's bytes are on disk, so a crash can lose at most the
+    unflushed chunk; reopening with `resume_rows` truncates any torn tail.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        columns: Optional[Dict[str, str]] = None,
+        chunk_size: int = 4096,
+        resume_rows: Optional[int] = None,
+    ):
+        """
+        Args:
+            directory: Output directory; created if missing.
+            columns: Column name to NumPy dtype. Defaults to `REWARD_COLUMNS`.
+            chunk_size: Rows buffered in memory before a flush.
+            resume_rows: Continue an existing directory, keeping its first
+                         `resume_rows` rows. When None, existing data is discarded.
+        """
+        self.directory = directory
+        self.columns = dict(columns or REWARD_COLUMNS)
+        self.chunk_size = chunk_size
+        os.makedirs(directory, exist_ok=True)
+
+        self._buffers = {
+            name: np.empty(chunk_size, dtype=dtype)
+            for name, dtype in self.columns.items()
+        }
+        self._buffered = 0
+
+        if resume_rows is None:
+            self.rows = 0
+            for name in self.columns:
+                open(self._column_path(name), "wb").close()
+        else:
+            self.rows = resume_rows
+            for name, dtype in self.columns.items():
+                with open(self._column_path(name), "ab") as f:
+                    f.truncate(resume_rows * np.dtype(dtype).itemsize)
+        self._write_meta()
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.bin")
+
+    def _write_meta(self):
+        meta_path = os.path.join(self.directory, META_FILENAME)
+        tmp_path = f"{meta_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"columns": self.columns, "rows": self.rows}, f)
+        os.replace(tmp_path, meta_path)
+
+    def append(self, **values):
+        """Buffers one row; every column must be given."""
+        index = self._buffered
+        for name, buffer in self._buffers.items():
+            buffer[index] = values[name]
+        self._buffered += 1
+        if self._buffered == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Appends the buffered rows to the column files and commits them."""
+        if not self._buffered:
+            return
+        for name, buffer in self._buffers.items():
+            with open(self._column_path(name), "ab") as f:
+                f.write(buffer[: self._buffered].tobytes())
+        self.rows += self._buffered
+        self._buffered = 0
+        self._write_meta()
+
+    @property
+    def total_rows(self) -> int:
+        """Committed plus buffered rows."""
+        return self.rows + self._buffered
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self) -> "MetricsWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class MetricsReader:
+    """
+    Lazy, read-only view of a directory written by `MetricsWriter`.
+
+    Columns are returned as read-only `np.memmap` arrays. The reader supports
+    the mapping operations the plotting code uses (`[]`, `get`, `in`, `keys`),
+    so it can stand in for an in-memory `total_rewards_log` dict.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, META_FILENAME), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.columns: Dict[str, str] = meta["columns"]
+        self.rows: int = meta["rows"]
+        self._maps: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def keys(self):
+        return self.columns.keys()
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name not in self.columns:
+            raise KeyError(name)
+        column = self._maps.get(name)
+        if column is None:
+            dtype = np.dtype(self.columns[name])
+            if self.rows == 0:
+                column = np.zeros(0, dtype=dtype)
+            else:
+                column = np.memmap(
+                    os.path.join(self.directory, f"{name}.bin"),
+                    dtype=dtype,
+                    mode="r",
+                    shape=(self.rows,),
+                )
+            self._maps[name] = column
+        return column
+
+    def get(self, name: str, default=None):
+        return self[name] if name in self.columns else default
+
+    def iter_chunks(
+        self, name: str, chunk_size: int = 1 << 16
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yields `(start_row, values)` slices of one column."""
+        column = self[name]
+        for start in range(0, self.rows, chunk_size):
+            yield start, np.asarray(column[start : start + chunk_size])
+
+    def summary(self, names: Optional[Sequence[str]] = None) -> Dict[str, Dict]:
+        """Min, max, mean and last value per column, computed chunk by chunk."""
+        results = {}
+        for name in names or self.columns:
+            if self.rows == 0:
+                results[name] = {"min": None, "max": None, "mean": None, "last": None}
+                continue
+            low, high, total = np.inf, -np.inf, 0.0
+            for _, values in self.iter_chunks(name):
+                low = min(low, values.min())
+                high = max(high, values.max())
+                total += float(values.sum(dtype=np.float64))
+            results[name] = {
+                "min": low.item() if hasattr(low, "item") else low,
+                "max": high.item() if hasattr(high, "item") else high,
+                "mean": total / self.rows,
+                "last": self[name][-1].item(),
+            }
+        return results
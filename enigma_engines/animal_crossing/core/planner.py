@@ -0,0 +1,521 @@
+"""
+Budgeted rollout planning on top of ACNHEnvironment.
+
+`RolloutPlanner` turns the greedy `Multi_Objective_Agent` into a candidate
+generator: for each decision it takes the agent's top-k actions and estimates
+each one's value by simulated rollouts. A rollout clones the environment,
+applies the candidate, lets the villagers still due to act take their turns
+with the greedy agent (with today's crowding counts) to finish the day, plays
+`horizon_days - 1` further days greedily, then scores the resulting state. Rollouts are
+allocated with UCB1 (a depth-one search tree) until a rollout count or
+wall-clock budget is spent, optionally in parallel worker processes.
+
+Per-action statistics are kept between decisions and carried into the next
+decision for the same villager, discounted by `reuse_decay`, so the search
+starts from what earlier decisions learned instead of from scratch.
+"""
+
+import math
+import pickle
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from enigma_engines.animal_crossing.core.action_counter import DailyActionCounter
+from enigma_engines.animal_crossing.core.agent import (
+    DayContext,
+    Multi_Objective_Agent,
+    plan_day,
+)
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+from enigma_engines.animal_crossing.core.load_data import ACNHItemDataset
+from enigma_engines.animal_crossing.core.villager import ACNHVillager
+from enigma_engines.animal_crossing.experiments import get_worker_dataset
+
+# Units per objective, so one "point" of value is comparable across objectives
+OBJECTIVE_SCALES = {"bells": 1000.0, "nook_miles": 100.0, "friendship": 10.0}
+
+
+def evaluate_state(state: Dict[str, Any], weights: Dict[str, float]) -> float:
+    """
+    Scalar objective of an environment state: weighted, scaled bells, Nook
+    Miles and average friendship.
+
+    Args:
+        state: Output of `ACNHEnvironment.get_state()`.
+        weights: Objective weights, e.g. the agent's `weights`.
+    Returns:
+        float: The state's value.
+    """
+    return (
+        weights["bells"] * state["bells"] / OBJECTIVE_SCALES["bells"]
+        + weights["nook_miles"] * state["nook_miles"] / OBJECTIVE_SCALES["nook_miles"]
+        + weights["friendship"]
+        * state["avg_friendship"]
+        / OBJECTIVE_SCALES["friendship"]
+    )
+
+
+def action_key(action: Dict[str, Any]) -> Tuple:
+    """
+    Identity of an action for statistics reuse.
+
+    Gift names are drawn at random per decision, so a gift is identified by its
+    target only.
+    """
+    return (
+        action.get("type"),
+        action.get("target_villager_name"),
+        action.get("task_name"),
+        action.get("plot_id"),
+    )
+
+
+def play_greedy_day(
+    env: ACNHEnvironment,
+    agent: Multi_Objective_Agent,
+    actions_per_day: int = 1000,
+    acting_villagers: Optional[List[ACNHVillager]] = None,
+    action_counter: Optional[DailyActionCounter] = None,
+):
+    """
+    Plays the rest of the current day with the greedy agent, then advances it.
+
+    Args:
+        env: The environment to play on.
+        agent: The greedy agent.
+        actions_per_day: Maximum decisions.
+        acting_villagers: Who acts, in order. Defaults to every villager, in
+                          random order.
+        action_counter: Today's crowding counts so far; a fresh day when None.
+    """
+    start_day = env.current_day
+    if acting_villagers is None:
+        acting_villagers = list(env.villagers)
+        random.shuffle(acting_villagers)
+
+    def execute(villager: ACNHVillager, action: Dict[str, Any]):
+        if action["type"] != "IDLE":
+            env.step(action, villager)
+        if action["type"] == "ADVANCE_DAY" or env.current_day != start_day:
+            return None
+        return env.get_state()
+
+    agent.choose_actions_for_day(
+        env.get_state(),
+        env.villagers,
+        acting_villagers=acting_villagers,
+        max_actions=actions_per_day,
+        on_action=execute,
+        action_counter=action_counter,
+    )
+    if env.current_day == start_day:
+        env.advance_day_cycle()
+
+
+def run_rollout(
+    env: ACNHEnvironment,
+    agent: Multi_Objective_Agent,
+    villager_name: str,
+    action: Dict[str, Any],
+    horizon_days: int,
+    seed: int,
+    pending_names: Optional[Sequence[str]] = None,
+    action_counter: Optional[DailyActionCounter] = None,
+) -> float:
+    """
+    Applies `action` for `villager_name`, finishes the day greedily, plays out
+    the rest of the horizon greedily and returns the change in `evaluate_state`.
+    Mutates `env`, `agent` and `action_counter`, so pass clones.
+
+    Args:
+        env: Clone of the environment to roll out on.
+        agent: Clone of the greedy agent.
+        villager_name: The villager taking `action`.
+        action: The candidate action.
+        horizon_days: Days simulated, including the current one.
+        seed: Seed for the `random` module.
+        pending_names: Villagers still due to act today, in order. Every other
+                       villager, in random order, when None.
+        action_counter: Today's crowding counts before `action`.
+    Returns:
+        float: The change in `evaluate_state` over the rollout.
+    """
+    random.seed(seed)
+    start_value = evaluate_state(env.get_state(), agent.weights)
+    actor = next((v for v in env.villagers if v.name == villager_name), None)
+    start_day = env.current_day
+    # Committed as in the live run: remembered by the agent, then executed
+    agent.remember_action(villager_name, action)
+    if action["type"] != "IDLE" and actor is not None:
+        env.step(action, actor)
+    if env.current_day == start_day:
+        if action_counter is None:
+            action_counter = DailyActionCounter()
+        action_counter.record(action)
+        if pending_names is None:
+            pending = [v for v in env.villagers if v.name != villager_name]
+            random.shuffle(pending)
+        else:
+            by_name = {v.name: v for v in env.villagers}
+            pending = [by_name[name] for name in pending_names if name in by_name]
+        play_greedy_day(
+            env, agent, acting_villagers=pending, action_counter=action_counter
+        )
+    for _ in range(horizon_days - 1):
+        play_greedy_day(env, agent)
+    return evaluate_state(env.get_state(), agent.weights) - start_value
+
+
+def _restore(
+    snapshot: bytes, dataset: ACNHItemDataset
+) -> Tuple[ACNHEnvironment, Multi_Objective_Agent, DailyActionCounter]:
+    # Snapshots are pickled by this planner in `_run_rollouts`, never read from disk
+    env, agent, action_counter = pickle.loads(snapshot)  # noqa: S301
+    env.dataset = dataset
+    agent.dataset = dataset
+    return env, agent, action_counter
+
+
+def _rollout_batch(
+    snapshot: bytes,
+    data_path: str,
+    villager_name: str,
+    jobs: Sequence[Tuple[Dict[str, Any], int]],
+    horizon_days: int,
+    pending_names: Optional[Sequence[str]] = None,
+) -> List[float]:
+    """Worker entry point: one fresh clone per `(action, seed)` job."""
+    dataset = get_worker_dataset(data_path)
+    values = []
+    for action, seed in jobs:
+        env, agent, action_counter = _restore(snapshot, dataset)
+        values.append(
+            run_rollout(
+                env,
+                agent,
+                villager_name,
+                action,
+                horizon_days,
+                seed,
+                pending_names,
+                action_counter,
+            )
+        )
+    return values
+
+
+@dataclass
+class PlannerStats:
+    """Throughput counters for a `RolloutPlanner`."""
+
+    decisions: int = 0
+    planned_decisions: int = 0
+    rollouts: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "decisions": self.decisions,
+            "planned_decisions": self.planned_decisions,
+            "rollouts": self.rollouts,
+            "seconds": self.seconds,
+            "decisions_per_second": (
+                self.decisions / self.seconds if self.seconds else 0.0
+            ),
+            "rollouts_per_second": (
+                self.rollouts / self.seconds if self.seconds else 0.0
+            ),
+        }
+
+
+class RolloutPlanner:
+    """
+    Chooses actions by simulated rollouts from clones of a live environment.
+
+    Exposes the same `choose_action` / `choose_actions_for_day` interface as
+    `Multi_Objective_Agent`, so it can be passed to `run_day` and
+    `run_simulation` in place of the greedy agent.
+    """
+
+    def __init__(
+        self,
+        env: ACNHEnvironment,
+        agent: Multi_Objective_Agent,
+        num_candidates: int = 4,
+        horizon_days: int = 2,
+        rollout_budget: int = 24,
+        time_budget: Optional[float] = None,
+        exploration: float = 1.0,
+        reuse_decay: float = 0.5,
+        max_workers: int = 0,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            env: The live environment decisions are made for; it is cloned, never
+                 mutated, by the planner.
+            agent: Greedy agent used for candidates, rollout policy and the
+                   repetition bookkeeping of committed actions.
+            num_candidates: Top-k greedy candidates considered per decision.
+            horizon_days: Days simulated per rollout, including the current one.
+            rollout_budget: Maximum rollouts per decision.
+            time_budget: Optional wall-clock limit per decision, in seconds.
+            exploration: UCB1 exploration constant, relative to the observed value spread.
+            reuse_decay: Weight of previous decisions' statistics (0 disables reuse).
+            max_workers: Worker processes for rollouts; 0 runs them in-process.
+            seed: Seed for rollout seeds, so planning is reproducible.
+        """
+        if num_candidates < 1 or horizon_days < 1 or rollout_budget < 1:
+            raise ValueError(
+                "num_candidates, horizon_days and rollout_budget must be at least 1"
+            )
+        self.env = env
+        self.agent = agent
+        self.num_candidates = num_candidates
+        self.horizon_days = horizon_days
+        self.rollout_budget = rollout_budget
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.reuse_decay = reuse_decay
+        self.max_workers = max_workers
+        self.rng = random.Random(seed)
+        self.stats = PlannerStats()
+        # (villager name, action key) -> (visits, mean value)
+        self.action_stats: Dict[Tuple[str, Tuple], Tuple[float, float]] = {}
+        # Names still due to act today, in order, while `choose_actions_for_day` runs
+        self._day_queue: Optional[List[str]] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "RolloutPlanner":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _pending_names(self, villager_name: str) -> Optional[List[str]]:
+        """Villagers due to act after `villager_name` today, when the day's order is known."""
+        if self._day_queue is None or villager_name not in self._day_queue:
+            return None
+        return self._day_queue[self._day_queue.index(villager_name) + 1 :]
+
+    def _run_rollouts(
+        self,
+        villager_name: str,
+        jobs: List[Tuple[Dict[str, Any], int]],
+        action_counter: Optional[DailyActionCounter] = None,
+    ) -> List[float]:
+        snapshot = pickle.dumps(
+            (self.env, self.agent, action_counter), protocol=pickle.HIGHEST_PROTOCOL
+        )
+        pending_names = self._pending_names(villager_name)
+        if self.max_workers <= 0:
+            # Rollouts draw from `random`; keep the live run's stream untouched
+            random_state = random.getstate()
+            try:
+                return _rollout_batch(
+                    snapshot,
+                    self.env.dataset.data_path,
+                    villager_name,
+                    jobs,
+                    self.horizon_days,
+                    pending_names,
+                )
+            finally:
+                random.setstate(random_state)
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        # One task per worker, each running a contiguous share of the jobs
+        shares = [jobs[i :: self.max_workers] for i in range(self.max_workers)]
+        futures = [
+            self._executor.submit(
+                _rollout_batch,
+                snapshot,
+                self.env.dataset.data_path,
+                villager_name,
+                share,
+                self.horizon_days,
+                pending_names,
+            )
+            for share in shares
+            if share
+        ]
+        results = [future.result() for future in futures]
+        # Undo the interleaved split so values line up with `jobs`
+        values: List[float] = [0.0] * len(jobs)
+        for worker_index, share_values in enumerate(results):
+            values[worker_index :: self.max_workers] = share_values
+        return values
+
+    def _select_arms(
+        self, visits: List[float], totals: List[float], count: int
+    ) -> List[int]:
+        """UCB1 picks for the next batch, with virtual visits so a batch spreads out."""
+        visits = list(visits)
+        observed = [t / n for t, n in zip(totals, visits) if n > 0]
+        spread = (max(observed) - min(observed)) if len(observed) > 1 else 1.0
+        spread = spread or 1.0
+        picks = []
+        for _ in range(count):
+            # Decayed prior visits can be fractional; keep the log non-negative
+            log_visits = math.log(max(sum(visits), 1.0))
+            best_arm, best_ucb = 0, -math.inf
+            for arm, (n, total) in enumerate(zip(visits, totals)):
+                if n == 0:
+                    best_arm = arm
+                    break
+                ucb = total / n + self.exploration * spread * math.sqrt(log_visits / n)
+                if ucb > best_ucb:
+                    best_arm, best_ucb = arm, ucb
+            picks.append(best_arm)
+            visits[best_arm] += 1
+        return picks
+
+    def choose_action(
+        self,
+        state: Dict[str, Any],
+        villagers_details_list: List[ACNHVillager],
+        agent_name: str = "Player",
+        actions_taken_today_by_others: Optional[List[Dict[str, Any]]] = None,
+        day_context: Optional[DayContext] = None,
+        action_counter: Optional[DailyActionCounter] = None,
+    ) -> Dict[str, Any]:
+        """
+        Chooses `agent_name`'s action by rollouts over the greedy top-k candidates.
+
+        Args:
+            state (Dict[str, Any]): The current state of the environment.
+            villagers_details_list (List[ACNHVillager]): List of villagers' details.
+            agent_name (str): The name of the villager performing the action.
+            actions_taken_today_by_others (Optional[List[Dict[str, Any]]]): Actions
+                already taken today, when no counter or context is given.
+            day_context (Optional[DayContext]): Shared day constants and counts.
+            action_counter (Optional[DailyActionCounter]): Today's running counts.
+        Returns:
+            Dict[str, Any]: The chosen action details.
+        """
+        start = time.perf_counter()
+        if day_context is None:
+            day_context = self.agent.build_day_context(
+                state,
+                villagers_details_list,
+                actions_taken_today_by_others,
+                action_counter,
+            )
+        candidates = [
+            action
+            for action, _ in self.agent.rank_actions(
+                state,
+                villagers_details_list,
+                agent_name,
+                self.num_candidates,
+                day_context,
+            )
+        ]
+        if self.agent.villager_action_repetition_counter.get(agent_name, 0) >= 2:
+            fresh = [
+                action
+                for action in candidates
+                if not self.agent._is_action_repetitive(action, agent_name)
+            ]
+            candidates = fresh or candidates
+
+        if not candidates:
+            chosen = {"type": "IDLE"}
+        elif len(candidates) == 1:
+            chosen = candidates[0]
+        else:
+            chosen = self._search(agent_name, candidates, start, day_context.counter)
+            self.stats.planned_decisions += 1
+
+        self.agent.remember_action(agent_name, chosen)
+        self.stats.decisions += 1
+        self.stats.seconds += time.perf_counter() - start
+        return chosen
+
+    def _search(
+        self,
+        agent_name: str,
+        candidates: List[Dict[str, Any]],
+        start: float,
+        action_counter: Optional[DailyActionCounter] = None,
+    ) -> Dict[str, Any]:
+        keys = [(agent_name, action_key(action)) for action in candidates]
+        visits, totals = [], []
+        for key in keys:
+            prior_visits, prior_mean = self.action_stats.get(key, (0.0, 0.0))
+            prior_visits *= self.reuse_decay
+            visits.append(prior_visits)
+            totals.append(prior_visits * prior_mean)
+
+        batch_size = max(1, self.max_workers)
+        rollouts = 0
+        while rollouts < self.rollout_budget:
+            if (
+                self.time_budget is not None
+                and rollouts
+                and time.perf_counter() - start >= self.time_budget
+            ):
+                break
+            count = min(batch_size, self.rollout_budget - rollouts)
+            arms = self._select_arms(visits, totals, count)
+            jobs = [(candidates[arm], self.rng.getrandbits(32)) for arm in arms]
+            values = self._run_rollouts(agent_name, jobs, action_counter)
+            for arm, value in zip(arms, values):
+                visits[arm] += 1
+                totals[arm] += value
+            rollouts += count
+        self.stats.rollouts += rollouts
+
+        for key, n, total in zip(keys, visits, totals):
+            if n > 0:
+                self.action_stats[key] = (n, total / n)
+        # Highest mean value; ties go to the greedy ranking
+        means = [total / n if n > 0 else -math.inf for n, total in zip(visits, totals)]
+        return candidates[max(range(len(candidates)), key=lambda arm: means[arm])]
+
+    def choose_actions_for_day(
+        self,
+        state: Dict[str, Any],
+        villagers_details_list: List[ACNHVillager],
+        acting_villagers: Optional[List[ACNHVillager]] = None,
+        max_actions: Optional[int] = None,
+        on_action: Optional[
+            Callable[[ACNHVillager, Dict[str, Any]], Optional[Dict[str, Any]]]
+        ] = None,
+        action_counter: Optional[DailyActionCounter] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Plans one action per acting villager, as `Multi_Objective_Agent.choose_actions_for_day`.
+
+        `on_action` should execute each action on the planner's environment, so
+        later rollouts start from the updated island. Rollouts let the
+        villagers still due to act take their turns before the day ends.
+        """
+        context = self.agent.build_day_context(
+            state, villagers_details_list, action_counter=action_counter
+        )
+        acting = (
+            acting_villagers if acting_villagers is not None else villagers_details_list
+        )
+        self._day_queue = [v.name for v in acting][:max_actions]
+        try:
+            return plan_day(
+                self.choose_action,
+                context,
+                state,
+                villagers_details_list,
+                acting_villagers,
+                max_actions,
+                on_action,
+            )
+        finally:
+            self._day_queue = None
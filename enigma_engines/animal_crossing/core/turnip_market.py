@@ -0,0 +1,204 @@
+import os
+from typing import Optional
+
+import numpy as np
+
+TURNIP_TABLE_FILENAME = "turnip_expectation_table.npz"
+
+# Mirrors ACNHEnvironment.update_turnip_prices and its saturation constants.
+NORMAL_PRICE_RANGE = (40, 150)
+SPIKE_PRICE_RANGE = (150, 600)
+SPIKE_PROBABILITY = 0.15
+PRICE_FLOOR = 10
+SATURDAY = 5
+SUNDAY = 6
+
+
+class TurnipExpectationTable:
+    """
+    Precomputed stalk-market continuation values.
+
+    `values[weekday, bucket]` is the expected price per turnip obtained by selling
+    optimally on the days *after* `weekday` up to and including Saturday, given
+    the turnip market saturation factor observed today. Turnips are treated as
+    worthless once the week ends, so the Saturday row is all zeros and the
+    Sunday row is the expected value of a turnip bought from Daisy Mae.
+
+    Daily prices in the environment are independent draws scaled by the
+    saturation factor, so the factor (not the current price) is what carries
+    information about future prices. The agent compares today's price against
+    the looked-up continuation value.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        saturation_grid: np.ndarray,
+        params: np.ndarray,
+    ):
+        self.values = values
+        self.saturation_grid = saturation_grid
+        self.params = params
+        self._min_factor = float(saturation_grid[0])
+        self._bucket_width = (
+            float(saturation_grid[-1] - saturation_grid[0]) / (len(saturation_grid) - 1)
+            if len(saturation_grid) > 1
+            else 1.0
+        )
+        self._last_bucket = len(saturation_grid) - 1
+
+    @staticmethod
+    def make_params(
+        min_factor: float,
+        max_factor: float,
+        recovery_rate: float,
+        num_samples: int,
+        num_buckets: int,
+        seed: int,
+    ) -> np.ndarray:
+        return np.array(
+            [min_factor, max_factor, recovery_rate, num_samples, num_buckets, seed],
+            dtype=np.float64,
+        )
+
+    @classmethod
+    def build(
+        cls,
+        min_factor: float = 0.2,
+        max_factor: float = 1.2,
+        recovery_rate: float = 0.03,
+        num_samples: int = 20000,
+        num_buckets: int = 51,
+        seed: int = 0,
+    ) -> "TurnipExpectationTable":
+        """
+        Builds the table by vectorized Monte Carlo simulation of the price process.
+
+        Args:
+            min_factor: Lowest turnip saturation factor the market can reach.
+            max_factor: Highest factor the market can recover to.
+            recovery_rate: Additive daily saturation recovery.
+            num_samples: Simulated price paths per saturation bucket.
+            num_buckets: Resolution of the saturation axis.
+            seed: Seed for the NumPy generator, so builds are reproducible.
+        Returns:
+            TurnipExpectationTable: The populated table.
+        """
+        rng = np.random.default_rng(seed)
+        saturation_grid = np.linspace(min_factor, max_factor, num_buckets)
+
+        # One set of base prices per future day offset (1..6), shared by all buckets.
+        max_offset = 6
+        base_prices = rng.integers(
+            NORMAL_PRICE_RANGE[0],
+            NORMAL_PRICE_RANGE[1] + 1,
+            size=(max_offset, num_samples),
+        )
+        spikes = rng.random((max_offset, num_samples)) < SPIKE_PROBABILITY
+        base_prices[spikes] = rng.integers(
+            SPIKE_PRICE_RANGE[0], SPIKE_PRICE_RANGE[1] + 1, size=int(spikes.sum())
+        )
+        base_prices = base_prices.astype(np.float64)
+
+        values = np.zeros((7, num_buckets), dtype=np.float64)
+        for weekday in range(7):
+            # Future selling days as offsets from today, e.g. Thursday -> Fri, Sat.
+            if weekday == SUNDAY:
+                offsets = list(range(1, SATURDAY + 2))
+            else:
+                offsets = list(range(1, SATURDAY - weekday + 1))
+
+            continuation = np.zeros((num_buckets, 1), dtype=np.float64)
+            for offset in reversed(offsets):
+                factor = np.minimum(
+                    max_factor, saturation_grid + recovery_rate * offset
+                )
+                effective = np.minimum(1.0, factor)[:, None]
+                prices = np.maximum(
+                    PRICE_FLOOR, np.floor(base_prices[offset - 1][None, :] * effective)
+                )
+                continuation = np.maximum(prices, continuation).mean(
+                    axis=1, keepdims=True
+                )
+            values[weekday] = continuation[:, 0]
+
+        params = cls.make_params(
+            min_factor, max_factor, recovery_rate, num_samples, num_buckets, seed
+        )
+        return cls(values, saturation_grid, params)
+
+    def expected_best_remaining(self, weekday: int, saturation_factor: float) -> float:
+        """Single lookup of the continuation value for `weekday` (Monday is 0)."""
+        bucket = int(round((saturation_factor - self._min_factor) / self._bucket_width))
+        if bucket < 0:
+            bucket = 0
+        elif bucket > self._last_bucket:
+            bucket = self._last_bucket
+        return float(self.values[weekday, bucket])
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp_path,
+            values=self.values,
+            saturation_grid=self.saturation_grid,
+            params=self.params,
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "TurnipExpectationTable":
+        with np.load(path) as data:
+            return cls(data["values"], data["saturation_grid"], data["params"])
+
+
+def load_or_build_turnip_table(
+    path: Optional[str] = None, **build_kwargs
+) -> TurnipExpectationTable:
+    """
+    Loads the cached table from `path`, rebuilding it if missing or stale.
+
+    Args:
+        path: Location of the `.npz` cache. If None, the table is built in memory only.
+        **build_kwargs: Forwarded to `TurnipExpectationTable.build`.
+    Returns:
+        TurnipExpectationTable: The loaded or freshly built table.
+    """
+    defaults = {
+        "min_factor": 0.2,
+        "max_factor": 1.2,
+        "recovery_rate": 0.03,
+        "num_samples": 20000,
+        "num_buckets": 51,
+        "seed": 0,
+    }
+    defaults.update(build_kwargs)
+    expected_params = TurnipExpectationTable.make_params(**defaults)
+
+    if path and os.path.exists(path):
+        try:
+            table = TurnipExpectationTable.load(path)
+            if np.array_equal(table.params, expected_params):
+                return table
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Warning: Could not read turnip table cache '{path}': {e}")
+
+    table = TurnipExpectationTable.build(**defaults)
+    if path:
+        try:
+            table.save(path)
+        except OSError as e:
+            print(f"Warning: Could not write turnip table cache '{path}': {e}")
+    return table
+
+
+if __name__ == "__main__":
+    cache_path = os.path.join("data", TURNIP_TABLE_FILENAME)
+    table = TurnipExpectationTable.build()
+    table.save(cache_path)
+    print(f"Saved turnip expectation table to {cache_path}")
+    for day, label in enumerate(["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]):
+        print(f"{label}: {table.expected_best_remaining(day, 1.0):.1f} bells")
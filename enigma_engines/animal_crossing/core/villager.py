@@ -1,17 +1,109 @@
 from typing import Any, Dict, Optional
 
+from enigma_engines.animal_crossing.core.villager_store import VillagerStore
+
 
 class ACNHVillager:
-    def __init__(self, name):
+    """
+    A villager backed by one slot of a `VillagerStore`.
+
+    Numeric state (friendship, bells, nook miles, last gifted day) lives in the
+    store's NumPy columns and is exposed through properties, so existing code
+    can keep reading and assigning attributes. A villager created without a
+    store gets a private single-slot store.
+
+    The inventory and the sales log stay Python dicts; their totals are kept in
+    the store's `inventory_items` and `items_sold` columns, so change them
+    through `add_to_inventory`, `remove_from_inventory` and `log_sale` (or
+    assign a whole new dict) rather than by editing the dicts in place.
+    """
+
+    __slots__ = ("name", "store", "slot", "_inventory", "_daily_log", "_log_epoch")
+
+    def __init__(self, name, store: Optional[VillagerStore] = None):
         self.name = name
-        self.friendship_level = 10
-        self.bells = 0
-        self.nook_miles = 0
-        self.last_gifted_day = -1
-        self.inventory: Dict[str, int] = {}  # item_name: quantity
-        self.daily_activity_log: Dict[str, Any] = {
-            "sold_items": []
-        }  # For tracking criteria
+        self.store = store if store is not None else VillagerStore(capacity=1)
+        self.slot = self.store.allocate(name)
+        self._inventory: Dict[str, int] = {}  # item_name: quantity
+        self._daily_log: Dict[str, Any] = {"sold_items": []}  # For tracking criteria
+        self._log_epoch = self.store.log_epoch
+
+    @property
+    def friendship_level(self) -> int:
+        return int(self.store.friendship[self.slot])
+
+    @friendship_level.setter
+    def friendship_level(self, value):
+        self.store.friendship[self.slot] = value
+
+    @property
+    def bells(self) -> int:
+        return int(self.store.bells[self.slot])
+
+    @bells.setter
+    def bells(self, value):
+        self.store.bells[self.slot] = value
+
+    @property
+    def nook_miles(self) -> int:
+        return int(self.store.nook_miles[self.slot])
+
+    @nook_miles.setter
+    def nook_miles(self, value):
+        self.store.nook_miles[self.slot] = value
+
+    @property
+    def last_gifted_day(self) -> int:
+        return int(self.store.last_gifted_day[self.slot])
+
+    @last_gifted_day.setter
+    def last_gifted_day(self, value):
+        self.store.last_gifted_day[self.slot] = value
+
+    @property
+    def inventory(self) -> Dict[str, int]:
+        return self._inventory
+
+    @inventory.setter
+    def inventory(self, value: Dict[str, int]):
+        self._inventory = value
+        self.store.inventory_items[self.slot] = sum(value.values())
+
+    @property
+    def daily_activity_log(self) -> Dict[str, Any]:
+        if self._log_epoch != self.store.log_epoch:
+            # The store was reset since this log was last used
+            self._daily_log = {"sold_items": []}
+            self._log_epoch = self.store.log_epoch
+        return self._daily_log
+
+    @daily_activity_log.setter
+    def daily_activity_log(self, value: Dict[str, Any]):
+        self._daily_log = value
+        self._log_epoch = self.store.log_epoch
+        self.store.items_sold[self.slot] = sum(
+            sale.get("quantity", 0) for sale in value.get("sold_items", ())
+        )
+
+    def rehome(self, store: VillagerStore):
+        """
+        Moves this villager's numeric state into a new slot of `store`.
+
+        Inventory and today's activity log travel with the villager. The old
+        slot is left untouched; the caller removes it from its store.
+        """
+        daily_log = self.daily_activity_log
+        slot = store.allocate(
+            self.name,
+            friendship=self.friendship_level,
+            bells=self.bells,
+            nook_miles=self.nook_miles,
+            last_gifted_day=self.last_gifted_day,
+            inventory_items=sum(self._inventory.values()),
+        )
+        self.store = store
+        self.slot = slot
+        self.daily_activity_log = daily_log
 
     def receive_gift(self, gift_details, current_day):
         if self.last_gifted_day == current_day:
@@ -57,16 +149,18 @@ class ACNHVillager:
                 f"Could not determine a valid string item name from: {item_name_or_data}"
             )
 
-        print(self.inventory)
-        self.inventory[actual_item_name] = (
-            self.inventory.get(actual_item_name, 0) + quantity
+        # print(self.inventory)
+        self._inventory[actual_item_name] = (
+            self._inventory.get(actual_item_name, 0) + quantity
         )
+        self.store.inventory_items[self.slot] += quantity
 
     def remove_from_inventory(self, item_name, quantity=1):
-        if item_name in self.inventory and self.inventory[item_name] >= quantity:
-            self.inventory[item_name] -= quantity
-            if self.inventory[item_name] == 0:
-                del self.inventory[item_name]
+        if item_name in self._inventory and self._inventory[item_name] >= quantity:
+            self._inventory[item_name] -= quantity
+            if self._inventory[item_name] == 0:
+                del self._inventory[item_name]
+            self.store.inventory_items[self.slot] -= quantity
             return True
         return False
 
@@ -81,6 +175,7 @@ class ACNHVillager:
                 "category": category,
             }
         )
+        self.store.items_sold[self.slot] += quantity
 
     def reset_daily_log(self):
         self.daily_activity_log = {"sold_items": []}
@@ -0,0 +1,299 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Per-slot NumPy columns, kept aligned by `allocate`, `remove` and `_grow`
+SLOT_COLUMNS = (
+    "friendship",
+    "bells",
+    "nook_miles",
+    "last_gifted_day",
+    "inventory_items",
+    "fishing_attempts",
+    "items_sold",
+)
+
+
+class VillagerStore:
+    """
+    Structure-of-arrays storage for the numeric state of an island's villagers.
+
+    Each villager owns one slot; `friendship`, `bells`, `nook_miles` and
+    `last_gifted_day` are NumPy columns indexed by slot, so whole-population
+    queries (average friendship, urgency multipliers) are single vectorized
+    operations. `ACNHVillager` objects are thin proxies onto a slot.
+
+    Three counters mirror state kept elsewhere so observations can copy
+    slices instead of walking Python objects: `inventory_items` (total items
+    held, kept by the villager's inventory methods), `fishing_attempts` (today,
+    kept by `ACNHEnvironment.step`) and `items_sold` (today, kept by
+    `log_sale`).
+
+    Slots are handed out in order and `remove` compacts the later ones down,
+    so slot `i` is `env.villagers[i]`. Columns grow by doubling.
+
+    Daily activity logs are reset by bumping `log_epoch`; a villager's log is
+    recreated lazily the first time it is touched in a new epoch, and the
+    daily counter columns are zeroed in one vectorized write.
+
+    Pairwise bonds live in `relationships`, a dense actor x target matrix:
+    entry `[a, t]` is the friendship villager `a` has built with `t` through
+    talks and gifts, decaying multiplicatively each day. It grows by doubling
+    with the population, independently of the preallocated columns.
+    """
+
+    def __init__(self, capacity: int = 16):
+        capacity = max(1, capacity)
+        self.size = 0
+        self.names: List[str] = []
+        self.log_epoch = 0
+        self.friendship = np.zeros(capacity, dtype=np.int32)
+        self.bells = np.zeros(capacity, dtype=np.int64)
+        self.nook_miles = np.zeros(capacity, dtype=np.int64)
+        self.last_gifted_day = np.zeros(capacity, dtype=np.int32)
+        self.inventory_items = np.zeros(capacity, dtype=np.int64)
+        self.fishing_attempts = np.zeros(capacity, dtype=np.int32)
+        self.items_sold = np.zeros(capacity, dtype=np.int64)
+        self.relationships = np.zeros((0, 0), dtype=np.float32)
+        # Running sum of `relationships`, so the island mean is O(1)
+        self.relationship_total = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return len(self.friendship)
+
+    def allocate(
+        self,
+        name: str,
+        friendship: int = 10,
+        bells: int = 0,
+        nook_miles: int = 0,
+        last_gifted_day: int = -1,
+        inventory_items: int = 0,
+        items_sold: int = 0,
+    ) -> int:
+        """Appends a villager row and returns its slot."""
+        if self.size == self.capacity:
+            self._grow(self.capacity * 2)
+        slot = self.size
+        self.size += 1
+        self.names.append(name)
+        self.friendship[slot] = friendship
+        self.bells[slot] = bells
+        self.nook_miles[slot] = nook_miles
+        self.last_gifted_day[slot] = last_gifted_day
+        self.inventory_items[slot] = inventory_items
+        self.fishing_attempts[slot] = 0
+        self.items_sold[slot] = items_sold
+        if self.size > len(self.relationships):
+            self._grow_relationships(max(16, 2 * len(self.relationships)))
+        return slot
+
+    def remove(self, slot: int):
+        """
+        Deletes a villager row, shifting every later slot down by one.
+
+        Keeps slot order equal to arrival order, so for an environment that
+        removes the matching entry of `env.villagers`, slot `i` is still
+        `env.villagers[i]`. Callers must decrement the `slot` of the proxies
+        after `slot`. The villager's bonds, given and received, are dropped.
+        """
+        if not 0 <= slot < self.size:
+            raise ValueError(f"Slot {slot} is not in use (size {self.size})")
+        size = self.size
+        for column in SLOT_COLUMNS:
+            values = getattr(self, column)
+            values[slot : size - 1] = values[slot + 1 : size]
+
+        block = self.relationships
+        self.relationship_total -= float(
+            block[slot, :size].sum(dtype=np.float64)
+            + block[:size, slot].sum(dtype=np.float64)
+        )
+        block[slot : size - 1, :size] = block[slot + 1 : size, :size]
+        block[:size, slot : size - 1] = block[:size, slot + 1 : size]
+        block[size - 1, :size] = 0
+        block[:size, size - 1] = 0
+
+        del self.names[slot]
+        self.size -= 1
+
+    def _grow(self, capacity: int):
+        for column in SLOT_COLUMNS:
+            old = getattr(self, column)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[: self.size] = old[: self.size]
+            setattr(self, column, new)
+
+    def _grow_relationships(self, size: int):
+        n = len(self.relationships)
+        grown = np.zeros((size, size), dtype=self.relationships.dtype)
+        grown[:n, :n] = self.relationships
+        self.relationships = grown
+
+    def reset_daily_logs(self):
+        """Invalidates every villager's daily activity log at once."""
+        self.log_epoch += 1
+        self.fishing_attempts[: self.size] = 0
+        self.items_sold[: self.size] = 0
+
+    def mean_friendship(self) -> float:
+        if self.size == 0:
+            return 0
+        # Integer sum keeps the result identical to sum(...) / len(...)
+        return int(self.friendship[: self.size].sum()) / self.size
+
+    def friendship_by_name(self) -> Dict[str, int]:
+        return dict(zip(self.names, self.friendship[: self.size].tolist()))
+
+    def fishing_attempts_by_name(self) -> Dict[str, int]:
+        """Today's fishing attempts of the villagers that fished, by name."""
+        attempts = self.fishing_attempts[: self.size]
+        slots = np.flatnonzero(attempts)
+        if not len(slots):
+            return {}
+        names = self.names
+        return dict(
+            zip([names[slot] for slot in slots.tolist()], attempts[slots].tolist())
+        )
+
+    def friendship_urgency(
+        self,
+        target_min: float,
+        default: float = 1.0,
+        low_multiplier: float = 5,
+        very_low_multiplier: float = 10,
+        slots: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Per-slot urgency multiplier for friendship below `target_min`.
+
+        Mirrors the agent's scalar rule: `very_low_multiplier` below half the
+        target, `low_multiplier` below the target, otherwise `default`.
+        When `slots` is given, only those slots are evaluated, in that order.
+        """
+        friendship = self.friendship[: self.size]
+        if slots is not None:
+            friendship = friendship[slots]
+        return np.where(
+            friendship < target_min / 2,
+            very_low_multiplier,
+            np.where(friendship < target_min, low_multiplier, default),
+        )
+
+    def lowest_friendship_slots(
+        self, k: int, exclude_slot: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Slots of the `k` villagers with the lowest friendship, lowest first.
+
+        Uses `np.partition`, so selection is O(N) in NumPy plus a sort of the
+        k candidates, rather than a full sort. Ties are broken by slot order, i.e. by arrival on the island.
+        """
+        friendship = self.friendship[: self.size]
+        if exclude_slot is not None and 0 <= exclude_slot < self.size:
+            friendship = friendship.copy()
+            friendship[exclude_slot] = np.iinfo(friendship.dtype).max
+            available = self.size - 1
+        else:
+            available = self.size
+        k = min(k, available)
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        if k < available:
+            # Include every slot tied with the k-th value so tie-breaking is by slot
+            kth_value = np.partition(friendship, k - 1)[k - 1]
+            candidates = np.flatnonzero(friendship <= kth_value)
+        else:
+            candidates = np.flatnonzero(friendship < np.iinfo(friendship.dtype).max)
+        order = np.lexsort((candidates, friendship[candidates]))
+        return candidates[order[:k]]
+
+    def add_relationship(self, actor_slot: int, target_slot: int, points: float):
+        """Strengthens `actor_slot`'s bond with `target_slot` by `points`."""
+        if actor_slot != target_slot:
+            self.relationships[actor_slot, target_slot] += points
+            self.relationship_total += points
+
+    def decay_relationships(self, factor: float):
+        """Scales every bond by `factor`, e.g. once per day (in place)."""
+        block = self.relationships[: self.size, : self.size]
+        block *= factor
+        self.relationship_total *= factor
+
+    def relationships_given(self) -> np.ndarray:
+        """Row aggregate: each villager's mean bond with the others, by slot."""
+        if self.size < 2:
+            return np.zeros(self.size, dtype=np.float64)
+        block = self.relationships[: self.size, : self.size]
+        return block.sum(axis=1, dtype=np.float64) / (self.size - 1)
+
+    def relationships_received(self) -> np.ndarray:
+        """Column aggregate: the mean bond the others have with each villager."""
+        if self.size < 2:
+            return np.zeros(self.size, dtype=np.float64)
+        block = self.relationships[: self.size, : self.size]
+        return block.sum(axis=0, dtype=np.float64) / (self.size - 1)
+
+    def mean_relationship(self) -> float:
+        """Mean bond over all ordered pairs of distinct villagers."""
+        if self.size < 2:
+            return 0.0
+        return self.relationship_total / (self.size * (self.size - 1))
+
+    def best_friends(self, slot: int, k: int) -> np.ndarray:
+        """
+        Slots `slot` has the strongest bonds with, strongest first.
+
+        Ties are broken by slot order. Like `lowest_friendship_slots`, selection
+        is an O(N) `np.partition` plus a sort of the k candidates.
+        """
+        return self._ranked_bonds(slot, k, strongest=True)
+
+    def most_neglected(self, slot: int, k: int) -> np.ndarray:
+        """
+        Slots `slot` has the weakest bonds with, weakest first.
+
+        Ties are broken by the target's friendship, lowest first, then by slot,
+        so before any bond has formed this matches `lowest_friendship_slots`.
+        """
+        return self._ranked_bonds(slot, k, strongest=False)
+
+    def _ranked_bonds(self, slot: int, k: int, strongest: bool) -> np.ndarray:
+        available = self.size - 1
+        k = min(k, available)
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        if k == 1:
+            # A single pick needs no sort: the first extreme, with ties going
+            # to the lowest friendship for neglected bonds
+            bonds = self.relationships[slot, : self.size].copy()
+            bonds[slot] = -np.inf if strongest else np.inf
+            if strongest:
+                return bonds.argmax(keepdims=True)
+            candidates = (bonds == bonds.min()).nonzero()[0]
+            if len(candidates) > 1:
+                return candidates[self.friendship[candidates].argmin(keepdims=True)]
+            return candidates
+        # Rank ascending on a key where the preferred bonds come first
+        key = self.relationships[slot, : self.size].astype(np.float64)
+        if strongest:
+            np.negative(key, out=key)
+        key[slot] = np.inf
+        if k < available:
+            # Include every slot tied with the k-th value so tie-breaking is exact
+            kth_value = np.partition(key, k - 1)[k - 1]
+            candidates = np.flatnonzero(key <= kth_value)
+        else:
+            candidates = np.flatnonzero(key < np.inf)
+        if strongest:
+            order = np.lexsort((candidates, key[candidates]))
+        else:
+            order = np.lexsort(
+                (candidates, self.friendship[candidates], key[candidates])
+            )
+        return candidates[order[:k]]
+
+    def gifted_on(self, day: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Boolean mask of villagers that already received a gift on `day`."""
+        return np.equal(self.last_gifted_day[: self.size], day, out=out)
@@ -0,0 +1,321 @@
+"""
+Parallel experiment runner for ACNH simulations.
+
+A sweep is a grid of environment and agent settings crossed with a list of
+seeds. Every (configuration, seed) pair becomes one task that runs headless in
+a `ProcessPoolExecutor` worker and streams its per-day metrics to a columnar
+`MetricsWriter` directory named after the task, so a worker's memory stays
+bounded however long the run. Completed tasks are appended to `manifest.jsonl`
+as they finish, so an interrupted sweep can be resumed and only the missing
+tasks are run again.
+
+Grid keys prefixed with `agent.` configure `Multi_Objective_Agent`
+(e.g. `agent.weights`, `agent.friendship_target_min`), `actions_per_day`
+limits how many villagers act per day, and every other key is passed to
+`ACNHEnvironment`.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from enigma_engines.animal_crossing.core.agent import Multi_Objective_Agent
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+from enigma_engines.animal_crossing.core.load_data import ACNHItemDataset
+from enigma_engines.animal_crossing.core.metrics_sink import (
+    MetricsReader,
+    MetricsWriter,
+)
+from enigma_engines.animal_crossing.core.turnip_market import (
+    TURNIP_TABLE_FILENAME,
+    load_or_build_turnip_table,
+)
+from enigma_engines.animal_crossing.simulation import run_day
+
+AGENT_PARAM_PREFIX = "agent."
+MANIFEST_FILENAME = "manifest.jsonl"
+# Column layout of every task's metrics directory
+METRIC_COLUMNS: Dict[str, str] = {
+    "day": "int32",
+    "bells": "int64",
+    "nook_miles": "int64",
+    "avg_friendship": "float64",
+    "villager_count": "int32",
+}
+
+# Loaded once per worker process and reused by every task it runs
+_WORKER_DATASETS: Dict[str, ACNHItemDataset] = {}
+
+
+@dataclass
+class ExperimentTask:
+    """
+    One simulation run of a sweep.
+
+    Attributes:
+        config (Dict[str, Any]): Grid point, with `agent.`-prefixed agent settings.
+        seed (int): Seed for the `random` module before the environment is built.
+        days (int): Number of logical days to simulate.
+        task_id (str): Stable identifier derived from the config, seed and days.
+    """
+
+    config: Dict[str, Any]
+    seed: int
+    days: int
+    task_id: str = field(default="")
+
+    def __post_init__(self):
+        if not self.task_id:
+            payload = json.dumps(
+                {"config": self.config, "seed": self.seed, "days": self.days},
+                sort_keys=True,
+                default=str,
+            )
+            self.task_id = hashlib.sha1(
+                payload.encode("utf-8"), usedforsecurity=False
+            ).hexdigest()[:16]
+
+
+def expand_grid(grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Expands `{"key": [values, ...]}` into the list of all combinations.
+
+    Args:
+        grid (Dict[str, Sequence[Any]]): Candidate values per setting.
+    Returns:
+        List[Dict[str, Any]]: One dict per grid point.
+    """
+    if not grid:
+        return [{}]
+    keys = list(grid.keys())
+    return [
+        dict(zip(keys, values))
+        for values in itertools.product(*(grid[key] for key in keys))
+    ]
+
+
+def configure_agent(agent: Multi_Objective_Agent, agent_params: Dict[str, Any]):
+    """
+    Applies overrides to an agent; `weights` is merged, other keys replace attributes.
+
+    Class-level constants such as `PLANTER_FOCUS_PERCENTAGE` are shadowed on the
+    instance, so other agents are unaffected.
+    """
+    for key, value in agent_params.items():
+        if key == "weights":
+            agent.weights = {**agent.weights, **value}
+        elif hasattr(agent, key):
+            setattr(agent, key, value)
+        else:
+            raise ValueError(f"Unknown Multi_Objective_Agent parameter '{key}'")
+
+
+def split_config(config: Dict[str, Any]):
+    """Splits a grid point into (environment kwargs, agent overrides, actions_per_day)."""
+    env_params = {}
+    agent_params = {}
+    actions_per_day = None
+    for key, value in config.items():
+        if key.startswith(AGENT_PARAM_PREFIX):
+            agent_params[key[len(AGENT_PARAM_PREFIX) :]] = value
+        elif key == "actions_per_day":
+            actions_per_day = value
+        else:
+            env_params[key] = value
+    return env_params, agent_params, actions_per_day
+
+
+def build_task_run(task: ExperimentTask, dataset: ACNHItemDataset):
+    """Seeds the RNG and builds the environment and agent for `task`."""
+    env_params, agent_params, actions_per_day = split_config(task.config)
+    random.seed(task.seed)
+    env = ACNHEnvironment(dataset=dataset, **env_params)
+    agent = Multi_Objective_Agent(
+        dataset=dataset, num_villagers_on_island=len(env.villagers)
+    )
+    configure_agent(agent, agent_params)
+    if actions_per_day is None:
+        actions_per_day = env._initial_num_villagers
+    return env, agent, actions_per_day
+
+
+def get_worker_dataset(data_path: str) -> ACNHItemDataset:
+    """Returns this process's dataset for `data_path`, loading it on first use."""
+    dataset = _WORKER_DATASETS.get(data_path)
+    if dataset is None:
+        dataset = ACNHItemDataset(data_path=data_path)
+        _WORKER_DATASETS[data_path] = dataset
+    return dataset
+
+
+def run_experiment_task(
+    task: ExperimentTask, results_dir: str, data_path: str = "data"
+) -> Dict[str, Any]:
+    """
+    Runs one task headless and streams its per-day metrics to `<task_id>/`.
+
+    Rows are buffered in `MetricsWriter` chunks and appended as each chunk
+    fills, so memory is bounded and a killed worker leaves every committed
+    chunk readable. The task only counts as complete once the caller records
+    it in the manifest.
+
+    Returns:
+        Dict[str, Any]: Manifest record with the task, final metrics and runtime.
+    """
+    start = time.perf_counter()
+    env, agent, actions_per_day = build_task_run(task, get_worker_dataset(data_path))
+
+    state = None
+    with MetricsWriter(
+        os.path.join(results_dir, task.task_id), METRIC_COLUMNS
+    ) as writer:
+        for day_idx in range(task.days):
+            _, state = run_day(env, agent, actions_per_day)
+            writer.append(
+                day=day_idx,
+                bells=state["bells"],
+                nook_miles=state["nook_miles"],
+                avg_friendship=state["avg_friendship"],
+                villager_count=state["current_villager_count"],
+            )
+
+    return {
+        **asdict(task),
+        "result_file": task.task_id,
+        "final_bells": int(state["bells"]) if state else None,
+        "final_nook_miles": int(state["nook_miles"]) if state else None,
+        "final_avg_friendship": (float(state["avg_friendship"]) if state else None),
+        "runtime_seconds": time.perf_counter() - start,
+    }
+
+
+def read_manifest(results_dir: str) -> Dict[str, Dict[str, Any]]:
+    """Returns completed task records keyed by task_id, skipping torn lines."""
+    records = {}
+    manifest_path = os.path.join(results_dir, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        return records
+    with open(manifest_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partially written line from an interrupted run
+            if os.path.exists(os.path.join(results_dir, record["result_file"])):
+                records[record["task_id"]] = record
+    return records
+
+
+def build_tasks(
+    grid: Dict[str, Sequence[Any]], seeds: Iterable[int], days: int
+) -> List[ExperimentTask]:
+    """Crosses every grid point with every seed."""
+    seeds = list(seeds)
+    return [
+        ExperimentTask(config=config, seed=seed, days=days)
+        for config in expand_grid(grid)
+        for seed in seeds
+    ]
+
+
+def run_experiments(
+    grid: Dict[str, Sequence[Any]],
+    seeds: Iterable[int],
+    days: int,
+    results_dir: str,
+    max_workers: Optional[int] = None,
+    data_path: str = "data",
+    resume: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Runs a sweep in parallel worker processes.
+
+    Args:
+        grid: Candidate values per setting (see module docstring for key routing).
+        seeds: Seeds to run every grid point with.
+        days: Logical days per run.
+        results_dir: Directory for the manifest and per-task metrics directories.
+        max_workers: Process count; defaults to `os.cpu_count()`.
+        data_path: Location of the ACNH CSV data.
+        resume: Skip tasks already recorded in the manifest.
+    Returns:
+        List[Dict[str, Any]]: Manifest records of every task in the sweep.
+    Raises:
+        RuntimeError: If any task failed, after every other task was recorded.
+    """
+    os.makedirs(results_dir, exist_ok=True)
+    tasks = build_tasks(grid, seeds, days)
+    completed = read_manifest(results_dir) if resume else {}
+    pending = [task for task in tasks if task.task_id not in completed]
+    print(
+        f"Experiment sweep: {len(tasks)} tasks, {len(tasks) - len(pending)} already "
+        f"complete, {len(pending)} to run."
+    )
+
+    # Build the shared turnip table once so workers only read the cache
+    load_or_build_turnip_table(os.path.join(data_path, TURNIP_TABLE_FILENAME))
+
+    manifest_path = os.path.join(results_dir, MANIFEST_FILENAME)
+    with (
+        ProcessPoolExecutor(max_workers=max_workers) as executor,
+        open(manifest_path, "a", encoding="utf-8") as manifest,
+    ):
+        futures = {
+            executor.submit(run_experiment_task, task, results_dir, data_path): task
+            for task in pending
+        }
+        failures = []
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except Exception as exc:
+                # Keep recording the tasks that still finish; raise at the end
+                failures.append((futures[future], exc))
+                continue
+            manifest.write(json.dumps(record, default=str) + "\n")
+            manifest.flush()
+            completed[record["task_id"]] = record
+
+    if failures:
+        summary = "; ".join(f"{task.task_id}: {exc!r}" for task, exc in failures)
+        raise RuntimeError(
+            f"{len(failures)} of {len(pending)} experiment tasks failed: {summary}"
+        ) from failures[0][1]
+    return [completed[task.task_id] for task in tasks if task.task_id in completed]
+
+
+def load_task_metrics(results_dir: str, task_id: str) -> Dict[str, np.ndarray]:
+    """Memory-maps the per-day metric columns of one completed task."""
+    reader = MetricsReader(os.path.join(results_dir, task_id))
+    return {column: reader[column] for column in reader.keys()}
+
+
+if __name__ == "__main__":
+    example_grid = {
+        "num_villagers": [10, 25],
+        "villager_addition_percentage": [0.0, 0.2],
+        "agent.weights": [
+            {"friendship": 0.50, "bells": 0.35, "nook_miles": 0.15},
+            {"friendship": 0.30, "bells": 0.55, "nook_miles": 0.15},
+        ],
+    }
+    records = run_experiments(
+        example_grid, seeds=range(2), days=30, results_dir="results/example_sweep"
+    )
+    for record in records:
+        print(
+            record["task_id"],
+            record["config"],
+            record["seed"],
+            record["final_bells"],
+            record["final_nook_miles"],
+            f"{record['final_avg_friendship']:.2f}",
+        )
@@ -0,0 +1,574 @@
+"""
+Federation of many ACNH islands sharded across worker processes.
+
+Every island is an `ACNHEnvironment` played by its own `Multi_Objective_Agent`
+through `run_day`. Islands are split into shards, one per worker process.
+Every simulated day, each worker plays its islands' day and sends one report
+per island to the coordinator over a queue. The coordinator waits for all
+reports, which is the global clock barrier. It then plans the exchange phase
+and sends each worker its islands' orders for the next day:
+
+- Turnips: an island holding turnips ships them to the island with the best
+  sell price, when that beats its own price.
+- Fish: fish a villager holds beyond `fish_keep` of a species are surplus.
+  Surplus is sold on the least saturated market for that species, at home
+  when the home market is not saturated.
+- Villagers: with probability `migration_rate`, an island's least friendly
+  villager moves out. It goes to the island with the most free room that has
+  no villager of that name, or back home when there is none.
+
+A sale pays the seller the host's price and saturates the host's market.
+The bells reach the seller with the following exchange. Each island keeps
+its own `random` state, so a federation's trajectory does not depend on how
+many processes it is sharded over.
+"""
+
+import contextlib
+import multiprocessing
+import os
+import queue
+import random
+import time
+import traceback
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from enigma_engines.animal_crossing.core.agent import Multi_Objective_Agent
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+from enigma_engines.animal_crossing.core.load_data import ACNHItemDataset
+from enigma_engines.animal_crossing.core.villager import ACNHVillager
+
+# Seconds between worker liveness checks while waiting at the day barrier
+GATHER_POLL_SECONDS = 1.0
+
+
+@dataclass
+class IslandOrders:
+    """
+    What the exchange phase asks of one island before its next day.
+
+    Attributes:
+        credit_bells (int): Proceeds of this island's goods sold elsewhere.
+        ship_turnips (int): Turnips to hand over to their host island.
+        ship_fish (Dict[str, int]): Surplus fish to hand over, per species.
+        host_turnips (List[Tuple[int, int]]): (seller island, quantity) sales
+            to pay for at this island's turnip price.
+        host_fish (List[Tuple[int, str, int]]): (seller island, species,
+            quantity) sales to pay for at this island's fish prices.
+        immigrants (List[ACNHVillager]): Villagers moving onto this island.
+    """
+
+    credit_bells: int = 0
+    ship_turnips: int = 0
+    ship_fish: Dict[str, int] = field(default_factory=dict)
+    host_turnips: List[Tuple[int, int]] = field(default_factory=list)
+    host_fish: List[Tuple[int, str, int]] = field(default_factory=list)
+    immigrants: List[ACNHVillager] = field(default_factory=list)
+
+
+@dataclass
+class IslandReport:
+    """
+    One island's state and trade offers at the end of its day.
+
+    Attributes:
+        island_id (int): The island.
+        day (int): The island's `current_day` after the day advanced.
+        bells (int): Island bells.
+        nook_miles (int): Island Nook Miles.
+        avg_friendship (float): Mean villager friendship.
+        villager_names (List[str]): Current residents, emigrant excluded.
+        max_villagers (int): The island's population cap.
+        turnips (int): Turnips offered, i.e. all the island owns.
+        turnip_sell_price (int): The island's turnip price for the new day.
+        fish_surplus (Dict[str, int]): Surplus fish offered, per species.
+        fish_market (Dict[str, float]): Saturation factor of every species
+            whose market has not fully recovered (others are at 1.0).
+        emigrant (Optional[ACNHVillager]): A detached villager moving out.
+        proceeds (Dict[int, int]): Bells owed to seller islands for the
+            sales this island hosted today.
+    """
+
+    island_id: int
+    day: int
+    bells: int
+    nook_miles: int
+    avg_friendship: float
+    villager_names: List[str]
+    max_villagers: int
+    turnips: int
+    turnip_sell_price: int
+    fish_surplus: Dict[str, int]
+    fish_market: Dict[str, float]
+    emigrant: Optional[ACNHVillager]
+    proceeds: Dict[int, int]
+
+
+class _Island:
+    __slots__ = ("env", "agent", "rng_state")
+
+    def __init__(self, env: ACNHEnvironment, agent: Multi_Objective_Agent):
+        self.env = env
+        self.agent = agent
+        self.rng_state = random.getstate()
+
+
+class IslandShard:
+    """The islands one worker process owns, and their daily loop."""
+
+    def __init__(
+        self,
+        island_ids: Sequence[int],
+        dataset: ACNHItemDataset,
+        num_villagers: int = 10,
+        max_villagers: int = 100,
+        migration_rate: float = 0.05,
+        fish_keep: int = 1,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            island_ids: Federation-wide ids of the islands in this shard.
+            dataset: Item dataset shared by the shard's islands.
+            num_villagers: Initial villagers per island.
+            max_villagers: Population cap of every island.
+            migration_rate: Daily chance that an island loses its least
+                            friendly villager to another island.
+            fish_keep: Fish of each species a villager keeps off the market.
+            seed: Federation seed; island `i` is seeded from `(seed, i)`.
+        """
+        self.migration_rate = migration_rate
+        self.fish_keep = fish_keep
+        self.fish_names = frozenset(fish["Name"] for fish in dataset.fish_data)
+        self.islands: Dict[int, _Island] = {}
+        for island_id in island_ids:
+            random.seed(f"{seed}/{island_id}")
+            env = ACNHEnvironment(
+                num_villagers=num_villagers,
+                dataset=dataset,
+                max_total_villagers=max_villagers,
+            )
+            agent = Multi_Objective_Agent(
+                dataset=dataset, num_villagers_on_island=len(env.villagers)
+            )
+            self.islands[island_id] = _Island(env, agent)
+
+    def _fish_surplus(self, env: ACNHEnvironment) -> Dict[str, int]:
+        surplus: Dict[str, int] = defaultdict(int)
+        for villager in env.villagers:
+            for item_name, quantity in villager.inventory.items():
+                if quantity > self.fish_keep and item_name in self.fish_names:
+                    surplus[item_name] += quantity - self.fish_keep
+        return dict(surplus)
+
+    def _ship_fish(self, env: ACNHEnvironment, ship_fish: Dict[str, int]):
+        # Reports are made after the day, so inventories still hold the surplus
+        remaining = dict(ship_fish)
+        for villager in env.villagers:
+            for item_name in list(villager.inventory):
+                excess = villager.inventory[item_name] - self.fish_keep
+                if excess > 0 and remaining.get(item_name, 0) > 0:
+                    quantity = min(excess, remaining[item_name])
+                    env.remove_villager_items(villager, item_name, quantity)
+                    remaining[item_name] -= quantity
+
+    def _apply_orders(
+        self, env: ACNHEnvironment, orders: Optional[IslandOrders]
+    ) -> Dict[int, int]:
+        proceeds: Dict[int, int] = defaultdict(int)
+        if orders is None:
+            return proceeds
+        env.bells += orders.credit_bells
+        env.turnips_owned_by_island -= min(
+            orders.ship_turnips, env.turnips_owned_by_island
+        )
+        if orders.ship_fish:
+            self._ship_fish(env, orders.ship_fish)
+        for seller, quantity in orders.host_turnips:
+            proceeds[seller] += env.sell_visitor_turnips(quantity)
+        for seller, fish_name, quantity in orders.host_fish:
+            proceeds[seller] += env.sell_visitor_fish(fish_name, quantity)
+        for villager in orders.immigrants:
+            env.add_villager(villager)
+        return proceeds
+
+    def _report(
+        self, island_id: int, env: ACNHEnvironment, proceeds: Dict[int, int]
+    ) -> IslandReport:
+        emigrant = None
+        if (
+            self.migration_rate > 0
+            and len(env.villagers) > 1
+            and random.random() < self.migration_rate
+        ):
+            slot = int(env.villager_store.lowest_friendship_slots(1)[0])
+            emigrant = env.remove_villager(env.villagers[slot].name)
+        return IslandReport(
+            island_id=island_id,
+            day=env.current_day,
+            bells=env.bells,
+            nook_miles=env.nook_miles,
+            avg_friendship=env.villager_store.mean_friendship(),
+            villager_names=[v.name for v in env.villagers],
+            max_villagers=env.MAX_TOTAL_VILLAGERS,
+            turnips=env.turnips_owned_by_island,
+            turnip_sell_price=env.turnip_sell_price,
+            fish_surplus=self._fish_surplus(env),
+            fish_market=dict(env.fish_market_saturation),
+            emigrant=emigrant,
+            proceeds={seller: bells for seller, bells in proceeds.items() if bells},
+        )
+
+    def play_day(self, orders: Dict[int, IslandOrders]) -> List[IslandReport]:
+        """
+        Applies each island's orders, plays its day and reports on it.
+
+        Args:
+            orders: Orders per island id from the last exchange; islands
+                    without orders just play their day.
+        Returns:
+            List[IslandReport]: One report per island, by island id.
+        """
+        # Imported here so worker processes do not need it at startup
+        from enigma_engines.animal_crossing.simulation import run_day
+
+        reports = []
+        for island_id, island in self.islands.items():
+            random.setstate(island.rng_state)
+            env = island.env
+            proceeds = self._apply_orders(env, orders.get(island_id))
+            run_day(env, island.agent, len(env.villagers))
+            reports.append(self._report(island_id, env, proceeds))
+            island.rng_state = random.getstate()
+        return reports
+
+
+def plan_exchange(reports: Sequence[IslandReport]) -> Dict[int, IslandOrders]:
+    """
+    Matches the islands' offers into the next day's orders (see module docstring).
+
+    Deterministic for a given list of reports, whatever shard they came from.
+
+    Args:
+        reports: Every island's report for the day.
+    Returns:
+        Dict[int, IslandOrders]: Orders per island id.
+    """
+    reports = sorted(reports, key=lambda report: report.island_id)
+    orders = {report.island_id: IslandOrders() for report in reports}
+    island_ids = list(orders)
+
+    for report in reports:
+        for seller, bells in report.proceeds.items():
+            orders[seller].credit_bells += bells
+
+    # Turnips go to the best price, lowest island id on ties
+    if reports:
+        best = max(reports, key=lambda r: (r.turnip_sell_price, -r.island_id))
+        for report in reports:
+            if report.turnips > 0 and best.turnip_sell_price > report.turnip_sell_price:
+                orders[report.island_id].ship_turnips = report.turnips
+                orders[best.island_id].host_turnips.append(
+                    (report.island_id, report.turnips)
+                )
+
+    # Fish: markets missing from a report are fully recovered (factor 1.0), so
+    # unsaturated markets are shared out in turn rather than all to one island
+    saturated: Dict[str, Dict[int, float]] = defaultdict(dict)
+    for report in reports:
+        for fish_name, factor in report.fish_market.items():
+            saturated[fish_name][report.island_id] = factor
+    cursor = 0
+    for report in reports:
+        for fish_name, quantity in report.fish_surplus.items():
+            factors = saturated.get(fish_name, {})
+            host_id = report.island_id
+            home_factor = factors.get(host_id, 1.0)
+            if home_factor < 1.0 and len(factors) < len(island_ids):
+                for offset in range(len(island_ids)):
+                    candidate = island_ids[(cursor + offset) % len(island_ids)]
+                    if candidate not in factors:
+                        host_id = candidate
+                        cursor = (cursor + offset + 1) % len(island_ids)
+                        break
+            elif home_factor < 1.0:
+                best_id = max(factors, key=lambda i: (factors[i], -i))
+                if factors[best_id] > home_factor:
+                    host_id = best_id
+            orders[report.island_id].ship_fish[fish_name] = quantity
+            orders[host_id].host_fish.append((report.island_id, fish_name, quantity))
+
+    # Migration: every emigrant's home keeps a place for it until it is settled
+    free_room = {r.island_id: r.max_villagers - len(r.villager_names) for r in reports}
+    rosters: Dict[int, set] = {}
+    emigrating = [report for report in reports if report.emigrant is not None]
+    for report in emigrating:
+        free_room[report.island_id] -= 1
+    for report in emigrating:
+        name = report.emigrant.name
+        destination = report.island_id
+        for candidate in sorted(island_ids, key=lambda i: (-free_room[i], i)):
+            if free_room[candidate] <= 0:
+                break
+            if candidate == report.island_id:
+                continue
+            if candidate not in rosters:
+                rosters[candidate] = set(
+                    next(r for r in reports if r.island_id == candidate).villager_names
+                )
+            if name not in rosters[candidate]:
+                destination = candidate
+                free_room[candidate] -= 1
+                free_room[report.island_id] += 1
+                rosters[candidate].add(name)
+                break
+        orders[destination].immigrants.append(report.emigrant)
+    return orders
+
+
+def _shard_worker(
+    shard_index: int,
+    island_ids: List[int],
+    shard_kwargs: Dict[str, Any],
+    data_path: str,
+    quiet: bool,
+    commands: multiprocessing.Queue,
+    results: multiprocessing.Queue,
+):
+    try:
+        with contextlib.ExitStack() as stack:
+            if quiet:
+                # The environment prints per-action debug output
+                devnull = stack.enter_context(open(os.devnull, "w"))
+                stack.enter_context(contextlib.redirect_stdout(devnull))
+            shard = IslandShard(
+                island_ids, ACNHItemDataset(data_path=data_path), **shard_kwargs
+            )
+            results.put((shard_index, [], None))
+            while True:
+                orders = commands.get()
+                if orders is None:
+                    return
+                results.put((shard_index, shard.play_day(orders), None))
+    except Exception:
+        results.put((shard_index, None, traceback.format_exc()))
+
+
+class Federation:
+    """
+    Coordinator of a federation of islands.
+
+    Use as a context manager, or call `start` and `close`. With `processes=0`
+    every island runs in this process, without queues.
+    """
+
+    def __init__(
+        self,
+        num_islands: int,
+        processes: int = 0,
+        num_villagers: int = 10,
+        max_villagers: int = 100,
+        migration_rate: float = 0.05,
+        fish_keep: int = 1,
+        seed: int = 0,
+        data_path: str = "data",
+        quiet: bool = True,
+    ):
+        """
+        Args:
+            num_islands: Islands in the federation.
+            processes: Worker processes; islands are dealt out round-robin.
+                       0 runs every island in this process.
+            num_villagers: Initial villagers per island.
+            max_villagers: Population cap of every island.
+            migration_rate: Daily chance that an island loses a villager.
+            fish_keep: Fish of each species a villager keeps off the market.
+            seed: Federation seed.
+            data_path: Location of the ACNH CSV data.
+            quiet: Discard the environments' per-action debug output.
+        """
+        if num_islands < 1:
+            raise ValueError(f"num_islands must be positive, got {num_islands}")
+        if processes < 0:
+            raise ValueError(f"processes must be non-negative, got {processes}")
+        self.num_islands = num_islands
+        self.processes = processes
+        self.data_path = data_path
+        self.quiet = quiet
+        self.shard_kwargs = {
+            "num_villagers": num_villagers,
+            "max_villagers": max_villagers,
+            "migration_rate": migration_rate,
+            "fish_keep": fish_keep,
+            "seed": seed,
+        }
+        self.days_played = 0
+        self.reports: List[IslandReport] = []
+        self.orders: Dict[int, IslandOrders] = {}
+        self._shard: Optional[IslandShard] = None
+        self._workers: List[multiprocessing.Process] = []
+        self._commands: List[multiprocessing.Queue] = []
+        self._results: Optional[multiprocessing.Queue] = None
+        self._devnull = None
+
+    def _quiet_output(self):
+        if self._devnull is not None:
+            return contextlib.redirect_stdout(self._devnull)
+        return contextlib.nullcontext()
+
+    def start(self):
+        """Builds the islands, in worker processes when `processes` > 0."""
+        if self.processes == 0:
+            if self.quiet:
+                self._devnull = open(os.devnull, "w")
+            with self._quiet_output():
+                self._shard = IslandShard(
+                    range(self.num_islands),
+                    ACNHItemDataset(data_path=self.data_path),
+                    **self.shard_kwargs,
+                )
+            return
+        shards = [
+            list(range(index, self.num_islands, self.processes))
+            for index in range(min(self.processes, self.num_islands))
+        ]
+        self._results = multiprocessing.Queue()
+        for shard_index, island_ids in enumerate(shards):
+            commands = multiprocessing.Queue()
+            worker = multiprocessing.Process(
+                target=_shard_worker,
+                args=(
+                    shard_index,
+                    island_ids,
+                    self.shard_kwargs,
+                    self.data_path,
+                    self.quiet,
+                    commands,
+                    self._results,
+                ),
+                daemon=True,
+            )
+            worker.start()
+            self._commands.append(commands)
+            self._workers.append(worker)
+        self._gather()
+
+    def _gather(self) -> List[IslandReport]:
+        # Global clock barrier: every shard reports before anyone moves on
+        reports = []
+        pending = set(range(len(self._workers)))
+        while pending:
+            try:
+                shard_index, shard_reports, error = self._results.get(
+                    timeout=GATHER_POLL_SECONDS
+                )
+            except queue.Empty:
+                # A worker killed by a signal (or the OOM killer) never reports
+                for shard_index in pending:
+                    exitcode = self._workers[shard_index].exitcode
+                    if exitcode is not None:
+                        self.close()
+                        raise RuntimeError(
+                            f"Federation shard {shard_index} exited with code "
+                            f"{exitcode} without reporting"
+                        ) from None
+                continue
+            if error is not None:
+                self.close()
+                raise RuntimeError(f"Federation shard {shard_index} failed:\n{error}")
+            pending.discard(shard_index)
+            reports.extend(shard_reports)
+        return reports
+
+    def step_day(self) -> Dict[str, Any]:
+        """
+        Plays one day on every island, then runs the exchange phase.
+
+        Returns:
+            Dict[str, Any]: Federation-wide totals for the day.
+        """
+        if self._shard is None and not self._workers:
+            raise RuntimeError("Federation is not started")
+        if self._shard is not None:
+            with self._quiet_output():
+                reports = self._shard.play_day(self.orders)
+        else:
+            for shard_index, commands in enumerate(self._commands):
+                commands.put(
+                    {
+                        island_id: island_orders
+                        for island_id, island_orders in self.orders.items()
+                        if island_id % self.processes == shard_index
+                    }
+                )
+            reports = self._gather()
+
+        self.reports = sorted(reports, key=lambda report: report.island_id)
+        self.orders = plan_exchange(self.reports)
+        self.days_played += 1
+        # An island's only immigrant that is its own emigrant found no new home
+        moved = sum(
+            1
+            for island_id, island_orders in self.orders.items()
+            for villager in island_orders.immigrants
+            if villager is not self.reports[island_id].emigrant
+        )
+        return {
+            "day": self.days_played,
+            "villagers": sum(len(r.villager_names) for r in self.reports)
+            + sum(r.emigrant is not None for r in self.reports),
+            "bells": sum(r.bells for r in self.reports),
+            "nook_miles": sum(r.nook_miles for r in self.reports),
+            "avg_friendship": sum(r.avg_friendship for r in self.reports)
+            / len(self.reports),
+            "migrants": moved,
+            "turnips_shipped": sum(o.ship_turnips for o in self.orders.values()),
+            "fish_shipped": sum(
+                sum(o.ship_fish.values()) for o in self.orders.values()
+            ),
+        }
+
+    def run(self, days: int) -> Dict[str, Any]:
+        """
+        Plays `days` days and reports the throughput.
+
+        Returns:
+            Dict[str, Any]: The last day's totals plus the elapsed seconds and
+            simulated island-days per second.
+        """
+        start = time.perf_counter()
+        totals: Dict[str, Any] = {}
+        for _ in range(days):
+            totals = self.step_day()
+        elapsed = time.perf_counter() - start
+        return {
+            **totals,
+            "islands": self.num_islands,
+            "processes": self.processes,
+            "days": days,
+            "seconds": elapsed,
+            "island_days_per_second": self.num_islands * days / max(elapsed, 1e-9),
+        }
+
+    def close(self):
+        """Stops the worker processes."""
+        for commands in self._commands:
+            commands.put(None)
+        for worker in self._workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.terminate()
+        self._workers = []
+        self._commands = []
+        self._shard = None
+        if self._devnull is not None:
+            self._devnull.close()
+            self._devnull = None
+
+    def __enter__(self) -> "Federation":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
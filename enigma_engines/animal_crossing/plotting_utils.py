@@ -1,48 +1,205 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
+import time
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Sequence, Tuple
 
+import numpy as np
 
-def plot_simulation_results(rewards_log):
+if TYPE_CHECKING:
+    # Seaborn and matplotlib are imported by the plotting calls themselves, so
+    # the downsampling helpers stay usable without loading either
+    from matplotlib.figure import Figure
+
+PLOT_CONFIGURATIONS = [
+    {"key": "bells", "label": "Total Bells", "color": "skyblue"},
+    {"key": "nook_miles", "label": "Total Nook Miles", "color": "lightcoral"},
+    {"key": "friendship", "label": "Avg Friendship", "color": "mediumseagreen"},
+]
+DOWNSAMPLE_METHODS = ("lttb", "minmax", "none")
+
+
+def downsample_lttb(
+    x: np.ndarray, y: np.ndarray, max_points: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, for every bucket in between, the point
+    forming the largest triangle with the previously kept point and the mean of
+    the next bucket. Peaks and troughs survive, which plain striding loses.
+
+    Args:
+        x: Monotonic x values.
+        y: Y values, same length as `x`.
+        max_points: Number of points to keep (at least 3).
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The kept x and y values.
+    """
+    num_points = len(y)
+    if max_points >= num_points or max_points < 3:
+        return np.asarray(x), np.asarray(y)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Bucket edges over the interior points [1, num_points - 1)
+    edges = np.linspace(1, num_points - 1, max_points - 1).astype(np.int64)
+
+    kept = np.empty(max_points, dtype=np.int64)
+    kept[0] = 0
+    kept[-1] = num_points - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start = end
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else num_points
+        next_x = x[next_start:next_end].mean()
+        next_y = y[next_start:next_end].mean()
+
+        # Twice the triangle area for every candidate in the bucket
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(areas.argmax())
+        kept[bucket + 1] = previous
+    return x[kept], y[kept]
+
+
+def downsample_minmax(
+    x: np.ndarray, y: np.ndarray, max_points: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Min/max bucketing: keeps the lowest and highest point of each of
+    `max_points // 2` buckets, in time order, so the envelope is exact.
+    """
+    num_points = len(y)
+    num_buckets = max_points // 2
+    if max_points >= num_points or num_buckets < 1:
+        return np.asarray(x), np.asarray(y)
+
+    x = np.asarray(x)
+    y = np.asarray(y)
+    edges = np.linspace(0, num_points, num_buckets + 1).astype(np.int64)
+    starts = edges[:-1]
+    # reduceat over variable-width buckets, then locate the extrema's indices
+    min_values = np.minimum.reduceat(y, starts)
+    max_values = np.maximum.reduceat(y, starts)
+    bucket_of = np.repeat(np.arange(num_buckets), np.diff(edges))
+    is_min = y == min_values[bucket_of]
+    is_max = y == max_values[bucket_of]
+    # First occurrence of each bucket's min and max
+    min_index = np.flatnonzero(is_min)[
+        np.unique(bucket_of[is_min], return_index=True)[1]
+    ]
+    max_index = np.flatnonzero(is_max)[
+        np.unique(bucket_of[is_max], return_index=True)[1]
+    ]
+    kept = np.unique(np.concatenate([min_index, max_index]))
+    return x[kept], y[kept]
+
+
+def downsample(
+    y: Sequence[float], max_points: int = 2000, method: str = "lttb"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsamples a daily series to at most `max_points`, with days on the x axis.
+
+    Args:
+        y: Values per day (list, array or memory-mapped column).
+        max_points: Point budget for the plotted line.
+        method: "lttb", "minmax" or "none".
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Days (1-based) and values to plot.
+    """
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"method must be one of {DOWNSAMPLE_METHODS}, got '{method}'")
+    y = np.asarray(y)
+    x = np.arange(1, len(y) + 1)
+    if method == "lttb":
+        return downsample_lttb(x, y, max_points)
+    if method == "minmax":
+        return downsample_minmax(x, y, max_points)
+    return x, y
+
+
+def _bucket_reduce(values: np.ndarray, num_buckets: int, reducer) -> np.ndarray:
+    """Applies `reducer` (a NumPy ufunc) to `num_buckets` contiguous buckets."""
+    edges = np.linspace(0, len(values), num_buckets + 1).astype(np.int64)
+    return reducer.reduceat(values, edges[:-1])
+
+
+def _finish_figure(fig: "Figure", output_path: Optional[str], show: bool):
+    fig.tight_layout(rect=[0, 0, 1, 0.96])  # Make space for the suptitle
+    if output_path:
+        # The format (PNG, SVG, ...) follows the file extension
+        fig.savefig(output_path)
+    if show:
+        import matplotlib.pyplot as plt
+
+        plt.show()
+
+
+def _new_figure(show: bool) -> "Figure":
+    from matplotlib.figure import Figure
+
+    if show:
+        import matplotlib.pyplot as plt
+
+        return plt.figure(figsize=(12, 9))
+    # Plain Figure objects render through the Agg canvas: no GUI backend needed
+    return Figure(figsize=(12, 9))
+
+
+def plot_simulation_results(
+    rewards_log,
+    output_path: Optional[str] = None,
+    max_points: int = 2000,
+    downsample_method: str = "lttb",
+    show: Optional[bool] = None,
+) -> Optional["Figure"]:
     """
     Plots the simulation results (bells, nook_miles, friendship) using Seaborn.
 
     Args:
-        rewards_log (dict): A dictionary containing lists of rewards over time.
+        rewards_log (dict | MetricsReader): Rewards over time, either a dict of
+                            lists or a lazily memory-mapped `MetricsReader`.
                             Expected keys: "bells", "nook_miles", "friendship".
+        output_path (str): Write the figure here; PNG or SVG by extension.
+        max_points (int): Point budget per series after downsampling.
+        downsample_method (str): "lttb", "minmax" or "none".
+        show (bool): Open an interactive window. Defaults to True only when
+                     no `output_path` is given.
+    Returns:
+        Figure: The rendered figure, or None if there was nothing to plot.
     """
+    import seaborn as sns
+
     sns.set_theme(style="whitegrid")
+    if show is None:
+        show = output_path is None
 
     # Determine the number of days from the logs
     num_days = 0
     # Check a few common keys to find the length of the simulation
     for key in ["bells", "nook_miles", "friendship"]:
-        if rewards_log.get(key):
-            num_days = len(rewards_log[key])
+        values = rewards_log.get(key)
+        if values is not None and len(values):
+            num_days = len(values)
             break
 
     if num_days == 0:
         print("Warning: No data found in rewards_log to plot.")
-        return
-
-    days_axis = range(1, num_days + 1)  # Create an x-axis representing days
+        return None
 
-    fig, axs = plt.subplots(
-        3, 1, sharex=True, figsize=(12, 9)
-    )  # Adjusted figsize for better layout
+    fig = _new_figure(show)
+    axs = fig.subplots(3, 1, sharex=True)
 
-    plot_configurations = [
-        {"key": "bells", "label": "Total Bells", "color": "skyblue"},
-        {"key": "nook_miles", "label": "Total Nook Miles", "color": "lightcoral"},
-        {"key": "friendship", "label": "Avg Friendship", "color": "mediumseagreen"},
-    ]
-
-    for i, config in enumerate(plot_configurations):
+    for i, config in enumerate(PLOT_CONFIGURATIONS):
         ax = axs[i]
-        if config["key"] in rewards_log and rewards_log[config["key"]]:
-            sns.lineplot(
-                x=days_axis,
-                y=rewards_log[config["key"]],
-                ax=ax,
+        values = rewards_log.get(config["key"])
+        if values is not None and len(values):
+            days_axis, plotted = downsample(values, max_points, downsample_method)
+            ax.plot(
+                days_axis,
+                plotted,
                 label=config["label"],
                 color=config["color"],
                 linewidth=2,
@@ -63,6 +220,131 @@ def plot_simulation_results(rewards_log):
 
     axs[-1].set_xlabel("Day")
     fig.suptitle("Agent Performance Over Time", fontsize=16, y=0.99)
+    _finish_figure(fig, output_path, show)
+    return fig
+
+
+def plot_multiple_runs(
+    runs: Sequence[Mapping[str, Sequence[float]]],
+    output_path: Optional[str] = None,
+    max_points: int = 2000,
+    band: str = "ci95",
+    show: Optional[bool] = None,
+) -> Optional["Figure"]:
+    """
+    Plots the mean of several runs per metric with a shaded band.
+
+    Runs are truncated to the shortest one. Per-day statistics are reduced to
+    `max_points` buckets: the mean line uses the bucket mean, and the band uses
+    the bucket minimum of the lower bound and maximum of the upper bound, so
+    downsampling never narrows the band.
+
+    Args:
+        runs: Rewards logs (dicts or `MetricsReader`s), e.g. one per seed.
+        output_path: Write the figure here; PNG or SVG by extension.
+        max_points: Buckets per series.
+        band: "ci95" (normal 95% interval of the mean), "std" or "minmax".
+        show: Open an interactive window. Defaults to True only when no
+              `output_path` is given.
+    Returns:
+        Figure: The rendered figure, or None if there was nothing to plot.
+    """
+    if band not in ("ci95", "std", "minmax"):
+        raise ValueError(f"band must be 'ci95', 'std' or 'minmax', got '{band}'")
+    import seaborn as sns
+
+    sns.set_theme(style="whitegrid")
+    if show is None:
+        show = output_path is None
+
+    lengths = [len(run.get("bells")) for run in runs if run.get("bells") is not None]
+    num_days = min(lengths) if lengths else 0
+    if num_days == 0:
+        print("Warning: No data found in runs to plot.")
+        return None
+
+    fig = _new_figure(show)
+    axs = fig.subplots(3, 1, sharex=True)
+    num_buckets = min(max_points, num_days)
+    counts = np.diff(np.linspace(0, num_days, num_buckets + 1).astype(np.int64))
+    days_axis = (
+        _bucket_reduce(
+            np.arange(1, num_days + 1, dtype=np.float64), num_buckets, np.add
+        )
+        / counts
+    )
+
+    for ax, config in zip(axs, PLOT_CONFIGURATIONS):
+        stacked = np.stack(
+            [np.asarray(run[config["key"]][:num_days], np.float64) for run in runs]
+        )
+        mean = stacked.mean(axis=0)
+        if band == "minmax":
+            low, high = stacked.min(axis=0), stacked.max(axis=0)
+        else:
+            spread = (
+                stacked.std(axis=0, ddof=1) if len(runs) > 1 else np.zeros_like(mean)
+            )
+            if band == "ci95":
+                spread = 1.96 * spread / np.sqrt(len(runs))
+            low, high = mean - spread, mean + spread
+
+        mean = _bucket_reduce(mean, num_buckets, np.add) / counts
+        low = _bucket_reduce(low, num_buckets, np.minimum)
+        high = _bucket_reduce(high, num_buckets, np.maximum)
+
+        ax.plot(
+            days_axis,
+            mean,
+            color=config["color"],
+            linewidth=2,
+            label=f"{config['label']} (mean of {len(runs)})",
+        )
+        ax.fill_between(days_axis, low, high, color=config["color"], alpha=0.3)
+        ax.set_ylabel(config["label"])
+        ax.legend(loc="upper left")
+        ax.grid(True, linestyle="--", alpha=0.7)
+
+    axs[-1].set_xlabel("Day")
+    fig.suptitle(f"Agent Performance Across {len(runs)} Runs", fontsize=16, y=0.99)
+    _finish_figure(fig, output_path, show)
+    return fig
+
+
+def compare_render_times(
+    rewards_log,
+    output_prefix: str,
+    max_points: int = 2000,
+    downsample_method: str = "lttb",
+    file_format: str = "png",
+) -> Dict[str, Any]:
+    """
+    Renders `rewards_log` to disk with and without downsampling and times both.
+
+    Args:
+        rewards_log: Rewards over time (dict of lists or `MetricsReader`).
+        output_prefix: Files are written to `<prefix>_full.<fmt>` and
+                       `<prefix>_downsampled.<fmt>`.
+        max_points: Point budget for the downsampled render.
+        downsample_method: "lttb" or "minmax".
+        file_format: "png" or "svg".
+    Returns:
+        Dict[str, Any]: Seconds per render, the speedup and the plotted point count.
+    """
+    timings = {}
+    for name, method in (("full", "none"), ("downsampled", downsample_method)):
+        start = time.perf_counter()
+        plot_simulation_results(
+            rewards_log,
+            output_path=f"{output_prefix}_{name}.{file_format}",
+            max_points=max_points,
+            downsample_method=method,
+            show=False,
+        )
+        timings[f"{name}_seconds"] = time.perf_counter() - start
 
-    plt.tight_layout(rect=[0, 0, 1, 0.96])  # Adjust rect to make space for suptitle
-    plt.show()
+    num_days = len(rewards_log.get("bells"))
+    timings["points_full"] = num_days
+    timings["points_downsampled"] = min(num_days, max_points)
+    timings["speedup"] = timings["full_seconds"] / timings["downsampled_seconds"]
+    return timings
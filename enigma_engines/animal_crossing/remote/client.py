@@ -0,0 +1,170 @@
+"""
+asyncio client for the ACNH environment server.
+
+Only NumPy and `remote.protocol` are imported, not the simulation. Requests
+pipeline over one connection: each call writes its frame immediately and
+awaits its own reply, so concurrent calls (e.g. `asyncio.gather` of several
+`step` batches) keep the server busy without a round trip between them.
+"""
+
+import asyncio
+import itertools
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from enigma_engines.animal_crossing.remote.protocol import (
+    COUNT,
+    CREATE_BODY,
+    FRAME_HEADER,
+    INFO_BODY,
+    MSG_CLOSE,
+    MSG_CREATE,
+    MSG_ERROR,
+    MSG_INFO,
+    MSG_STEP,
+    REWARD_DTYPE,
+    STEP_DTYPE,
+    decode_observations,
+    encode_frame,
+    observation_shapes,
+)
+
+
+class RemoteEnvironmentError(RuntimeError):
+    """A request the server answered with MSG_ERROR."""
+
+
+class EnvironmentClient:
+    """One connection to an `EnvironmentServer`; create with `connect`."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._request_ids = itertools.count()
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reply_task = asyncio.create_task(self._read_replies())
+        self.info: Tuple[int, ...] = ()
+        self.shapes: Dict[str, Tuple[int, ...]] = {}
+
+    @classmethod
+    async def connect(
+        cls, path: Optional[str] = None, host: str = "127.0.0.1", port: int = 7878
+    ) -> "EnvironmentClient":
+        """Connects to the Unix socket `path`, or to `host:port` when None."""
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        client = cls(reader, writer)
+        client.info = INFO_BODY.unpack(await client._request(MSG_INFO))
+        client.shapes = observation_shapes(client.info)
+        return client
+
+    @property
+    def num_actions(self) -> int:
+        return self.info[3]
+
+    async def _read_replies(self):
+        try:
+            while True:
+                header = await self._reader.readexactly(FRAME_HEADER.size)
+                length, kind, request_id = FRAME_HEADER.unpack(header)
+                body = await self._reader.readexactly(length - 5)
+                future = self._pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result((kind, body))
+        except (asyncio.IncompleteReadError, ConnectionError) as exc:
+            error = ConnectionError(f"Connection to the server was lost: {exc}")
+        except asyncio.CancelledError:
+            error = ConnectionError("Client closed")
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    async def _request(self, kind: int, body: bytes = b"") -> memoryview:
+        if self._reply_task.done():
+            raise ConnectionError("Client is not connected")
+        request_id = next(self._request_ids) & 0xFFFFFFFF
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(encode_frame(kind, request_id, body))
+        await self._writer.drain()
+        reply_kind, reply = await future
+        if reply_kind == MSG_ERROR:
+            raise RemoteEnvironmentError(reply.decode("utf-8"))
+        return memoryview(reply)
+
+    async def create(
+        self,
+        num_villagers: int = 10,
+        seed: int = 0,
+        villager_addition_percentage: float = 0.2,
+    ) -> Tuple[int, Dict[str, np.ndarray]]:
+        """
+        Creates a seeded island on the server.
+
+        Returns:
+            Tuple[int, Dict[str, np.ndarray]]: The environment id and its
+            first observation, each array with a batch axis of 1.
+        """
+        reply = await self._request(
+            MSG_CREATE,
+            CREATE_BODY.pack(num_villagers, seed, villager_addition_percentage),
+        )
+        (env_id,) = COUNT.unpack_from(reply)
+        return env_id, decode_observations(reply, COUNT.size, 1, self.shapes)
+
+    async def step(self, steps: Any) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Runs a batch of steps, in order, on the server.
+
+        Args:
+            steps: A `STEP_DTYPE` array, or a sequence of
+                   `(env_id, actor_slot, action_id)` tuples.
+        Returns:
+            Tuple[np.ndarray, Dict[str, np.ndarray]]: A `REWARD_DTYPE` array
+            (friendship, bells and Nook Miles deltas) and the observation after
+            each step, one batch row per step.
+        """
+        steps = np.asarray(steps, dtype=STEP_DTYPE)
+        reply = await self._request(MSG_STEP, COUNT.pack(len(steps)) + steps.tobytes())
+        (n,) = COUNT.unpack_from(reply)
+        rewards = np.frombuffer(reply, dtype=REWARD_DTYPE, count=n, offset=COUNT.size)
+        offset = COUNT.size + n * REWARD_DTYPE.itemsize
+        return rewards, decode_observations(reply, offset, n, self.shapes)
+
+    async def close_env(self, env_id: int):
+        """Removes an island from the server."""
+        await self._request(MSG_CLOSE, COUNT.pack(env_id))
+
+    async def close(self):
+        """Closes the connection; pending requests fail with ConnectionError."""
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._reply_task.cancel()
+        try:
+            await self._reply_task
+        except asyncio.CancelledError:
+            pass
+
+    async def __aenter__(self) -> "EnvironmentClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+def make_steps(
+    env_ids: Sequence[int], actor_slots: Sequence[int], action_ids: Sequence[int]
+) -> np.ndarray:
+    """Packs parallel sequences into a `STEP_DTYPE` batch for `step`."""
+    steps = np.empty(len(env_ids), dtype=STEP_DTYPE)
+    steps["env_id"] = env_ids
+    steps["actor_slot"] = actor_slots
+    steps["action_id"] = action_ids
+    return steps
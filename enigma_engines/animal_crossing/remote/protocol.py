@@ -0,0 +1,95 @@
+"""
+Wire format of the ACNH environment server.
+
+Everything is little-endian. Each message is one frame:
+
+    u32 length     bytes that follow this field (5 + len(body))
+    u8  kind       one of the MSG_* constants
+    u32 request_id chosen by the client, echoed in the reply
+    ...            body
+
+Clients may pipeline: several requests can be written before reading any
+reply. A connection's requests are served in order and every reply echoes
+its request id; a failed request is answered with MSG_ERROR and a UTF-8
+message instead, and the connection stays usable.
+
+Bodies:
+
+    MSG_INFO    request: empty
+                reply:   8 x u32: max_villagers, max_tasks, max_plots,
+                         num_actions, island, villager, task and plot
+                         feature counts
+    MSG_CREATE  request: u16 num_villagers, u32 seed,
+                         f32 villager_addition_percentage
+                reply:   u32 env_id, then one observation (see below)
+    MSG_STEP    request: u32 n, then n x STEP_DTYPE (env_id, actor_slot,
+                         action_id); steps run in order
+                reply:   u32 n, n x REWARD_DTYPE, then the n observations
+    MSG_CLOSE   request: u32 env_id
+                reply:   empty
+    MSG_ERROR   reply:   UTF-8 message
+
+An observation batch is the `ObservationEncoder` buffers for n rows, as
+float32 in the order of `OBSERVATION_KEYS`, each block C-contiguous with
+shape (n, *shape). Action ids follow `ActionDecoder`; ADVANCE_DAY_ACTION ends
+the island's day instead.
+
+This module only needs NumPy, so clients do not import the simulation.
+"""
+
+import struct
+from typing import Dict, Tuple
+
+import numpy as np
+
+MSG_INFO = 0
+MSG_CREATE = 1
+MSG_STEP = 2
+MSG_CLOSE = 3
+MSG_ERROR = 255
+
+FRAME_HEADER = struct.Struct("<IBI")  # length, kind, request_id
+INFO_BODY = struct.Struct("<8I")
+CREATE_BODY = struct.Struct("<HIf")
+COUNT = struct.Struct("<I")  # step counts and env ids
+
+STEP_DTYPE = np.dtype([("env_id", "<u4"), ("actor_slot", "<u2"), ("action_id", "<u4")])
+REWARD_DTYPE = np.dtype(
+    [("friendship", "<f4"), ("bells", "<i4"), ("nook_miles", "<i4")]
+)
+OBSERVATION_KEYS = ("island", "villagers", "tasks", "plots")
+# Action id that advances the island to the next day
+ADVANCE_DAY_ACTION = 0xFFFFFFFF
+# Frames above this size are rejected before reading their body
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+def encode_frame(kind: int, request_id: int, body: bytes = b"") -> bytes:
+    """Builds one frame around `body`."""
+    return FRAME_HEADER.pack(len(body) + 5, kind, request_id) + body
+
+
+def observation_shapes(info: Tuple[int, ...]) -> Dict[str, Tuple[int, ...]]:
+    """Per-row observation shapes from the MSG_INFO reply."""
+    max_villagers, max_tasks, max_plots, _, island, villager, task, plot = info
+    return {
+        "island": (island,),
+        "villagers": (max_villagers, villager),
+        "tasks": (max_tasks, task),
+        "plots": (max_plots, plot),
+    }
+
+
+def decode_observations(
+    buffer: memoryview, offset: int, n: int, shapes: Dict[str, Tuple[int, ...]]
+) -> Dict[str, np.ndarray]:
+    """Reads n observation rows starting at `offset` of `buffer`."""
+    observations = {}
+    for key in OBSERVATION_KEYS:
+        shape = (n, *shapes[key])
+        count = int(np.prod(shape))
+        observations[key] = np.frombuffer(
+            buffer, dtype="<f4", count=count, offset=offset
+        ).reshape(shape)
+        offset += count * 4
+    return observations
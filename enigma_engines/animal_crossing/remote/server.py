@@ -0,0 +1,325 @@
+"""
+asyncio server hosting many `ACNHEnvironment`s for out-of-process agents.
+
+Agents connect over a Unix socket or localhost TCP and speak the binary
+framing in `remote.protocol`: create islands, then send batches of
+`(env_id, actor_slot, action_id)` steps and receive the step rewards and the
+`ObservationEncoder` arrays of each stepped island. Action ids are decoded
+with `ActionDecoder`, so an agent needs no Python objects from this package.
+
+Steps run on the event loop thread, one request at a time, so islands are
+never stepped concurrently. Islands share the global `random` stream, so an
+island's trajectory is only reproducible when its requests are not
+interleaved with other islands' requests.
+
+Run with:
+    python -m enigma_engines.animal_crossing.remote.server --socket /tmp/acnh.sock
+    python -m enigma_engines.animal_crossing.remote.server --port 7878
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from enigma_engines.animal_crossing.core.encoding import (
+    ISLAND_FEATURES,
+    PLOT_FEATURES,
+    TASK_FEATURES,
+    VILLAGER_FEATURES,
+    ActionDecoder,
+    ObservationEncoder,
+)
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+from enigma_engines.animal_crossing.core.load_data import ACNHItemDataset
+from enigma_engines.animal_crossing.remote.protocol import (
+    ADVANCE_DAY_ACTION,
+    COUNT,
+    CREATE_BODY,
+    FRAME_HEADER,
+    INFO_BODY,
+    MAX_FRAME_BYTES,
+    MSG_CLOSE,
+    MSG_CREATE,
+    MSG_ERROR,
+    MSG_INFO,
+    MSG_STEP,
+    OBSERVATION_KEYS,
+    REWARD_DTYPE,
+    STEP_DTYPE,
+    encode_frame,
+)
+
+# Unsent reply bytes per connection before the server waits for the client
+WRITE_HIGH_WATER = 4 * 1024 * 1024
+
+
+class EnvironmentServer:
+    """
+    Hosts environments and answers protocol requests.
+
+    `handle` is the transport-independent request handler; `start` serves it
+    over a socket.
+    """
+
+    def __init__(
+        self,
+        dataset: Optional[ACNHItemDataset] = None,
+        data_path: str = "data",
+        max_villagers: int = 500,
+        max_tasks: int = 20,
+        max_plots: int = 10,
+        max_environments: int = 4096,
+        max_batch_steps: int = 4096,
+    ):
+        """
+        Args:
+            dataset: Shared item dataset; loaded from `data_path` when None.
+            data_path: Location of the ACNH CSV data.
+            max_villagers: Villager rows per observation, and the population
+                           cap of every island.
+            max_tasks: Task rows per observation.
+            max_plots: Farm plots per island.
+            max_environments: Islands one server hosts at most.
+            max_batch_steps: Steps one request may carry; larger batches are
+                             rejected before any observation buffer grows.
+        """
+        self.dataset = dataset or ACNHItemDataset(data_path=data_path)
+        self.encoder = ObservationEncoder(max_villagers, max_tasks, max_plots)
+        self.decoder = ActionDecoder(max_villagers, max_tasks, max_plots)
+        self.max_environments = max_environments
+        self.max_batch_steps = max_batch_steps
+        self.environments: Dict[int, ACNHEnvironment] = {}
+        self.steps_served = 0
+        self.address: Optional[str] = None
+        self._next_env_id = 0
+        self._buffers = self.encoder.allocate(1)
+        self._info = INFO_BODY.pack(
+            max_villagers,
+            max_tasks,
+            max_plots,
+            self.decoder.num_actions,
+            len(ISLAND_FEATURES),
+            len(VILLAGER_FEATURES),
+            len(TASK_FEATURES),
+            len(PLOT_FEATURES),
+        )
+
+    def _observation_buffers(self, n: int) -> Dict[str, np.ndarray]:
+        # One set of buffers, grown to the largest batch seen and sliced per
+        # request; encoding overwrites every row it is given
+        if len(self._buffers["island"]) < n:
+            self._buffers = self.encoder.allocate(n)
+        return {key: buffer[:n] for key, buffer in self._buffers.items()}
+
+    @staticmethod
+    def _observation_bytes(buffers: Dict[str, np.ndarray]) -> bytes:
+        return b"".join(buffers[key].tobytes() for key in OBSERVATION_KEYS)
+
+    def _environment(self, env_id: int) -> ACNHEnvironment:
+        env = self.environments.get(env_id)
+        if env is None:
+            raise ValueError(f"Unknown environment id {env_id}")
+        return env
+
+    def create(
+        self, num_villagers: int, seed: int, villager_addition_percentage: float
+    ) -> Tuple[int, bytes]:
+        """Creates a seeded island and returns its id and first observation."""
+        if len(self.environments) >= self.max_environments:
+            raise ValueError(
+                f"Server already hosts {self.max_environments} environments"
+            )
+        random.seed(seed)
+        env = ACNHEnvironment(
+            num_villagers=num_villagers,
+            dataset=self.dataset,
+            max_plots=self.encoder.max_plots,
+            villager_addition_percentage=villager_addition_percentage,
+            max_total_villagers=self.encoder.max_villagers,
+        )
+        env_id = self._next_env_id
+        self._next_env_id += 1
+        self.environments[env_id] = env
+        buffers = self._observation_buffers(1)
+        self.encoder.encode(env, buffers, 0)
+        return env_id, self._observation_bytes(buffers)
+
+    def step(self, steps: np.ndarray) -> bytes:
+        """
+        Applies a batch of steps in order and returns the encoded reply body.
+
+        The whole batch is validated against the islands' current populations
+        before any step runs, so a rejected batch changes nothing.
+        """
+        if len(steps) > self.max_batch_steps:
+            raise ValueError(
+                f"Batch of {len(steps)} steps exceeds the limit of "
+                f"{self.max_batch_steps}"
+            )
+        envs: List[ACNHEnvironment] = []
+        for env_id, actor_slot, action_id in steps.tolist():
+            env = self._environment(env_id)
+            if action_id != ADVANCE_DAY_ACTION:
+                if action_id >= self.decoder.num_actions:
+                    raise ValueError(f"Action id {action_id} is out of range")
+                if actor_slot >= len(env.villagers):
+                    raise ValueError(
+                        f"Environment {env_id} has no villager in slot {actor_slot}"
+                    )
+            envs.append(env)
+
+        n = len(steps)
+        rewards = np.zeros(n, dtype=REWARD_DTYPE)
+        buffers = self._observation_buffers(n)
+        for index, (env, (_, actor_slot, action_id)) in enumerate(
+            zip(envs, steps.tolist())
+        ):
+            if action_id == ADVANCE_DAY_ACTION:
+                result = env.step({"type": "ADVANCE_DAY"})
+            else:
+                action = self.decoder.decode(env, actor_slot, action_id)
+                result = None
+                if action["type"] != "IDLE":
+                    result = env.step(action, env.villagers[actor_slot])
+            if result is not None:
+                rewards[index] = result
+            self.encoder.encode(env, buffers, index)
+        self.steps_served += n
+        return COUNT.pack(n) + rewards.tobytes() + self._observation_bytes(buffers)
+
+    def handle(self, kind: int, body: bytes) -> Tuple[int, bytes]:
+        """
+        Answers one request.
+
+        Returns:
+            Tuple[int, bytes]: The reply kind and body.
+        Raises:
+            ValueError: For malformed requests or unknown environments.
+        """
+        if kind == MSG_STEP:
+            if len(body) < COUNT.size:
+                raise ValueError("Step request is missing its count")
+            (n,) = COUNT.unpack_from(body)
+            if len(body) != COUNT.size + n * STEP_DTYPE.itemsize:
+                raise ValueError(f"Step request size does not match {n} steps")
+            steps = np.frombuffer(body, dtype=STEP_DTYPE, count=n, offset=COUNT.size)
+            return MSG_STEP, self.step(steps)
+        if kind == MSG_INFO:
+            return MSG_INFO, self._info
+        if kind == MSG_CREATE:
+            if len(body) != CREATE_BODY.size:
+                raise ValueError("Malformed create request")
+            env_id, observation = self.create(*CREATE_BODY.unpack(body))
+            return MSG_CREATE, COUNT.pack(env_id) + observation
+        if kind == MSG_CLOSE:
+            if len(body) != COUNT.size:
+                raise ValueError("Malformed close request")
+            (env_id,) = COUNT.unpack(body)
+            self._environment(env_id)
+            del self.environments[env_id]
+            return MSG_CLOSE, b""
+        raise ValueError(f"Unknown message kind {kind}")
+
+    async def _serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(FRAME_HEADER.size)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                length, kind, request_id = FRAME_HEADER.unpack(header)
+                if not 5 <= length <= MAX_FRAME_BYTES:
+                    # The stream cannot be resynchronized after a bad length
+                    message = f"Invalid frame length {length}".encode("utf-8")
+                    writer.write(encode_frame(MSG_ERROR, request_id, message))
+                    break
+                try:
+                    body = await reader.readexactly(length - 5)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                try:
+                    reply_kind, reply = self.handle(kind, body)
+                except Exception as exc:  # Reported to the client, never fatal
+                    reply_kind = MSG_ERROR
+                    reply = f"{type(exc).__name__}: {exc}".encode("utf-8")
+                writer.write(encode_frame(reply_kind, request_id, reply))
+                # Pipelined requests keep being served while replies queue up;
+                # only wait for the client once its unread replies pile up.
+                if writer.transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+                    await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(
+        self, path: Optional[str] = None, host: str = "127.0.0.1", port: int = 0
+    ) -> asyncio.AbstractServer:
+        """
+        Starts listening on the Unix socket `path`, or on `host:port` when None.
+
+        Port 0 picks a free port; the bound address is stored in `address`
+        as a socket path or `host:port`.
+        """
+        if path is not None:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+            server = await asyncio.start_unix_server(self._serve_connection, path)
+            self.address = path
+        else:
+            server = await asyncio.start_server(self._serve_connection, host, port)
+            bound_host, bound_port = server.sockets[0].getsockname()[:2]
+            self.address = f"{bound_host}:{bound_port}"
+        return server
+
+
+async def _serve(env_server: EnvironmentServer, args: argparse.Namespace):
+    server = await env_server.start(args.socket, args.host, args.port)
+    # Announced on stderr: stdout carries the environment's debug output
+    print(f"Listening on {env_server.address}", file=sys.stderr, flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--socket", help="Unix socket path; TCP when omitted.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7878)
+    parser.add_argument("--max-villagers", type=int, default=500)
+    parser.add_argument("--max-tasks", type=int, default=20)
+    parser.add_argument("--max-plots", type=int, default=10)
+    parser.add_argument("--max-environments", type=int, default=4096)
+    parser.add_argument("--max-batch-steps", type=int, default=4096)
+    parser.add_argument("--data-path", default="data")
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Keep the environment's per-action debug output.",
+    )
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        if not args.verbose:
+            devnull = stack.enter_context(open(os.devnull, "w"))
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+        env_server = EnvironmentServer(
+            data_path=args.data_path,
+            max_villagers=args.max_villagers,
+            max_tasks=args.max_tasks,
+            max_plots=args.max_plots,
+            max_environments=args.max_environments,
+            max_batch_steps=args.max_batch_steps,
+        )
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(_serve(env_server, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""
+Rich rendering for `simulation.run_simulation`: daily report panels, progress
+lines, the final summary table and the background render thread.
+
+Kept apart from the simulation loop so importing `simulation` (every sweep and
+federation worker does) never loads Rich; `run_simulation` imports this module
+only when it renders.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from rich.console import Console, Group
+from rich.padding import Padding
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+from enigma_engines.animal_crossing.core.metrics_sink import MetricsReader
+
+# --- Rich Console Initialization ---
+console = Console()
+
+
+def format_bell_count(bells):
+    """Formats bell count with commas and a bell icon."""
+    return f":bell: [bold green]{bells:,}[/bold green]"
+
+
+def format_nook_miles(miles):
+    """Formats Nook Miles with a leaf icon."""
+    return f":fallen_leaf: [bold cyan]{miles:,}[/bold cyan]"
+
+
+def format_friendship(friendship_level):
+    """Formats friendship level with a heart icon and color based on level."""
+    if friendship_level < 2:
+        style = "bold red"
+        icon = ":broken_heart:"
+    elif friendship_level < 4:
+        style = "bold yellow"
+        icon = ":yellow_heart:"
+    else:
+        style = "bold green"
+        icon = ":heart:"
+    return f"{icon} [{style}]{friendship_level:.2f}[/{style}]"
+
+
+def _print_day_summary_panel(
+    console_instance: Console, panel_title: str, info_elements: list
+):
+    """
+    Prints the day's summary information within a Rich Panel.
+    Handles a list of Rich renderables (Text, Table, Panel, etc.).
+
+    Args:
+        console_instance: The Rich Console object to use for printing.
+        panel_title: The title for the panel.
+        info_elements: A list of Rich renderables to display.
+    """
+    panel_content_renderables = []
+    for item in info_elements:
+        if hasattr(item, "__rich_console__"):  # Check if it's a Rich renderable
+            panel_content_renderables.append(item)
+        else:  # Convert simple strings to Text
+            panel_content_renderables.append(Text(str(item)))
+
+    content_group = Group(*panel_content_renderables)
+
+    console_instance.print(
+        Panel(
+            Padding(content_group, (1, 2)),  # Padding around the group
+            title=panel_title,
+            border_style="cyan",
+            expand=False,  # Prevent panel from taking full width if content is small
+        )
+    )
+
+
+def print_summary_table(
+    console_instance: Console,
+    final_state: dict,
+    days_to_simulate: int,
+    environment: ACNHEnvironment,
+    metrics: Optional["MetricsReader"] = None,
+):
+    """
+    Generates and prints the final summary table.
+
+    Args:
+        console_instance: The Rich Console object to use for printing.
+        final_state: Dictionary containing the final simulation state.
+        days_to_simulate: Number of days that were simulated.
+        environment: The environment, for the per-villager table.
+        metrics: Optional streamed metrics; adds run-wide peaks and means,
+                 computed chunk by chunk from the memory-mapped columns.
+    """
+    summary_table = Table(
+        title=f":bar_chart: Final State after {days_to_simulate} days",
+        show_header=True,
+        header_style="bold yellow",
+    )
+    summary_table.add_column("Metric", style="dim", width=30)
+    summary_table.add_column("Value", justify="right")
+
+    summary_table.add_row("Total Bells", format_bell_count(final_state["bells"]))
+    summary_table.add_row(
+        "Total Nook Miles", format_nook_miles(final_state["nook_miles"])
+    )
+    summary_table.add_row(
+        "Average Villager Friendship", format_friendship(final_state["avg_friendship"])
+    )
+    if metrics is not None and len(metrics):
+        run_summary = metrics.summary()
+        summary_table.add_row(
+            "Peak Bells", format_bell_count(int(run_summary["bells"]["max"]))
+        )
+        summary_table.add_row(
+            "Peak Nook Miles",
+            format_nook_miles(int(run_summary["nook_miles"]["max"])),
+        )
+        summary_table.add_row(
+            "Mean Daily Avg Friendship",
+            format_friendship(run_summary["friendship"]["mean"]),
+        )
+
+    console_instance.print(summary_table)
+
+    villager_final_table = Table(
+        title=":busts_in_silhouette: Final Villager Friendships",
+        show_header=True,
+        header_style="bold cyan",
+    )
+    villager_final_table.add_column("Villager Name", style="italic")
+    villager_final_table.add_column("Friendship Level", justify="center")
+
+    for v in environment.villagers:
+        villager_final_table.add_row(v.name, format_friendship(v.friendship_level))
+
+    console_instance.print(villager_final_table)
+
+
+def _display_daily_report(
+    console_instance: Console,
+    environment: ACNHEnvironment,  # Still useful for direct access if needed beyond state
+    current_env_state: Dict[str, Any],  # State *after* actions for logical_day_num
+    actions_log: List[Dict[str, Any]],
+    logical_day_num: int,  # The simulation loop's day index
+):
+    """
+    Prepares and displays the full daily report/summary panel, including actions.
+
+    Args:
+        console_instance: The Rich Console object.
+        environment: The ACNHEnvironment instance.
+        current_env_state: The current state dictionary from environment.get_state().
+        actions_log: A list of action dictionaries performed during the logical day.
+        logical_day_num: The logical day number from the simulation loop.
+    """
+    day_panel_title = (
+        f":calendar: Report for Logical Day {logical_day_num} "
+        f"(Env. Day {current_env_state['current_day']}, Date: {current_env_state['current_date']}) "
+        f":sunrise_over_mountains:"
+    )
+
+    header_text = Text(justify="center")
+    header_text.append(
+        f"Bells: {format_bell_count(current_env_state['bells'])} | ", style="bold"
+    )
+    header_text.append(
+        f"Nook Miles: {format_nook_miles(current_env_state['nook_miles'])} | ",
+        style="bold",
+    )
+    header_text.append(
+        f"Avg. Friendship: {format_friendship(current_env_state['avg_friendship'])}",
+        style="bold",
+    )
+
+    day_info = [header_text]
+
+    if current_env_state["turnip_buy_price"] > 0:
+        day_info.append(
+            f":moneybag: Daisy Mae selling turnips at: [bold yellow]{current_env_state['turnip_buy_price']}[/bold yellow] bells"
+        )
+    if current_env_state["turnip_sell_price"] > 0:
+        day_info.append(
+            f":chart_with_upwards_trend: Nooklings buying turnips at: [bold green]{current_env_state['turnip_sell_price']}[/bold green] bells"
+        )
+
+    # Villager Actions Table
+    if actions_log:
+        actions_table = Table(
+            title=":performing_arts: Villager Actions This Logical Day",
+            show_header=True,
+            header_style="bold magenta",
+            expand=False,
+        )
+        actions_table.add_column(
+            "Villager", style="italic yellow", width=15, overflow="fold"
+        )
+        actions_table.add_column("Action Type", style="cyan", width=20, overflow="fold")
+        actions_table.add_column("Details", overflow="fold")
+
+        for action_item in actions_log:
+            actor = action_item.get("villager_name", "N/A")
+            action_type = action_item.get("type", "UNKNOWN")
+
+            details_parts = []
+            if action_item.get("target_villager_name"):
+                details_parts.append(f"Target: {action_item['target_villager_name']}")
+            if action_item.get("gift_name"):
+                details_parts.append(f"Gift: {action_item['gift_name']}")
+            if action_item.get("task_name"):
+                details_parts.append(f"Task: {action_item['task_name']}")
+            if action_item.get("crop_name"):
+                details_parts.append(f"Crop: {action_item['crop_name']}")
+            if action_item.get("plot_id") is not None:
+                details_parts.append(f"Plot: {action_item['plot_id']}")
+            if action_item.get("quantity"):
+                details_parts.append(f"Qty: {action_item['quantity']}")
+            if action_item.get("items_to_sell_list"):
+                items_summary = ", ".join(
+                    [
+                        f"{item['name']}(x{item['quantity']})"
+                        for item in action_item["items_to_sell_list"][:2]
+                    ]
+                )
+                if len(action_item["items_to_sell_list"]) > 2:
+                    items_summary += "..."
+                details_parts.append(f"Items: {items_summary}")
+
+            details_str = "; ".join(details_parts)
+            if action_type == "IDLE":
+                details_str = "[dim]Took a break[/dim]"
+
+            actions_table.add_row(
+                actor, action_type, details_str if details_str else "[dim]-[/dim]"
+            )
+        day_info.append(actions_table)
+    else:
+        day_info.append(":zzz: No villager actions logged for this logical day.")
+
+    if current_env_state["active_nook_tasks"]:
+        tasks_table = Table(
+            title=":scroll: Available Nook Tasks",
+            show_header=True,
+            header_style="bold blue",
+            expand=False,
+        )
+        tasks_table.add_column("Task Name", style="dim", width=30, overflow="fold")
+        tasks_table.add_column("Miles", justify="right")
+        tasks_table.add_column("Category", justify="right", overflow="fold")
+        tasks_table.add_column("Quantity", justify="right")
+        for task_name, details in current_env_state["active_nook_tasks"].items():
+            tasks_table.add_row(
+                task_name,
+                str(details.get("miles", "N/A")),
+                str(details["criteria"]["category"]),
+                str(details["criteria"]["quantity"]),
+            )
+        day_info.append(tasks_table)
+    else:
+        day_info.append(":information_source: No Nook Tasks available today.")
+
+    villager_table = Table(
+        title=":house_with_garden: Villager Friendship Levels",
+        show_header=True,
+        header_style="bold purple",
+        expand=False,
+    )
+    villager_table.add_column("Villager Name", style="italic")
+    villager_table.add_column("Friendship", justify="center")
+
+    # Read friendships from the state snapshot so reports can be rendered off the hot loop
+    for villager_name, friendship_level in current_env_state[
+        "villagers_friendship"
+    ].items():
+        villager_table.add_row(villager_name, format_friendship(friendship_level))
+    day_info.append(villager_table)
+
+    _print_day_summary_panel(console_instance, day_panel_title, day_info)
+
+
+def _print_progress_line(
+    console_instance: Console, state: Dict[str, Any], day_idx: int
+):
+    """Prints the one-line progress summary shown every 100 logical days."""
+    progress_text = Text.assemble(
+        (
+            f"End of Day {day_idx} (Env Day: {state['current_day']}, Date: {state['current_date']}): ",
+            "bold",
+        ),
+        ("Bells: ", "italic"),
+        format_bell_count(state["bells"]),
+        " | ",
+        ("Miles: ", "italic"),
+        format_nook_miles(state["nook_miles"]),
+        " | ",
+        ("AvgFriend: ", "italic"),
+        format_friendship(state["avg_friendship"]),
+    )
+    console_instance.print(
+        Padding(progress_text, (0, 0, 1, 0)), style="on grey19"
+    )  # Added bottom padding
+
+
+class BackgroundRenderer:
+    """
+    Renders daily reports on a worker thread so the simulation loop never waits on Rich.
+
+    The loop submits state snapshots (the `get_state()` dict and the day's action
+    log); the thread turns them into panels. A bounded queue applies backpressure
+    if rendering falls far behind, and the time the loop spends blocked on it is
+    reported separately from the time spent rendering.
+
+    If a render raises, the thread records the exception and keeps draining the
+    queue so the loop never blocks on it; the next `submit()` or `close()`
+    shuts the thread down and re-raises the exception.
+    """
+
+    def __init__(self, console_instance: Console, environment, max_pending: int = 64):
+        self.console = console_instance
+        self.environment = environment
+        self.render_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self._error: Optional[BaseException] = None
+        self._queue: "queue.Queue[Optional[Tuple]]" = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, kind: str, *payload):
+        if self._error is not None:
+            self.close()
+        start = time.perf_counter()
+        self._queue.put((kind, payload))
+        self.blocked_seconds += time.perf_counter() - start
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is not None:
+                continue  # Drain without rendering so submit() never blocks
+            kind, payload = item
+            start = time.perf_counter()
+            try:
+                if kind == "report":
+                    state, actions_log, day_idx = payload
+                    _display_daily_report(
+                        self.console, self.environment, state, actions_log, day_idx
+                    )
+                elif kind == "progress":
+                    state, day_idx = payload
+                    _print_progress_line(self.console, state, day_idx)
+            except Exception as e:
+                self._error = e
+            self.render_seconds += time.perf_counter() - start
+
+    def close(self):
+        """Waits for pending renders, then re-raises a render error if one occurred."""
+        if self._thread.is_alive():
+            start = time.perf_counter()
+            self._queue.put(None)
+            self._thread.join()
+            self.blocked_seconds += time.perf_counter() - start
+        if self._error is not None:
+            raise self._error
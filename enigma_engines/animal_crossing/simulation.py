@@ -1,423 +1,431 @@
 # --- 5. Simulation Loop ---
 try:
+    from enigma_engines.animal_crossing.core.action_counter import DailyActionCounter
     from enigma_engines.animal_crossing.core.agent import Multi_Objective_Agent
+    from enigma_engines.animal_crossing.core.checkpoint import (
+        load_checkpoint,
+        save_checkpoint,
+    )
     from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
     from enigma_engines.animal_crossing.core.load_data import ACNHItemDataset
+    from enigma_engines.animal_crossing.core.metrics_sink import (
+        REWARD_COLUMNS,
+        MetricsReader,
+        MetricsWriter,
+    )
 except ImportError as e:
     raise ImportError(f"Required module could not be imported: {e}")
 
-# Rich library imports
-from typing import Any, Dict, List
-
-from rich.console import Console, Group
-from rich.padding import Padding
-from rich.panel import Panel
-from rich.table import Table
-from rich.text import Text
-
-# --- Rich Console Initialization ---
-console = Console()
-
-
-def format_bell_count(bells):
-    """Formats bell count with commas and a bell icon."""
-    return f":bell: [bold green]{bells:,}[/bold green]"
-
-
-def format_nook_miles(miles):
-    """Formats Nook Miles with a leaf icon."""
-    return f":fallen_leaf: [bold cyan]{miles:,}[/bold cyan]"
-
-
-def format_friendship(friendship_level):
-    """Formats friendship level with a heart icon and color based on level."""
-    if friendship_level < 2:
-        style = "bold red"
-        icon = ":broken_heart:"
-    elif friendship_level < 4:
-        style = "bold yellow"
-        icon = ":yellow_heart:"
-    else:
-        style = "bold green"
-        icon = ":heart:"
-    return f"{icon} [{style}]{friendship_level:.2f}[/{style}]"
-
-
-def _print_day_summary_panel(
-    console_instance: Console, panel_title: str, info_elements: list
-):
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+RENDER_POLICIES = ("every", "final", "none")
+# Rich helpers that moved to `rendering`, still reachable as attributes of this module
+_RENDERING_NAMES = (
+    "console",
+    "format_bell_count",
+    "format_nook_miles",
+    "format_friendship",
+    "print_summary_table",
+)
+
+
+def __getattr__(name: str):
+    """Resolves the moved Rich helpers lazily, so Rich loads on first access only."""
+    if name in _RENDERING_NAMES:
+        from enigma_engines.animal_crossing import rendering
+
+        return getattr(rendering, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def run_day(
+    env: ACNHEnvironment,
+    agent: Multi_Objective_Agent,
+    actions_per_day: int,
+    action_counter: Optional[DailyActionCounter] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     """
-    Prints the day's summary information within a Rich Panel.
-    Handles a list of Rich renderables (Text, Table, Panel, etc.).
+    Simulates one logical day: every villager (up to `actions_per_day`) acts, then the day advances.
 
     Args:
-        console_instance: The Rich Console object to use for printing.
-        panel_title: The title for the panel.
-        info_elements: A list of Rich renderables to display.
+        env: The environment to step.
+        agent: The agent choosing actions for each villager.
+        actions_per_day: Maximum number of villagers that can act this day.
+        action_counter: Day-scoped action counts to reuse; reset before the day starts.
+    Returns:
+        Tuple[List[Dict[str, Any]], Dict[str, Any]]: The actions taken and the
+        environment state after all actions, captured before the day advanced.
     """
-    panel_content_renderables = []
-    for item in info_elements:
-        if hasattr(item, "__rich_console__"):  # Check if it's a Rich renderable
-            panel_content_renderables.append(item)
-        else:  # Convert simple strings to Text
-            panel_content_renderables.append(Text(str(item)))
-
-    content_group = Group(*panel_content_renderables)
-
-    console_instance.print(
-        Panel(
-            Padding(content_group, (1, 2)),  # Padding around the group
-            title=panel_title,
-            border_style="cyan",
-            expand=False,  # Prevent panel from taking full width if content is small
-        )
-    )
-
-
-def print_summary_table(
-    console_instance: Console,
-    final_state: dict,
-    days_to_simulate: int,
-    environment: ACNHEnvironment,
-):
-    """
-    Generates and prints the final summary table.
-
-    Args:
-        console_instance: The Rich Console object to use for printing.
-        final_state: Dictionary containing the final simulation state.
-        days_to_simulate: Number of days that were simulated.
-    """
-    summary_table = Table(
-        title=f":bar_chart: Final State after {days_to_simulate} days",
-        show_header=True,
-        header_style="bold yellow",
-    )
-    summary_table.add_column("Metric", style="dim", width=30)
-    summary_table.add_column("Value", justify="right")
-
-    summary_table.add_row("Total Bells", format_bell_count(final_state["bells"]))
-    summary_table.add_row(
-        "Total Nook Miles", format_nook_miles(final_state["nook_miles"])
-    )
-    summary_table.add_row(
-        "Average Villager Friendship", format_friendship(final_state["avg_friendship"])
-    )
+    current_env_state_at_loop_start = (
+        env.get_state()
+    )  # State at the beginning of the logical day
 
-    console_instance.print(summary_table)
+    # Get all villagers and shuffle them for random action order
+    villagers_for_today = list(env.villagers)
+    random.shuffle(villagers_for_today)
 
-    villager_final_table = Table(
-        title=":busts_in_silhouette: Final Villager Friendships",
-        show_header=True,
-        header_style="bold cyan",
+    if action_counter is None:
+        action_counter = DailyActionCounter()
+    else:
+        action_counter.reset()
+
+    # Limit the number of villagers that can act today
+    max_villagers_to_act = min(actions_per_day, len(villagers_for_today))
+    day_was_advanced_by_agent = False
+
+    def execute_action(acting_villager, action):
+        nonlocal day_was_advanced_by_agent
+        if action["type"] != "IDLE":
+            # Execute the action (IDLE villagers still count as having acted)
+            env.step(action, acting_villager)  # Pass acting_villager for direct use
+
+        # If the action taken was ADVANCE_DAY, the environment's day counter will increment
+        if action["type"] == "ADVANCE_DAY":
+            day_was_advanced_by_agent = True
+            return None  # End actions for this logical day
+
+        # Get fresh state for the next villager's decision
+        next_state = env.get_state()
+        # If day was already advanced, stop processing villagers
+        if next_state["current_day"] > current_env_state_at_loop_start["current_day"]:
+            day_was_advanced_by_agent = True
+            return None
+        return next_state
+
+    # Plan the day in one call: per-day constants are computed once and the
+    # crowding counts are updated incrementally as each villager acts
+    actions_for_this_logical_day = agent.choose_actions_for_day(
+        current_env_state_at_loop_start,
+        env.villagers,
+        acting_villagers=villagers_for_today,
+        max_actions=max_villagers_to_act,
+        on_action=execute_action,
+        action_counter=action_counter,
     )
-    villager_final_table.add_column("Villager Name", style="italic")
-    villager_final_table.add_column("Friendship Level", justify="center")
+    state_after_actions = (
+        env.get_state()
+    )  # State after all actions for this logical day are done
 
-    for v in environment.villagers:
-        villager_final_table.add_row(v.name, format_friendship(v.friendship_level))
+    # If the day was NOT advanced by an agent's ADVANCE_DAY action during its turns,
+    # and the environment's current day is still the logical day, advance it now.
+    if (
+        not day_was_advanced_by_agent
+        and env.current_day == current_env_state_at_loop_start["current_day"]
+    ):
+        env.advance_day_cycle()
 
-    console_instance.print(villager_final_table)
+    return actions_for_this_logical_day, state_after_actions
 
 
-def _display_daily_report(
-    console_instance: Console,
-    environment: ACNHEnvironment,  # Still useful for direct access if needed beyond state
-    current_env_state: Dict[str, Any],  # State *after* actions for logical_day_num
-    actions_log: List[Dict[str, Any]],
-    logical_day_num: int,  # The simulation loop's day index
-):
+def run_simulation(
+    days_to_simulate: int,
+    actions_per_day: int = None,
+    render_policy: str = "every",
+    render_every: int = 1,
+    quiet: bool = False,
+    progress_every: int = 100,
+    instrument: bool = False,
+    instrumentation_path: Optional[str] = None,
+    checkpoint_path: Optional[str] = None,
+    checkpoint_every: int = 0,
+    resume: bool = False,
+    metrics_path: Optional[str] = None,
+    num_villagers: Optional[int] = None,
+    seed: Optional[int] = None,
+    data_path: str = "data",
+) -> Dict[str, Any]:
     """
-    Prepares and displays the full daily report/summary panel, including actions.
+    Run the Animal Crossing simulation with per-villager actions.
 
     Args:
-        console_instance: The Rich Console object.
-        environment: The ACNHEnvironment instance.
-        current_env_state: The current state dictionary from environment.get_state().
-        actions_log: A list of action dictionaries performed during the logical day.
-        logical_day_num: The logical day number from the simulation loop.
+        days_to_simulate: Number of days to simulate
+        actions_per_day: Maximum number of villagers that can act per day.
+                         If None, all villagers will act each day.
+        render_policy: "every" renders a daily report every `render_every` days,
+                       "final" renders only the last day, "none" renders nothing.
+                       Reports are rendered on a background thread.
+        render_every: Interval in days between daily reports for the "every" policy.
+        quiet: Emit only compact plain-text metrics lines (no Rich panels),
+               overriding `render_policy`.
+        progress_every: Interval in days between progress/metrics lines.
+        instrument: Record per-action-type step latencies and daily-cycle
+                    phase timings in the environment.
+        instrumentation_path: If set (and `instrument` is on), the latency
+                              histograms are also written to this JSON file.
+        checkpoint_path: File for compact simulation checkpoints. A checkpoint
+                         is always written after the last day when set.
+        checkpoint_every: Interval in days between periodic checkpoints
+                          (0 disables periodic checkpoints).
+        resume: Continue from `checkpoint_path` if it exists; the run picks up
+                at the day after the checkpoint and reproduces the
+                uninterrupted run exactly.
+        metrics_path: Directory for a streaming columnar metrics sink. When set,
+                      daily rewards are written in fixed-size chunks instead of
+                      kept in memory, and "rewards_log" is a lazy `MetricsReader`.
+                      Resuming an in-memory checkpoint with a sink copies its
+                      rewards into the sink; a checkpoint written with a sink
+                      can only be resumed with one (ValueError otherwise).
+        num_villagers: Villagers on the island at the start of a fresh run
+                       (10 when None). On resume, `num_villagers` and the
+                       resolved `actions_per_day` come from the checkpoint;
+                       passing a different value raises ValueError.
+        seed: Seed for the `random` module before a fresh run's island is
+              built; a resumed run restores the checkpoint's RNG state instead.
+        data_path: Location of the ACNH CSV data.
+    Returns:
+        Dict[str, Any]: The per-day rewards log, the final state, a timing
+        breakdown between simulation, rendering and checkpointing and, when
+        instrumented, the latency histograms under "instrumentation".
     """
-    day_panel_title = (
-        f":calendar: Report for Logical Day {logical_day_num} "
-        f"(Env. Day {current_env_state['current_day']}, Date: {current_env_state['current_date']}) "
-        f":sunrise_over_mountains:"
-    )
-
-    header_text = Text(justify="center")
-    header_text.append(
-        f"Bells: {format_bell_count(current_env_state['bells'])} | ", style="bold"
-    )
-    header_text.append(
-        f"Nook Miles: {format_nook_miles(current_env_state['nook_miles'])} | ",
-        style="bold",
-    )
-    header_text.append(
-        f"Avg. Friendship: {format_friendship(current_env_state['avg_friendship'])}",
-        style="bold",
-    )
-
-    day_info = [header_text]
-
-    if current_env_state["turnip_buy_price"] > 0:
-        day_info.append(
-            f":moneybag: Daisy Mae selling turnips at: [bold yellow]{current_env_state['turnip_buy_price']}[/bold yellow] bells"
+    if render_policy not in RENDER_POLICIES:
+        raise ValueError(
+            f"render_policy must be one of {RENDER_POLICIES}, got '{render_policy}'"
         )
-    if current_env_state["turnip_sell_price"] > 0:
-        day_info.append(
-            f":chart_with_upwards_trend: Nooklings buying turnips at: [bold green]{current_env_state['turnip_sell_price']}[/bold green] bells"
+    if quiet:
+        render_policy = "none"
+    rendering = render_policy != "none"
+
+    if rendering:
+        # Rich is only loaded when something is rendered; workers never pay for it
+        from enigma_engines.animal_crossing.rendering import (
+            BackgroundRenderer,
+            Panel,
+            console,
+            print_summary_table,
         )
 
-    # Villager Actions Table
-    if actions_log:
-        actions_table = Table(
-            title=":performing_arts: Villager Actions This Logical Day",
-            show_header=True,
-            header_style="bold magenta",
-            expand=False,
-        )
-        actions_table.add_column(
-            "Villager", style="italic yellow", width=15, overflow="fold"
+        console.print(
+            Panel(
+                "[bold magenta]--- Starting ACNH Social Economist Agent Simulation --- :rocket:",
+                title="Simulation Start",
+                expand=False,
+            )
         )
-        actions_table.add_column("Action Type", style="cyan", width=20, overflow="fold")
-        actions_table.add_column("Details", overflow="fold")
-
-        for action_item in actions_log:
-            actor = action_item.get("villager_name", "N/A")
-            action_type = action_item.get("type", "UNKNOWN")
-
-            details_parts = []
-            if action_item.get("target_villager_name"):
-                details_parts.append(f"Target: {action_item['target_villager_name']}")
-            if action_item.get("gift_name"):
-                details_parts.append(f"Gift: {action_item['gift_name']}")
-            if action_item.get("task_name"):
-                details_parts.append(f"Task: {action_item['task_name']}")
-            if action_item.get("crop_name"):
-                details_parts.append(f"Crop: {action_item['crop_name']}")
-            if action_item.get("plot_id") is not None:
-                details_parts.append(f"Plot: {action_item['plot_id']}")
-            if action_item.get("quantity"):
-                details_parts.append(f"Qty: {action_item['quantity']}")
-            if action_item.get("items_to_sell_list"):
-                items_summary = ", ".join(
-                    [
-                        f"{item['name']}(x{item['quantity']})"
-                        for item in action_item["items_to_sell_list"][:2]
-                    ]
-                )
-                if len(action_item["items_to_sell_list"]) > 2:
-                    items_summary += "..."
-                details_parts.append(f"Items: {items_summary}")
-
-            details_str = "; ".join(details_parts)
-            if action_type == "IDLE":
-                details_str = "[dim]Took a break[/dim]"
 
-            actions_table.add_row(
-                actor, action_type, details_str if details_str else "[dim]-[/dim]"
+    dataset = ACNHItemDataset(data_path=data_path)  # Load once
+    first_day_idx = 0
+    if resume and checkpoint_path and os.path.exists(checkpoint_path):
+        env, agent, run_state = load_checkpoint(checkpoint_path, dataset=dataset)
+        first_day_idx = run_state["next_day_idx"]
+        for name, given, saved in (
+            ("num_villagers", num_villagers, run_state["num_villagers"]),
+            ("actions_per_day", actions_per_day, run_state["actions_per_day"]),
+        ):
+            if given is not None and given != saved:
+                raise ValueError(
+                    f"Checkpoint '{checkpoint_path}' was written with "
+                    f"{name}={saved}, got {given}"
+                )
+        num_villagers = run_state["num_villagers"]
+        actions_per_day = run_state["actions_per_day"]
+        total_rewards_log = run_state["rewards_log"]
+        metrics_rows = run_state.get("metrics_rows")
+        if metrics_rows is not None and not metrics_path:
+            raise ValueError(
+                f"Checkpoint '{checkpoint_path}' streamed its rewards to a metrics "
+                "directory; resume it with metrics_path set to that directory"
             )
-        day_info.append(actions_table)
-    else:
-        day_info.append(":zzz: No villager actions logged for this logical day.")
-
-    if current_env_state["active_nook_tasks"]:
-        tasks_table = Table(
-            title=":scroll: Available Nook Tasks",
-            show_header=True,
-            header_style="bold blue",
-            expand=False,
-        )
-        tasks_table.add_column("Task Name", style="dim", width=30, overflow="fold")
-        tasks_table.add_column("Miles", justify="right")
-        tasks_table.add_column("Category", justify="right", overflow="fold")
-        tasks_table.add_column("Quantity", justify="right")
-        for task_name, details in current_env_state["active_nook_tasks"].items():
-            tasks_table.add_row(
-                task_name,
-                str(details.get("miles", "N/A")),
-                str(details["criteria"]["category"]),
-                str(details["criteria"]["quantity"]),
+        if rendering:
+            console.print(
+                f":floppy_disk: Resumed from '{checkpoint_path}' at day {first_day_idx}"
             )
-        day_info.append(tasks_table)
+        elif not quiet:
+            print(f"Resumed from '{checkpoint_path}' at day {first_day_idx}")
     else:
-        day_info.append(":information_source: No Nook Tasks available today.")
-
-    villager_table = Table(
-        title=":house_with_garden: Villager Friendship Levels",
-        show_header=True,
-        header_style="bold purple",
-        expand=False,
-    )
-    villager_table.add_column("Villager Name", style="italic")
-    villager_table.add_column("Friendship", justify="center")
-
-    for v_obj in environment.villagers:
-        villager_table.add_row(v_obj.name, format_friendship(v_obj.friendship_level))
-    day_info.append(villager_table)
-
-    _print_day_summary_panel(console_instance, day_panel_title, day_info)
-
-
-def run_simulation(days_to_simulate: int, actions_per_day: int = None):
-    """
-    Run the Animal Crossing simulation with per-villager actions.
-
-    Args:
-        days_to_simulate: Number of days to simulate
-        actions_per_day: Maximum number of villagers that can act per day.
-                         If None, all villagers will act each day.
-    """
-    import random  # For shuffling villagers
-
-    console.print(
-        Panel(
-            "[bold magenta]--- Starting ACNH Social Economist Agent Simulation --- :rocket:",
-            title="Simulation Start",
-            expand=False,
+        if num_villagers is None:
+            num_villagers = 10
+        # If actions_per_day is not specified, allow all villagers to act
+        if actions_per_day is None:
+            actions_per_day = num_villagers
+        if seed is not None:
+            random.seed(seed)
+        env = ACNHEnvironment(
+            num_villagers=num_villagers, dataset=dataset, instrument=instrument
+        )
+        agent = Multi_Objective_Agent(
+            dataset=dataset, num_villagers_on_island=num_villagers
         )
-    )
-
-    dataset = ACNHItemDataset()  # Load once
-    num_villagers = 10
-    env = ACNHEnvironment(num_villagers=num_villagers, dataset=dataset)
-    agent = Multi_Objective_Agent(
-        dataset=dataset, num_villagers_on_island=num_villagers
-    )
-
-    env.reset()  # Initialize environment
-
-    total_rewards_log = {"friendship": [], "bells": [], "nook_miles": []}
-
-    # If actions_per_day is not specified, allow all villagers to act
-    if actions_per_day is None:
-        actions_per_day = num_villagers
 
-    for day_idx in range(days_to_simulate):  # This is the master day counter
-        current_env_state_at_loop_start = (
-            env.get_state()
-        )  # State at the beginning of the logical day
+        env.reset()  # Initialize environment
 
-        # Get all villagers and shuffle them for random action order
-        villagers_for_today = list(env.villagers)
-        random.shuffle(villagers_for_today)
+        total_rewards_log = {"friendship": [], "bells": [], "nook_miles": []}
+        metrics_rows = None
 
-        # Track actions for this logical day for the report
-        actions_for_this_logical_day = []
-        villagers_acted_count_this_logical_day = 0
+    metrics_writer = None
+    if metrics_path:
+        # Rewards stream to disk; only the writer's current chunk stays resident
+        metrics_writer = MetricsWriter(
+            metrics_path, REWARD_COLUMNS, resume_rows=metrics_rows
+        )
+        if metrics_rows is None:
+            # Carry the rows of an in-memory checkpoint (or none, on a fresh run)
+            for friendship, bells, nook_miles in zip(
+                total_rewards_log["friendship"],
+                total_rewards_log["bells"],
+                total_rewards_log["nook_miles"],
+            ):
+                metrics_writer.append(
+                    friendship=friendship, bells=bells, nook_miles=nook_miles
+                )
+        total_rewards_log = None
 
-        day_was_advanced_by_agent = False
+    renderer = BackgroundRenderer(console, env) if rendering else None
+    simulation_seconds = 0.0
+    checkpoint_stats = {"count": 0, "seconds": 0.0, "last_bytes": 0}
 
-        # Limit the number of villagers that can act today
-        max_villagers_to_act = min(actions_per_day, len(villagers_for_today))
+    def write_checkpoint(next_day_idx: int):
+        if metrics_writer is not None:
+            metrics_writer.flush()  # The checkpoint records committed rows only
+        stats = save_checkpoint(
+            checkpoint_path,
+            env,
+            agent,
+            extra={
+                "next_day_idx": next_day_idx,
+                "num_villagers": num_villagers,
+                "actions_per_day": actions_per_day,
+                "rewards_log": total_rewards_log,
+                "metrics_rows": (
+                    metrics_writer.rows if metrics_writer is not None else None
+                ),
+            },
+        )
+        checkpoint_stats["count"] += 1
+        checkpoint_stats["seconds"] += stats["seconds"]
+        checkpoint_stats["last_bytes"] = stats["bytes"]
+
+    # Within-day crowding counts, reset at the start of every day
+    action_counter = DailyActionCounter()
+
+    # day_idx is the master day counter
+    for day_idx in range(first_day_idx, days_to_simulate):
+        day_start = time.perf_counter()
+        actions_for_this_logical_day, state_after_actions = run_day(
+            env, agent, actions_per_day, action_counter
+        )
 
-        for villager_idx, acting_villager in enumerate(villagers_for_today):
-            if villagers_acted_count_this_logical_day >= max_villagers_to_act:
-                break  # Reached max number of villagers for the day
+        # Log overall daily results
+        if metrics_writer is not None:
+            metrics_writer.append(
+                friendship=state_after_actions["avg_friendship"],
+                bells=state_after_actions["bells"],
+                nook_miles=state_after_actions["nook_miles"],
+            )
+        else:
+            total_rewards_log["friendship"].append(
+                state_after_actions["avg_friendship"]
+            )
+            total_rewards_log["bells"].append(state_after_actions["bells"])
+            total_rewards_log["nook_miles"].append(state_after_actions["nook_miles"])
+        simulation_seconds += time.perf_counter() - day_start
 
-            # Get fresh state for each villager's decision
-            current_env_state_for_decision = env.get_state()
+        is_last_day = day_idx == days_to_simulate - 1
+        if checkpoint_path and (
+            is_last_day or (checkpoint_every and (day_idx + 1) % checkpoint_every == 0)
+        ):
+            write_checkpoint(day_idx + 1)
 
-            # If day was already advanced, stop processing villagers
+        if renderer is not None:
             if (
-                current_env_state_for_decision["current_day"]
-                > current_env_state_at_loop_start["current_day"]
+                render_policy == "every" and day_idx % render_every == 0
+            ) or is_last_day:
+                renderer.submit(
+                    "report", state_after_actions, actions_for_this_logical_day, day_idx
+                )
+            if render_policy == "every" and (
+                day_idx % progress_every == 0 or is_last_day
             ):
-                day_was_advanced_by_agent = True
-                break
-
-            # Choose action for this specific villager, considering diversity
-            action = agent.choose_action(
-                current_env_state_for_decision,
-                env.villagers,
-                agent_name=acting_villager.name,
-                actions_taken_today_by_others=actions_for_this_logical_day,
+                renderer.submit("progress", state_after_actions, day_idx)
+        elif quiet and (day_idx % progress_every == 0 or is_last_day):
+            print(
+                f"day={day_idx} env_day={state_after_actions['current_day']} "
+                f"bells={state_after_actions['bells']} "
+                f"nook_miles={state_after_actions['nook_miles']} "
+                f"avg_friendship={state_after_actions['avg_friendship']:.2f}"
             )
-
-            # Add action to log for the report
-            actions_for_this_logical_day.append(action.copy())
-
-            if action["type"] == "IDLE":
-                # Still count this villager as having acted
-                villagers_acted_count_this_logical_day += 1
-                continue
-
-            # Execute the action
-            _, _, _ = env.step(
-                action, acting_villager
-            )  # Pass acting_villager for direct use
-
-            # Track this villager's action
-            villagers_acted_count_this_logical_day += 1
-
-            # If the action taken was ADVANCE_DAY, the environment's day counter will increment
-            if action["type"] == "ADVANCE_DAY":
-                day_was_advanced_by_agent = True
-                break  # End actions for this `day_idx`
-
-        # --- End of Actions for `day_idx` ---
-        state_after_actions = (
-            env.get_state()
-        )  # State after all actions for this logical day are done
-
-        # Display the daily report for the logical day that just finished
-        _display_daily_report(
+    # --- End of Simulation ---
+    final_state_at_end = env.get_state()
+    if metrics_writer is not None:
+        metrics_writer.close()
+        total_rewards_log = MetricsReader(metrics_path)
+
+    render_seconds = 0.0
+    render_blocked_seconds = 0.0
+    if renderer is not None:
+        renderer.close()
+        render_start = time.perf_counter()
+        console.print(
+            Panel(
+                "[bold magenta]--- Simulation Ended --- :checkered_flag:",
+                title="Simulation Complete",
+                expand=False,
+            )
+        )
+        # Final summary at the end of the simulation
+        print_summary_table(
             console,
+            final_state_at_end,
+            days_to_simulate,
             env,
-            state_after_actions,  # Current state of the environment
-            actions_for_this_logical_day,  # Actions performed during this logical day
-            day_idx,  # The logical day number
+            metrics=total_rewards_log if metrics_writer is not None else None,
         )
-
-        # Log overall daily results
-        total_rewards_log["friendship"].append(state_after_actions["avg_friendship"])
-        total_rewards_log["bells"].append(state_after_actions["bells"])
-        total_rewards_log["nook_miles"].append(state_after_actions["nook_miles"])
-
-        if day_idx % 100 == 0 or day_idx == days_to_simulate - 1:
-            progress_text = Text.assemble(
-                (
-                    f"End of Day {day_idx} (Env Day: {state_after_actions['current_day']}, Date: {state_after_actions['current_date']}): ",
-                    "bold",
-                ),
-                ("Bells: ", "italic"),
-                format_bell_count(state_after_actions["bells"]),
-                " | ",
-                ("Miles: ", "italic"),
-                format_nook_miles(state_after_actions["nook_miles"]),
-                " | ",
-                ("AvgFriend: ", "italic"),
-                format_friendship(state_after_actions["avg_friendship"]),
-            )
-            console.print(
-                Padding(progress_text, (0, 0, 1, 0)), style="on grey19"
-            )  # Added bottom padding
-
-        # If the day was NOT advanced by an agent's ADVANCE_DAY action during its turns,
-        # and the environment's current day is still effectively `day_idx`, advance it now.
-        if (
-            not day_was_advanced_by_agent
-            and env.get_state()["current_day"]
-            == current_env_state_at_loop_start["current_day"]
-        ):
-            env.advance_day_cycle()
-    # --- End of Simulation ---
-    # Final summary at the end of the simulation
-
-    console.print(
-        Panel(
-            "[bold magenta]--- Simulation Ended --- :checkered_flag:",
-            title="Simulation Complete",
-            expand=False,
+        render_seconds = renderer.render_seconds + (time.perf_counter() - render_start)
+        render_blocked_seconds = renderer.blocked_seconds
+
+    timings = {
+        "simulation_seconds": simulation_seconds,
+        "render_seconds": render_seconds,
+        "render_blocked_seconds": render_blocked_seconds,
+        "days_per_second": (
+            (days_to_simulate - first_day_idx) / simulation_seconds
+            if simulation_seconds
+            else 0.0
+        ),
+        "checkpoints_written": checkpoint_stats["count"],
+        "checkpoint_seconds": checkpoint_stats["seconds"],
+        "checkpoint_bytes": checkpoint_stats["last_bytes"],
+    }
+    if quiet:
+        print(
+            f"simulated {days_to_simulate} days in {simulation_seconds:.3f}s "
+            f"({timings['days_per_second']:.1f} days/s)"
         )
-    )
-    final_state_at_end = env.get_state()
-    print_summary_table(console, final_state_at_end, days_to_simulate, env)
+    elif rendering:
+        console.print(
+            f":stopwatch: Simulation {simulation_seconds:.3f}s | "
+            f"Rendering {render_seconds:.3f}s (loop blocked {render_blocked_seconds:.3f}s)"
+        )
+    if checkpoint_stats["count"]:
+        message = (
+            f"wrote {checkpoint_stats['count']} checkpoint(s) to '{checkpoint_path}' "
+            f"in {checkpoint_stats['seconds']:.3f}s "
+            f"({checkpoint_stats['last_bytes'] / 1024:.1f} KiB each)"
+        )
+        if quiet:
+            print(message)
+        elif rendering:
+            console.print(f":floppy_disk: {message}")
 
     # If you want to keep the original matplotlib plots:
     # plot_simulation_results(rewards_log=total_rewards_log)
+    results = {
+        "rewards_log": total_rewards_log,
+        "final_state": final_state_at_end,
+        "timings": timings,
+    }
+    if env.instrumentation is not None:
+        results["instrumentation"] = env.instrumentation.to_dict()
+        if instrumentation_path:
+            env.instrumentation.to_json(instrumentation_path)
+    return results
 
 
 if __name__ == "__main__":
+    from enigma_engines.animal_crossing.rendering import Panel, Text, console
+
     console.print(
         Panel(
             Text("Welcome to the Animal Crossing Simulator!", justify="center"),
@@ -0,0 +1,318 @@
+"""
+Successive-halving search over `Multi_Objective_Agent` settings.
+
+Candidate configurations override the agent's objective `weights`,
+`friendship_target_min`, `bells_target_min`, `PLANTER_FOCUS_PERCENTAGE` and
+`FORCE_GIFT_SCORE_BONUS_FACTOR` (any other agent attribute may be given too;
+they are applied with `experiments.configure_agent`). Every configuration
+plays the same seeds in parallel worker processes. After each rung, e.g. one
+simulated week, configurations are ranked by a fixed objective and only the
+best `1 / reduction_factor` keep going. Survivors continue from a checkpoint
+of their island rather than starting over, so a run that reaches the last
+rung is bit-for-bit the same as an uninterrupted run of that length.
+
+The leaderboard, with every configuration's bells, Nook Miles, friendship and
+objective at the rung it reached, is rewritten to `leaderboard.json` after
+each rung.
+"""
+
+import hashlib
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from enigma_engines.animal_crossing.core.checkpoint import (
+    load_checkpoint,
+    save_checkpoint,
+)
+from enigma_engines.animal_crossing.core.planner import evaluate_state
+from enigma_engines.animal_crossing.core.turnip_market import (
+    TURNIP_TABLE_FILENAME,
+    load_or_build_turnip_table,
+)
+from enigma_engines.animal_crossing.experiments import (
+    AGENT_PARAM_PREFIX,
+    ExperimentTask,
+    build_task_run,
+    get_worker_dataset,
+)
+
+LEADERBOARD_FILENAME = "leaderboard.json"
+CHECKPOINT_DIRNAME = "checkpoints"
+# Configurations are ranked against a fixed objective, not their own weights
+DEFAULT_OBJECTIVE_WEIGHTS = {"friendship": 0.50, "bells": 0.35, "nook_miles": 0.15}
+OUTCOME_METRICS = ("bells", "nook_miles", "avg_friendship")
+
+
+def sample_configurations(
+    num_configs: int, seed: int = 0, include_default: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Draws random agent settings for a search.
+
+    Objective weights are drawn from a flat Dirichlet, targets and the gift
+    bonus log-uniformly, and the planter share uniformly.
+
+    Args:
+        num_configs: Number of configurations to return.
+        seed: Seed for the draws.
+        include_default: Make the first configuration the agent's hand-set
+                         defaults (no overrides), as a baseline.
+    Returns:
+        List[Dict[str, Any]]: Agent overrides, one dict per configuration.
+    """
+    rng = np.random.default_rng(seed)
+    configs: List[Dict[str, Any]] = [{}] if include_default and num_configs else []
+    while len(configs) < num_configs:
+        friendship, bells, nook_miles = rng.dirichlet(np.ones(3)).round(3).tolist()
+        configs.append(
+            {
+                "weights": {
+                    "friendship": friendship,
+                    "bells": bells,
+                    "nook_miles": nook_miles,
+                },
+                "friendship_target_min": int(rng.integers(30, 101)),
+                "bells_target_min": int(round(10 ** rng.uniform(3.0, 4.3), -2)),
+                "PLANTER_FOCUS_PERCENTAGE": round(float(rng.uniform(0.0, 0.5)), 3),
+                "FORCE_GIFT_SCORE_BONUS_FACTOR": round(
+                    float(10 ** rng.uniform(0.0, 2.7)), 1
+                ),
+            }
+        )
+    return configs
+
+
+def config_id(params: Dict[str, Any]) -> str:
+    """Stable identifier of a set of agent overrides."""
+    payload = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8"), usedforsecurity=False).hexdigest()[:12]
+
+
+def advance_trial(
+    params: Dict[str, Any],
+    seed: int,
+    days_done: int,
+    days: int,
+    checkpoint_path: str,
+    env_params: Optional[Dict[str, Any]] = None,
+    actions_per_day: Optional[int] = None,
+    data_path: str = "data",
+) -> Dict[str, Any]:
+    """
+    Plays one (configuration, seed) trial for `days` more days.
+
+    The first rung builds the island like an experiment task; later rungs
+    resume from `checkpoint_path`, which is rewritten at the end.
+
+    Returns:
+        Dict[str, Any]: Final bells, Nook Miles and average friendship.
+    """
+    # Imported here so the parent process does not need the rendering stack
+    from enigma_engines.animal_crossing.simulation import run_day
+
+    dataset = get_worker_dataset(data_path)
+    if days_done == 0:
+        config = dict(env_params or {})
+        config.update(
+            {AGENT_PARAM_PREFIX + key: value for key, value in params.items()}
+        )
+        if actions_per_day is not None:
+            config["actions_per_day"] = actions_per_day
+        env, agent, actions_per_day = build_task_run(
+            ExperimentTask(config=config, seed=seed, days=days), dataset
+        )
+    else:
+        env, agent, extra = load_checkpoint(checkpoint_path, dataset)
+        actions_per_day = extra["actions_per_day"]
+
+    for _ in range(days):
+        run_day(env, agent, actions_per_day)
+    save_checkpoint(
+        checkpoint_path,
+        env,
+        agent,
+        extra={"days": days_done + days, "actions_per_day": actions_per_day},
+    )
+
+    state = env.get_state()
+    return {metric: state[metric] for metric in OUTCOME_METRICS}
+
+
+def _write_leaderboard(path: str, leaderboard: List[Dict[str, Any]]):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(leaderboard, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def read_leaderboard(results_dir: str) -> List[Dict[str, Any]]:
+    """Loads the leaderboard written by `run_tuning`, best configuration first."""
+    with open(os.path.join(results_dir, LEADERBOARD_FILENAME), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def run_tuning(
+    results_dir: str,
+    configs: Optional[Sequence[Dict[str, Any]]] = None,
+    num_configs: int = 27,
+    seeds: Sequence[int] = (0, 1, 2),
+    rung_days: Sequence[int] = (7, 14, 28),
+    reduction_factor: int = 3,
+    env_params: Optional[Dict[str, Any]] = None,
+    actions_per_day: Optional[int] = None,
+    objective_weights: Optional[Dict[str, float]] = None,
+    max_workers: Optional[int] = None,
+    data_path: str = "data",
+    sample_seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Runs a successive-halving search and returns the leaderboard.
+
+    Args:
+        results_dir: Directory for `leaderboard.json` and trial checkpoints.
+        configs: Agent overrides to evaluate; sampled with `sample_configurations`
+                 when None.
+        num_configs: Number of configurations to sample when `configs` is None.
+        seeds: Seeds every configuration is played on; outcomes are averaged.
+        rung_days: Total simulated days at the end of each rung, increasing.
+        reduction_factor: Keep the best `ceil(n / reduction_factor)` after each rung.
+        env_params: `ACNHEnvironment` keyword arguments shared by every trial.
+        actions_per_day: Villagers acting per day; defaults to the initial population.
+        objective_weights: Weights for `planner.evaluate_state` when ranking;
+                           defaults to `DEFAULT_OBJECTIVE_WEIGHTS`.
+        max_workers: Process count; defaults to `os.cpu_count()`.
+        data_path: Location of the ACNH CSV data.
+        sample_seed: Seed for `sample_configurations`.
+    Returns:
+        List[Dict[str, Any]]: One entry per configuration, those that went
+        furthest first, then by objective.
+    Raises:
+        RuntimeError: If any trial of a rung failed, once the others finished.
+    """
+    if not rung_days or any(b <= a for a, b in zip([0, *rung_days], rung_days)):
+        raise ValueError(f"rung_days must be positive and increasing, got {rung_days}")
+    if reduction_factor < 2:
+        raise ValueError(f"reduction_factor must be at least 2, got {reduction_factor}")
+    if configs is None:
+        configs = sample_configurations(num_configs, seed=sample_seed)
+    objective_weights = objective_weights or DEFAULT_OBJECTIVE_WEIGHTS
+    seeds = list(seeds)
+
+    checkpoint_dir = os.path.join(results_dir, CHECKPOINT_DIRNAME)
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    leaderboard_path = os.path.join(results_dir, LEADERBOARD_FILENAME)
+
+    entries = {}
+    for params in configs:
+        entry_id = config_id(params)
+        entries.setdefault(entry_id, {"config_id": entry_id, "params": params})
+    alive = list(entries)
+    print(
+        f"Tuning {len(alive)} configurations on {len(seeds)} seeds, "
+        f"rungs at days {list(rung_days)}."
+    )
+
+    # Build the shared turnip table once so workers only read the cache
+    load_or_build_turnip_table(os.path.join(data_path, TURNIP_TABLE_FILENAME))
+
+    def checkpoint_path(entry_id: str, seed: int) -> str:
+        return os.path.join(checkpoint_dir, f"{entry_id}_{seed}.ckpt")
+
+    days_done = 0
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for rung, total_days in enumerate(rung_days):
+            start = time.perf_counter()
+            futures = {
+                executor.submit(
+                    advance_trial,
+                    entries[entry_id]["params"],
+                    seed,
+                    days_done,
+                    total_days - days_done,
+                    checkpoint_path(entry_id, seed),
+                    env_params,
+                    actions_per_day,
+                    data_path,
+                ): (entry_id, seed)
+                for entry_id in alive
+                for seed in seeds
+            }
+            outcomes: Dict[str, List[Dict[str, Any]]] = {
+                entry_id: [] for entry_id in alive
+            }
+            failures = []
+            for future in as_completed(futures):
+                entry_id, seed = futures[future]
+                try:
+                    outcomes[entry_id].append(future.result())
+                except Exception as exc:
+                    # Let the other trials finish their checkpoints; raise at the end
+                    failures.append((entry_id, seed, exc))
+            if failures:
+                summary = "; ".join(
+                    f"{entry_id} seed {seed}: {exc!r}"
+                    for entry_id, seed, exc in failures
+                )
+                raise RuntimeError(
+                    f"{len(failures)} of {len(futures)} trials failed in rung "
+                    f"{rung}: {summary}"
+                ) from failures[0][2]
+            days_done = total_days
+
+            for entry_id in alive:
+                results = outcomes[entry_id]
+                entry = entries[entry_id]
+                entry["rung"] = rung
+                entry["days"] = total_days
+                for metric in OUTCOME_METRICS:
+                    entry[metric] = float(np.mean([r[metric] for r in results]))
+                entry["objective"] = float(
+                    np.mean([evaluate_state(r, objective_weights) for r in results])
+                )
+            alive.sort(key=lambda entry_id: -entries[entry_id]["objective"])
+
+            if rung < len(rung_days) - 1:
+                keep = max(1, math.ceil(len(alive) / reduction_factor))
+                for entry_id in alive[keep:]:
+                    for seed in seeds:
+                        os.remove(checkpoint_path(entry_id, seed))
+                alive = alive[:keep]
+
+            leaderboard = sorted(
+                entries.values(),
+                key=lambda entry: (-entry.get("days", 0), -entry.get("objective", 0)),
+            )
+            _write_leaderboard(leaderboard_path, leaderboard)
+            best = entries[alive[0]]
+            print(
+                f"Rung {rung} (day {total_days}): {len(futures)} trials in "
+                f"{time.perf_counter() - start:.1f}s, {len(alive)} kept, best "
+                f"{best['config_id']} objective {best['objective']:.3f}"
+            )
+
+    return leaderboard
+
+
+if __name__ == "__main__":
+    board = run_tuning(
+        "results/agent_tuning",
+        num_configs=27,
+        seeds=range(3),
+        env_params={"num_villagers": 10},
+    )
+    for entry in board[:5]:
+        print(
+            entry["config_id"],
+            entry["days"],
+            f"{entry['objective']:.3f}",
+            f"{entry['bells']:.0f}",
+            f"{entry['nook_miles']:.0f}",
+            f"{entry['avg_friendship']:.2f}",
+            entry["params"],
+        )
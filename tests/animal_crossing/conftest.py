@@ -0,0 +1,12 @@
+import pytest
+
+from enigma_engines.animal_crossing.core.load_data import SNAPSHOT_DIR_ENV
+
+
+@pytest.fixture(scope="session", autouse=True)
+def dataset_snapshot_dir(tmp_path_factory):
+    # Keep dataset snapshots out of the user cache; subprocesses inherit this too
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        directory = tmp_path_factory.mktemp("dataset_snapshots")
+        monkeypatch.setenv(SNAPSHOT_DIR_ENV, str(directory))
+        yield directory
@@ -0,0 +1,59 @@
+import random
+
+from enigma_engines.animal_crossing.core.action_counter import DailyActionCounter
+from enigma_engines.animal_crossing.core.agent import Multi_Objective_Agent
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+
+
+def test_counts_by_type_target_and_task():
+    counter = DailyActionCounter(
+        [
+            {"type": "GIVE_GIFT", "target_villager_name": "Raymond"},
+            {"type": "GIVE_GIFT", "target_villager_name": "Raymond"},
+            {"type": "TALK_TO_VILLAGER", "target_villager_name": "Raymond"},
+            {"type": "DO_NOOK_MILES_TASK", "task_name": "Catch 5 fish"},
+            {"type": "IDLE"},
+            {},
+        ]
+    )
+    assert len(counter) == 5
+    assert counter.count("GIVE_GIFT") == 2
+    assert counter.target_count("GIVE_GIFT", "Raymond") == 2
+    assert counter.target_count("TALK_TO_VILLAGER", "Raymond") == 1
+    assert counter.target_count("GIVE_GIFT", "Audie") == 0
+    assert counter.task_count("Catch 5 fish") == 1
+
+    counter.reset()
+    assert len(counter) == 0 and counter.count("GIVE_GIFT") == 0
+
+
+def test_repeat_target_penalty_spreads_social_actions():
+    random.seed(8)
+    env = ACNHEnvironment(num_villagers=6)
+    for villager in env.villagers:
+        villager.friendship_level = 200
+    lonely = env.villagers[-1]
+    lonely.friendship_level = 5
+    state = env.get_state()
+    actor = env.villagers[0].name
+    # Already talked to the lonely villager today; a gift to someone else
+    # switches off the first-gift bonus
+    counter = DailyActionCounter(
+        [
+            {"type": "TALK_TO_VILLAGER", "target_villager_name": lonely.name},
+            {"type": "GIVE_GIFT", "target_villager_name": env.villagers[1].name},
+        ]
+    )
+
+    def choose(repeat_penalty):
+        random.seed(1)
+        agent = Multi_Objective_Agent(dataset=env.dataset, num_villagers_on_island=6)
+        agent.weights = {"friendship": 1.0, "bells": 0.0, "nook_miles": 0.0}
+        agent.REPEAT_TARGET_PENALTY = repeat_penalty
+        action = agent.choose_action(
+            state, env.villagers, actor, action_counter=counter
+        )
+        return action["type"], action.get("target_villager_name")
+
+    assert choose(1.0) == ("TALK_TO_VILLAGER", lonely.name)
+    assert choose(0.0) != ("TALK_TO_VILLAGER", lonely.name)
@@ -0,0 +1,169 @@
+import hashlib
+import random
+
+import numpy as np
+import pytest
+
+from enigma_engines.animal_crossing.core.agent import (
+    ACTION_TYPE_IDS,
+    Multi_Objective_Agent,
+)
+from enigma_engines.animal_crossing.core.decision_cache import DecisionCache
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+from enigma_engines.animal_crossing.simulation import run_day
+
+# Trace digest produced by the scalar (pre-vectorization) scorer for the run below
+SCALAR_SCORER_TRACE_SHA256 = (
+    "9277eead55dfd711f8b182632190bbf2fb1029caf73888e87099f962d7b6d567"
+)
+
+
+@pytest.fixture(scope="module")
+def env_and_agent():
+    random.seed(2024)
+    env = ACNHEnvironment(num_villagers=12, villager_addition_percentage=0.5)
+    agent = Multi_Objective_Agent(dataset=env.dataset, num_villagers_on_island=12)
+    # The pinned trace predates task pruning
+    agent.PRUNE_INFEASIBLE_TASKS = False
+    return env, agent
+
+
+def test_vectorized_scoring_matches_scalar_choices(env_and_agent):
+    env, agent = env_and_agent
+    trace = []
+    for _ in range(15):
+        actions, state = run_day(env, agent, 1000)
+        trace.append(
+            (
+                sorted(state["villagers_friendship"].items()),
+                state["bells"],
+                state["nook_miles"],
+                [sorted(action.items()) for action in actions],
+            )
+        )
+    digest = hashlib.sha256(repr(trace).encode()).hexdigest()
+    assert digest == SCALAR_SCORER_TRACE_SHA256
+
+
+def test_crowding_penalty_spares_first_gift():
+    agent = Multi_Objective_Agent.__new__(Multi_Objective_Agent)
+    penalties = agent._crowding_penalties({"GIVE_GIFT": 1, "GO_FISHING": 2})
+    assert penalties[ACTION_TYPE_IDS["GIVE_GIFT"]] == 1.0
+    assert penalties[ACTION_TYPE_IDS["GO_FISHING"]] == pytest.approx(0.85**2)
+    assert penalties[ACTION_TYPE_IDS["TALK_TO_VILLAGER"]] == 1.0
+    assert np.all(agent._crowding_penalties({"SELL_ITEMS": 30}) >= 0.1)
+
+
+def test_anti_repetition_skips_repeated_target(env_and_agent):
+    env, agent = env_and_agent
+    state = env.get_state()
+    actor = env.villagers[0].name
+    first = agent.choose_action(state, env.villagers, actor, [])
+
+    agent.villager_last_action_details[actor] = dict(first)
+    agent.villager_action_repetition_counter[actor] = 2
+    second = agent.choose_action(state, env.villagers, actor, [])
+    assert not (
+        second["type"] == first["type"]
+        and second.get("target_villager_name") == first.get("target_villager_name")
+    )
+
+
+def test_choose_actions_for_day_matches_per_villager_calls():
+    random.seed(5)
+    env = ACNHEnvironment(num_villagers=10)
+    state = env.get_state()
+
+    def fresh_agent():
+        return Multi_Objective_Agent(dataset=env.dataset, num_villagers_on_island=10)
+
+    random.seed(99)
+    planned = fresh_agent().choose_actions_for_day(state, env.villagers)
+
+    random.seed(99)
+    agent = fresh_agent()
+    expected = []
+    for villager in env.villagers:
+        expected.append(
+            agent.choose_action(
+                state,
+                env.villagers,
+                agent_name=villager.name,
+                actions_taken_today_by_others=expected,
+            )
+        )
+    assert planned == expected
+
+    stopped = fresh_agent().choose_actions_for_day(
+        state, env.villagers, on_action=lambda villager, action: None
+    )
+    assert len(stopped) == 1
+
+
+def test_decision_cache_hits_without_changing_choices():
+    def play(cache_size):
+        random.seed(11)
+        env = ACNHEnvironment(num_villagers=8, villager_addition_percentage=0.0)
+        agent = Multi_Objective_Agent(dataset=env.dataset, num_villagers_on_island=8)
+        agent.decision_cache = DecisionCache(cache_size)
+        days = [run_day(env, agent, 8) for _ in range(3)]
+        return days, agent.decision_cache
+
+    cached_days, cache = play(Multi_Objective_Agent.DECISION_CACHE_SIZE)
+    uncached_days, no_cache = play(0)
+    assert cached_days == uncached_days
+    assert cache.hits > 0 and cache.hits + cache.misses == 24
+    assert no_cache.hits == 0 and len(no_cache) == 0
+
+
+def test_infeasible_tasks_are_never_proposed():
+    random.seed(4)
+    env = ACNHEnvironment(num_villagers=6, villager_addition_percentage=0.0)
+    env.active_nook_tasks = {
+        "Anything": {"miles": 100},
+        "Unsupported": {"miles": 5000, "criteria": {"category": "Fish"}},
+    }
+    env._reset_task_feasibility()
+    state = env.get_state()
+    actor = env.villagers[0].name
+
+    unpruned = Multi_Objective_Agent(dataset=env.dataset, num_villagers_on_island=6)
+    unpruned.PRUNE_INFEASIBLE_TASKS = False
+    assert unpruned.choose_action(state, env.villagers, actor)["task_name"] == (
+        "Unsupported"
+    )
+
+    agent = Multi_Objective_Agent(dataset=env.dataset, num_villagers_on_island=6)
+    ranked = agent.rank_actions(state, env.villagers, actor, k=100)
+    tasks = [a["task_name"] for a, _ in ranked if a["type"] == "DO_NOOK_MILES_TASK"]
+    assert tasks == ["Anything"]
+    assert agent.pruned_task_candidates == 1
+
+
+def test_social_targets_follow_the_actors_weakest_bonds():
+    random.seed(6)
+    env = ACNHEnvironment(num_villagers=12, villager_addition_percentage=0.0)
+    agent = Multi_Objective_Agent(dataset=env.dataset, num_villagers_on_island=12)
+    actor = env.villagers[0]
+    before, _ = agent._select_social_targets(env.villagers, actor.name)
+    assert len(before) == agent.SOCIAL_TARGET_LIMIT
+
+    env.villager_store.add_relationship(actor.slot, before[0].slot, 10)
+    after, slots = agent._select_social_targets(env.villagers, actor.name)
+    assert after[:-1] == before[1:] and before[0] not in after
+    assert slots.tolist() == [v.slot for v in after]
+
+
+def test_table_driven_turnip_sale_reaches_island_resources():
+    random.seed(8)
+    env = ACNHEnvironment(num_villagers=4, villager_addition_percentage=0.0)
+    agent = Multi_Objective_Agent(dataset=env.dataset, num_villagers_on_island=4)
+    env.advance_day_cycle()  # Leave Sunday so Nook's buys turnips
+    env.turnips_owned_by_island = 100
+    env.turnip_sell_price = 600
+    bells_before = env.bells
+
+    actions, state = run_day(env, agent, 1)
+    assert actions[0]["type"] == "SELL_TURNIPS"
+    assert state["turnips_owned"] == 0
+    assert state["bells"] == bells_before + 100 * 600
@@ -0,0 +1,114 @@
+import random
+
+import numpy as np
+import pytest
+
+from enigma_engines.animal_crossing.core.agent import Multi_Objective_Agent
+from enigma_engines.animal_crossing.core.checkpoint import (
+    load_checkpoint,
+    save_checkpoint,
+)
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+from enigma_engines.animal_crossing.simulation import run_day, run_simulation
+
+
+def _fingerprint(env, actions):
+    state = env.get_state()
+    return (
+        state["bells"],
+        state["nook_miles"],
+        state["villagers_friendship"],
+        state["turnip_sell_price"],
+        sorted(state["active_nook_tasks"]),
+        [action["type"] for action in actions],
+    )
+
+
+def test_resume_from_checkpoint_is_bit_for_bit(tmp_path):
+    random.seed(5)
+    env = ACNHEnvironment(num_villagers=5, instrument=True)
+    agent = Multi_Objective_Agent(dataset=env.dataset, num_villagers_on_island=5)
+    for _ in range(3):
+        run_day(env, agent, 5)
+
+    path = str(tmp_path / "run.ckpt")
+    stats = save_checkpoint(path, env, agent, extra={"next_day_idx": 3})
+    assert stats["bytes"] > 0
+
+    uninterrupted = [_fingerprint(env, run_day(env, agent, 5)[0]) for _ in range(4)]
+
+    random.seed(999)  # Clobber the RNG; the checkpoint must restore it
+    restored_env, restored_agent, extra = load_checkpoint(path, dataset=env.dataset)
+    assert extra == {"next_day_idx": 3}
+    assert restored_env.instrumentation is not None
+    assert "step" in vars(restored_env)  # instrumented wrapper rebound
+    np.testing.assert_array_equal(
+        restored_env.villager_store.friendship[: restored_env.villager_store.size],
+        [v.friendship_level for v in restored_env.villagers],
+    )
+
+    resumed = [
+        _fingerprint(restored_env, run_day(restored_env, restored_agent, 5)[0])
+        for _ in range(4)
+    ]
+    assert resumed == uninterrupted
+
+
+def test_resume_across_metrics_sink_modes(tmp_path):
+    options = dict(num_villagers=3, seed=2, quiet=True)
+    reference = run_simulation(4, **options)["rewards_log"]
+
+    # An in-memory checkpoint resumed with a sink carries its rows over
+    path = str(tmp_path / "memory.ckpt")
+    run_simulation(2, checkpoint_path=path, **options)
+    resumed = run_simulation(
+        4,
+        checkpoint_path=path,
+        resume=True,
+        metrics_path=str(tmp_path / "metrics"),
+        **options,
+    )["rewards_log"]
+    assert len(resumed) == 4
+    np.testing.assert_array_equal(resumed["bells"], reference["bells"])
+
+    # A sink checkpoint cannot drop its sink on resume
+    path = str(tmp_path / "sink.ckpt")
+    sink_options = dict(checkpoint_path=path, metrics_path=str(tmp_path / "sink"))
+    run_simulation(2, **sink_options, **options)
+    with pytest.raises(ValueError, match="metrics_path"):
+        run_simulation(4, checkpoint_path=path, resume=True, **options)
+
+
+def test_resume_restores_population_and_actions_per_day(tmp_path):
+    reference = run_simulation(4, num_villagers=3, seed=4, quiet=True)["rewards_log"]
+
+    path = str(tmp_path / "run.ckpt")
+    run_simulation(2, num_villagers=3, seed=4, quiet=True, checkpoint_path=path)
+    # Neither num_villagers nor actions_per_day is repeated on resume
+    resumed = run_simulation(4, quiet=True, checkpoint_path=path, resume=True)
+    assert resumed["rewards_log"] == reference
+
+    with pytest.raises(ValueError, match="actions_per_day=3, got 5"):
+        run_simulation(
+            4, actions_per_day=5, quiet=True, checkpoint_path=path, resume=True
+        )
+
+
+def test_failed_write_leaves_previous_checkpoint_and_no_temp_file(
+    tmp_path, monkeypatch
+):
+    random.seed(3)
+    env = ACNHEnvironment(num_villagers=3)
+    agent = Multi_Objective_Agent(dataset=env.dataset, num_villagers_on_island=3)
+    path = tmp_path / "run.ckpt"
+    save_checkpoint(str(path), env, agent, extra={"next_day_idx": 1})
+
+    def failing_fsync(fd):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("os.fsync", failing_fsync)
+    with pytest.raises(OSError, match="disk full"):
+        save_checkpoint(str(path), env, agent, extra={"next_day_idx": 2})
+
+    assert [p.name for p in tmp_path.iterdir()] == ["run.ckpt"]
+    assert load_checkpoint(str(path), dataset=env.dataset)[2] == {"next_day_idx": 1}
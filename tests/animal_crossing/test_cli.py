@@ -0,0 +1,45 @@
+import json
+import os
+
+from typer.testing import CliRunner
+
+from enigma_engines.animal_crossing.cli import app
+
+runner = CliRunner()
+
+
+def test_run_writes_metrics_checkpoint_and_profile(tmp_path):
+    args = [
+        "run",
+        "--days", "3",
+        "--villagers", "4",
+        "--seed", "5",
+        "--quiet",
+        "--checkpoint", str(tmp_path / "run.ckpt"),
+        "--metrics", str(tmp_path / "metrics"),
+        "--profile", str(tmp_path / "run.prof"),
+    ]  # fmt: skip
+    result = runner.invoke(app, args)
+
+    assert result.exit_code == 0, result.output
+    assert "simulated 3 days" in result.output
+    for name in ("run.ckpt", "metrics", "run.prof"):
+        assert os.path.exists(tmp_path / name)
+
+    result = runner.invoke(app, ["run", "--checkpoint-every", "2"])
+    assert result.exit_code != 0
+    assert "--checkpoint-every needs --checkpoint" in result.output
+
+
+def test_federation_reports_throughput(tmp_path):
+    output = tmp_path / "federation.json"
+    result = runner.invoke(
+        app,
+        ["federation", "--islands", "2", "--days", "2", "--villagers", "3",
+         "--output", str(output)],
+    )  # fmt: skip
+
+    assert result.exit_code == 0, result.output
+    assert "island-days/s" in result.output
+    totals = json.loads(output.read_text())
+    assert totals["islands"] == 2 and totals["days"] == 2
@@ -0,0 +1,32 @@
+import pytest
+
+from enigma_engines.animal_crossing.core.decision_cache import DecisionCache
+
+
+def test_lru_eviction_and_stats():
+    cache = DecisionCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats() == {
+        "size": 2,
+        "maxsize": 2,
+        "hits": 2,
+        "misses": 1,
+        "evictions": 1,
+        "hit_rate": pytest.approx(2 / 3),
+    }
+
+    cache.clear()
+    assert len(cache) == 0 and cache.hit_rate == 0.0
+
+
+def test_zero_size_disables_caching():
+    cache = DecisionCache(maxsize=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None and len(cache) == 0
+    with pytest.raises(ValueError):
+        DecisionCache(maxsize=-1)
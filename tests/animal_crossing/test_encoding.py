@@ -0,0 +1,88 @@
+import random
+
+import numpy as np
+import pytest
+
+from enigma_engines.animal_crossing.core.encoding import (
+    ISLAND_FEATURES,
+    VILLAGER_FEATURES,
+    ActionDecoder,
+    ObservationEncoder,
+)
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+
+
+@pytest.fixture(scope="module")
+def envs():
+    random.seed(7)
+    return [
+        ACNHEnvironment(num_villagers=num, villager_addition_percentage=0.0)
+        for num in (3, 5)
+    ]
+
+
+def test_encode_batch_writes_fixed_shape_rows(envs):
+    encoder = ObservationEncoder(max_villagers=8, max_tasks=20, max_plots=10)
+    buffers = encoder.allocate(len(envs))
+    encoder.encode_batch(envs, buffers)
+
+    assert buffers["island"].shape == (2, len(ISLAND_FEATURES))
+    assert buffers["villagers"].shape == (2, 8, len(VILLAGER_FEATURES))
+    for index, env in enumerate(envs):
+        present = buffers["villagers"][index, :, 0]
+        assert present.sum() == len(env.villagers)
+        assert buffers["island"][index, 2] == env.bells
+        np.testing.assert_array_equal(
+            buffers["villagers"][index, : len(env.villagers), 1],
+            [v.friendship_level for v in env.villagers],
+        )
+
+
+def test_decode_targets_villager_slots_and_masks_self(envs):
+    env = envs[1]
+    decoder = ActionDecoder(max_villagers=8, max_tasks=20, max_plots=10)
+
+    talk = decoder.decode(env, 0, decoder.talk_offset + 2)
+    assert talk["type"] == "TALK_TO_VILLAGER"
+    assert talk["villager_name"] == env.villagers[0].name
+    assert talk["target_villager_name"] == env.villagers[2].name
+
+    assert decoder.decode(env, 0, decoder.gift_offset + 7) == {"type": "IDLE"}
+
+    mask = decoder.action_mask(env, 1)
+    assert not mask[decoder.talk_offset + 1]
+    assert mask[decoder.talk_offset + 0]
+    assert not mask[decoder.talk_offset + len(env.villagers)]
+
+
+def test_planted_plot_is_encoded_with_owner_slot(envs):
+    env = envs[0]
+    encoder = ObservationEncoder(max_villagers=8)
+    decoder = ActionDecoder(max_villagers=8)
+    env.step(decoder.decode(env, 1, decoder.plant_offset + 3), env.villagers[1])
+
+    plots = encoder.encode(env)["plots"][0]
+    assert plots[3, 0] == 1.0
+    assert plots[3, 3] == 2  # villager slot 1, stored as slot + 1
+    assert not decoder.action_mask(env, 1)[decoder.plant_offset + 3]
+
+
+def test_villager_counters_match_object_state(envs):
+    env = envs[1]
+    encoder = ObservationEncoder(max_villagers=8)
+    fisher = env.villagers[2]
+    for _ in range(3):
+        env.step({"type": "GO_FISHING"}, fisher)
+    fisher.add_to_inventory("Sea bass", 2)
+    fisher.log_sale("Sea bass", 1, 400, "Fish")
+
+    rows = encoder.encode(env)["villagers"][0]
+    columns = [VILLAGER_FEATURES.index(name) for name in VILLAGER_FEATURES[3:]]
+    for slot, villager in enumerate(env.villagers):
+        sold = villager.daily_activity_log["sold_items"]
+        assert list(rows[slot, columns]) == [
+            sum(villager.inventory.values()),
+            env.get_state()["fishing_attempts_today"].get(villager.name, 0),
+            sum(sale["quantity"] for sale in sold),
+        ]
+    assert rows[2, VILLAGER_FEATURES.index("fishing_attempts_today")] == 3
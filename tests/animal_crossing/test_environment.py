@@ -0,0 +1,143 @@
+import random
+
+import pytest
+
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+
+
+@pytest.fixture
+def make_env():
+    def _make(**kwargs):
+        random.seed(11)
+        env = ACNHEnvironment(num_villagers=4, **kwargs)
+        env.turnip_market_saturation_factor = 0.3
+        env.fish_market_saturation = {"Sea bass": 0.5, "Koi": 0.9}
+        return env
+
+    return _make
+
+
+def test_fast_forward_matches_daily_cycle_aggregates(make_env):
+    stepped = make_env(villager_addition_percentage=0.5)
+    for _ in range(10):
+        stepped.advance_day_cycle()
+
+    skipped = make_env(villager_addition_percentage=0.5)
+    summary = skipped.fast_forward(10)
+
+    assert summary["days_advanced"] == 10
+    assert len(summary["turnip_sell_prices"]) == 10
+    assert skipped.current_day == stepped.current_day
+    assert skipped.current_date == stepped.current_date
+    assert len(skipped.villagers) == len(stepped.villagers)
+    assert summary["villagers_added"] == len(skipped.villagers) - 4
+    assert skipped.turnip_market_saturation_factor == pytest.approx(
+        stepped.turnip_market_saturation_factor
+    )
+    assert skipped.fish_market_saturation.keys() == (
+        stepped.fish_market_saturation.keys()
+    )
+    # Prices are drawn from the same distribution; Sundays only have a buy price
+    for buy, sell in zip(summary["turnip_buy_prices"], summary["turnip_sell_prices"]):
+        assert (buy == 0) != (sell == 0)
+
+
+def test_fast_forward_stops_on_next_event(make_env):
+    env = make_env(villager_addition_percentage=0.0)
+    env.farm_plots[0].update(
+        {"crop_name": "Tomato", "plant_day": 0, "ready_day": 6, "owner_villager": "x"}
+    )
+
+    summary = env.fast_forward(30, stop_on_event=True)
+    assert summary["stopped_on"] == "crop_ready"
+    assert env.current_day == 6
+
+    summary = env.fast_forward(30, stop_on_event=True)
+    assert summary["stopped_on"] is None
+    assert env.current_day == 36
+
+
+def test_task_feasibility_follows_inventories(make_env):
+    env = make_env(villager_addition_percentage=0.0)
+    env.active_nook_tasks = {
+        "Anything": {"miles": 100},
+        "Tomatoes": {
+            "miles": 300,
+            "criteria": {"type": "collect_item", "item_name": "Tomato"},
+        },
+        "Unsupported": {"miles": 500, "criteria": {"category": "Fish"}},
+    }
+    env._reset_task_feasibility()
+    farmer, other = env.villagers[:2]
+    assert env.is_task_feasible(farmer.name, "Anything")
+    assert not env.is_task_feasible(farmer.name, "Tomatoes")
+    assert not env.is_task_feasible(farmer.name, "Unsupported")
+
+    env.farm_plots[0] = {
+        "crop_name": "Tomato",
+        "plant_day": 0,
+        "ready_day": 0,
+        "owner_villager": farmer.name,
+    }
+    env.step({"type": "HARVEST_CROP", "plot_id": 0}, farmer)
+    assert env.is_task_feasible(farmer.name, "Tomatoes")
+    assert not env.is_task_feasible(other.name, "Tomatoes")
+    assert env.get_state()["task_feasibility"] == env.task_feasibility
+
+    # Items taken outside step() (shipped away) update the mask as well
+    tomatoes = farmer.inventory["Tomato"]
+    assert env.remove_villager_items(farmer, "Tomato", tomatoes)
+    assert not env.is_task_feasible(farmer.name, "Tomatoes")
+    farmer.add_to_inventory("Tomato", tomatoes)  # Back for the task below
+    env._update_task_feasibility(farmer)
+
+    env.step({"type": "DO_NOOK_MILES_TASK", "task_name": "Unsupported"}, other)
+    env.step({"type": "DO_NOOK_MILES_TASK", "task_name": "Tomatoes"}, farmer)
+    assert env.wasted_task_steps == 1
+    assert not env.is_task_feasible(farmer.name, "Tomatoes")  # Completed
+
+
+def test_social_actions_build_decaying_bonds(make_env):
+    env = make_env(villager_addition_percentage=0.0)
+    actor, target = env.villagers[:2]
+    env.step({"type": "TALK_TO_VILLAGER", "target_villager_name": target.name}, actor)
+    store = env.villager_store
+    assert store.relationships[actor.slot, target.slot] == 5
+    assert store.relationships[target.slot, actor.slot] == 0
+    assert env.get_state()["avg_relationship"] == pytest.approx(5 / 12)
+
+    env.advance_day_cycle()
+    env.fast_forward(2)
+    assert store.relationships[actor.slot, target.slot] == pytest.approx(
+        5 * env.RELATIONSHIP_DAILY_DECAY**3
+    )
+
+
+def test_villagers_move_between_islands(make_env):
+    origin, destination = make_env(), make_env()
+    leaving, staying = origin.villagers[1], origin.villagers[2]
+    leaving.friendship_level = 77
+    leaving.add_to_inventory("Koi", 2)
+    origin.farm_plots[0].update(crop_name="Pumpkin", owner_villager=leaving.name)
+    origin._strengthen_bond(staying, leaving, 5)
+
+    moved = origin.remove_villager(leaving.name)
+
+    assert moved is leaving and leaving.name not in origin.task_feasibility
+    assert [v.slot for v in origin.villagers] == [0, 1, 2]
+    assert origin.villager_store.names == [v.name for v in origin.villagers]
+    assert staying.slot == 1 and origin.villager_store.relationship_total == 0
+    assert origin.farm_plots[0]["crop_name"] is None
+    assert moved.friendship_level == 77 and moved.store.size == 1
+
+    # Both islands are seeded alike, so the destination has its own namesake
+    with pytest.raises(ValueError):
+        destination.add_villager(moved)
+    destination.remove_villager(moved.name)
+    destination.add_villager(moved)
+    assert destination.villagers[-1] is moved
+    assert moved.store is destination.villager_store and moved.slot == 3
+    assert moved.friendship_level == 77 and moved.inventory == {"Koi": 2}
+    assert moved.name in destination.task_feasibility
+    with pytest.raises(ValueError):
+        origin.remove_villager(moved.name)
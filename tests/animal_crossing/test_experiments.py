@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from enigma_engines.animal_crossing.experiments import (
+    ExperimentTask,
+    build_tasks,
+    expand_grid,
+    load_task_metrics,
+    read_manifest,
+    run_experiments,
+    split_config,
+)
+
+
+def test_expand_grid_and_task_ids_are_stable():
+    grid = {"num_villagers": [3, 5], "agent.weights": [{"bells": 0.5}]}
+    assert expand_grid(grid) == [
+        {"num_villagers": 3, "agent.weights": {"bells": 0.5}},
+        {"num_villagers": 5, "agent.weights": {"bells": 0.5}},
+    ]
+
+    tasks = build_tasks(grid, seeds=[0, 1], days=4)
+    assert len(tasks) == 4
+    assert len({task.task_id for task in tasks}) == 4
+    assert tasks[0].task_id == ExperimentTask(tasks[0].config, 0, 4).task_id
+
+    env_params, agent_params, actions_per_day = split_config(
+        {"num_villagers": 3, "agent.weights": {"bells": 0.5}, "actions_per_day": 2}
+    )
+    assert env_params == {"num_villagers": 3}
+    assert agent_params == {"weights": {"bells": 0.5}}
+    assert actions_per_day == 2
+
+
+def test_run_experiments_writes_columns_and_resumes(tmp_path):
+    grid = {"num_villagers": [3], "villager_addition_percentage": [0.0]}
+    records = run_experiments(
+        grid, seeds=[0], days=3, results_dir=str(tmp_path), max_workers=1
+    )
+    assert len(records) == 1
+
+    # Metrics are streamed to a columnar directory named after the task
+    assert (tmp_path / records[0]["task_id"] / "meta.json").exists()
+    metrics = load_task_metrics(str(tmp_path), records[0]["task_id"])
+    np.testing.assert_array_equal(metrics["day"], [0, 1, 2])
+    assert metrics["bells"][-1] == records[0]["final_bells"]
+
+    # A second seed only runs the missing task; the first is read from the manifest
+    records = run_experiments(
+        grid, seeds=[0, 1], days=3, results_dir=str(tmp_path), max_workers=1
+    )
+    assert len(records) == 2
+    assert set(read_manifest(str(tmp_path))) == {r["task_id"] for r in records}
+
+
+def test_failed_task_does_not_drop_finished_tasks_from_the_manifest(tmp_path):
+    grid = {
+        "num_villagers": [3],
+        "villager_addition_percentage": [0.0],
+        "agent.weights": [{"bells": 0.5}, "not a weights dict"],
+    }
+    with pytest.raises(RuntimeError, match="1 of 2 experiment tasks failed"):
+        run_experiments(
+            grid, seeds=[0], days=2, results_dir=str(tmp_path), max_workers=1
+        )
+
+    recorded = read_manifest(str(tmp_path))
+    assert [record["config"]["agent.weights"] for record in recorded.values()] == [
+        {"bells": 0.5}
+    ]
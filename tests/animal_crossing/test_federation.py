@@ -0,0 +1,91 @@
+import os
+import signal
+
+import pytest
+
+from enigma_engines.animal_crossing.core.villager import ACNHVillager
+from enigma_engines.animal_crossing.federation import (
+    Federation,
+    IslandReport,
+    plan_exchange,
+)
+
+
+def _report(island_id, **fields):
+    defaults = dict(
+        island_id=island_id,
+        day=1,
+        bells=1000,
+        nook_miles=500,
+        avg_friendship=10.0,
+        villager_names=[f"V{island_id}"],
+        max_villagers=3,
+        turnips=0,
+        turnip_sell_price=100,
+        fish_surplus={},
+        fish_market={},
+        emigrant=None,
+        proceeds={},
+    )
+    return IslandReport(**{**defaults, **fields})
+
+
+def test_plan_exchange_routes_trade_migration_and_proceeds():
+    reports = [
+        _report(
+            0,
+            turnips=40,
+            fish_surplus={"Koi": 2, "Carp": 1},
+            fish_market={"Koi": 0.5},
+            proceeds={2: 900},
+        ),
+        _report(1, turnip_sell_price=300, villager_names=["Bob", "X", "Y"]),
+        _report(
+            2,
+            turnips=5,
+            turnip_sell_price=300,
+            fish_market={"Koi": 0.4},
+            emigrant=ACNHVillager("Bob"),
+        ),
+    ]
+
+    orders = plan_exchange(reports)
+
+    assert orders[2].credit_bells == 900
+    # Turnips go to the best price (lowest id on ties), never to an equal price
+    assert orders[0].ship_turnips == 40 and orders[2].ship_turnips == 0
+    assert orders[1].host_turnips == [(0, 40)]
+    # Saturated Koi goes to an unsaturated market; Carp sells at home
+    assert orders[0].ship_fish == {"Koi": 2, "Carp": 1}
+    assert orders[1].host_fish == [(0, "Koi", 2)]
+    assert orders[0].host_fish == [(0, "Carp", 1)]
+    # Bob cannot join island 1 (full, and a namesake lives there)
+    assert [v.name for v in orders[0].immigrants] == ["Bob"]
+    assert not orders[1].immigrants and not orders[2].immigrants
+
+
+def test_federation_trajectory_does_not_depend_on_sharding():
+    results = []
+    for processes in (0, 2):
+        with Federation(
+            3, processes=processes, num_villagers=4, migration_rate=0.5, fish_keep=0
+        ) as federation:
+            totals = federation.run(3)
+            results.append(
+                (
+                    totals["villagers"],
+                    [
+                        (report.bells, report.villager_names)
+                        for report in federation.reports
+                    ],
+                )
+            )
+    assert totals["island_days_per_second"] > 0
+    assert results[0] == results[1]
+
+
+def test_killed_worker_fails_the_day_instead_of_hanging():
+    with Federation(2, processes=1, num_villagers=3) as federation:
+        os.kill(federation._workers[0].pid, signal.SIGKILL)
+        with pytest.raises(RuntimeError, match="exited with code"):
+            federation.step_day()
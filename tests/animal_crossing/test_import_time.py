@@ -0,0 +1,88 @@
+import os
+import shutil
+import subprocess
+import sys
+
+from enigma_engines.animal_crossing.core.load_data import ACNHItemDataset
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+CORE_MODULES = (
+    "enigma_engines.animal_crossing.core.environment",
+    "enigma_engines.animal_crossing.core.agent",
+    "enigma_engines.animal_crossing.simulation",
+)
+HEAVY_MODULES = ("pandas", "rich", "matplotlib", "seaborn")
+# Import cost of our own modules, numpy excluded (the core needs it anyway).
+# It was ~360 ms while pandas and Rich were imported eagerly, ~25 ms since.
+IMPORT_BUDGET_US = 150_000
+
+
+def _run_python(code, *flags):
+    env = {**os.environ, "PYTHONPATH": REPO_ROOT}
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _import_time_us(stderr):
+    """Cumulative µs of the top-level `enigma_engines` imports."""
+    total = 0
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            if name.startswith(" enigma_engines"):
+                total += int(cumulative)
+    return total
+
+
+def test_core_modules_import_within_budget_and_without_heavy_dependencies():
+    code = (
+        # numpy is imported first so its cost is not charged to our modules
+        "import sys\nimport numpy\n"
+        + "".join(f"import {module}\n" for module in CORE_MODULES)
+        + f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    # The first run may write bytecode caches; keep the best of a few
+    runs = [_run_python(code, "-X", "importtime") for _ in range(3)]
+
+    assert runs[0].stdout.strip() == ""
+    elapsed_us = min(_import_time_us(run.stderr) for run in runs)
+    assert 0 < elapsed_us < IMPORT_BUDGET_US
+
+
+def test_dataset_snapshot_skips_pandas_until_a_csv_changes(
+    tmp_path, dataset_snapshot_dir
+):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for name in os.listdir(os.path.join(REPO_ROOT, "data")):
+        if name.endswith(".csv"):
+            shutil.copy(os.path.join(REPO_ROOT, "data", name), data_dir)
+
+    csv_names = sorted(os.listdir(data_dir))
+    parsed = ACNHItemDataset(data_path=str(data_dir))
+    # The snapshot goes to the cache directory, never into the data path
+    assert os.path.dirname(parsed.snapshot_path) == str(dataset_snapshot_dir)
+    assert os.path.exists(parsed.snapshot_path)
+    assert sorted(os.listdir(data_dir)) == csv_names
+
+    code = (
+        "import sys\n"
+        "from enigma_engines.animal_crossing.core.load_data import ACNHItemDataset\n"
+        f"dataset = ACNHItemDataset(data_path={str(data_dir)!r})\n"
+        "print('pandas' in sys.modules, len(dataset.gift_options))"
+    )
+    assert _run_python(code).stdout.split() == [
+        "False",
+        str(len(parsed.gift_options)),
+    ]
+
+    crops = data_dir / "crops.csv"
+    crops.write_text(crops.read_text() + "Turnip,7,100,90,1\n")
+    assert _run_python(code).stdout.split()[0] == "True"
+    assert "Turnip" in ACNHItemDataset(data_path=str(data_dir)).crop_definitions
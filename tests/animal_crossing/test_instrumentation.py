@@ -0,0 +1,38 @@
+import random
+
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+from enigma_engines.animal_crossing.core.instrumentation import LatencyHistogram
+
+
+def test_histogram_buckets_and_percentiles():
+    histogram = LatencyHistogram()
+    for elapsed_ns in [100] * 90 + [5000] * 10:
+        histogram.record(elapsed_ns)
+
+    summary = histogram.to_dict()
+    assert summary["count"] == 100
+    assert summary["min_ns"] == 100 and summary["max_ns"] == 5000
+    assert summary["p50_ns"] == 128  # upper edge of the [64, 128) bucket
+    assert summary["p99_ns"] == 5000  # clamped to the observed maximum
+    assert summary["buckets"] == {"128": 90, "8192": 10}
+
+
+def test_environment_instrumentation_is_opt_in():
+    random.seed(0)
+    plain = ACNHEnvironment(num_villagers=3, villager_addition_percentage=0.0)
+    assert plain.instrumentation is None
+    assert "step" not in vars(plain)  # the class method, no wrapper
+
+    env = ACNHEnvironment(
+        num_villagers=3, villager_addition_percentage=0.0, instrument=True
+    )
+    actor = env.villagers[0]
+    env.step({"type": "WORK_FOR_BELLS_ISLAND", "villager_name": actor.name}, actor)
+    env.step({"type": "IDLE"})
+    env.advance_day_cycle()
+
+    exported = env.instrumentation.to_dict()
+    assert exported["actions"]["WORK_FOR_BELLS_ISLAND"]["count"] == 1
+    assert exported["actions"]["IDLE"]["count"] == 1
+    assert exported["phases"]["day.total"]["count"] == 1
+    assert "day.assign_nook_tasks" in exported["phases"]
@@ -0,0 +1,40 @@
+import numpy as np
+
+from enigma_engines.animal_crossing.core.metrics_sink import (
+    MetricsReader,
+    MetricsWriter,
+)
+
+
+def test_writer_streams_chunks_and_reader_maps_columns(tmp_path):
+    directory = str(tmp_path / "metrics")
+    with MetricsWriter(directory, chunk_size=4) as writer:
+        for day in range(10):
+            writer.append(friendship=day / 2, bells=day * 100, nook_miles=day)
+            # Only the current chunk is buffered; full chunks are on disk
+            assert writer.rows == (day + 1) // 4 * 4
+
+    reader = MetricsReader(directory)
+    assert len(reader) == 10
+    assert isinstance(reader["bells"], np.memmap)
+    np.testing.assert_array_equal(reader["bells"], np.arange(10) * 100)
+    assert reader.get("missing") is None and "friendship" in reader
+
+    summary = reader.summary()
+    assert summary["bells"] == {"min": 0, "max": 900, "mean": 450.0, "last": 900}
+    assert summary["friendship"]["last"] == 4.5
+
+
+def test_resume_truncates_to_committed_rows(tmp_path):
+    directory = str(tmp_path / "metrics")
+    writer = MetricsWriter(directory, chunk_size=2)
+    for day in range(6):
+        writer.append(friendship=0.0, bells=day, nook_miles=0)
+    writer.close()
+
+    # Resume as if a checkpoint had been taken after 4 rows
+    writer = MetricsWriter(directory, chunk_size=2, resume_rows=4)
+    writer.append(friendship=0.0, bells=40, nook_miles=0)
+    writer.close()
+
+    np.testing.assert_array_equal(MetricsReader(directory)["bells"], [0, 1, 2, 3, 40])
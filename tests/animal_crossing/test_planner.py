@@ -0,0 +1,66 @@
+import pickle
+import random
+
+import pytest
+
+from enigma_engines.animal_crossing.core.agent import (
+    ACTION_TYPES,
+    Multi_Objective_Agent,
+)
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+from enigma_engines.animal_crossing.core.planner import (
+    RolloutPlanner,
+    action_key,
+    run_rollout,
+)
+from enigma_engines.animal_crossing.simulation import run_day
+
+
+@pytest.fixture
+def env_and_agent():
+    random.seed(0)
+    env = ACNHEnvironment(num_villagers=5)
+    agent = Multi_Objective_Agent(dataset=env.dataset, num_villagers_on_island=5)
+    return env, agent
+
+
+def test_planner_decides_without_touching_live_state(env_and_agent):
+    env, agent = env_and_agent
+    planner = RolloutPlanner(env, agent, horizon_days=1, rollout_budget=6)
+    state = env.get_state()
+    actor = env.villagers[0].name
+
+    env_before = pickle.dumps(env)
+    action = planner.choose_action(state, env.villagers, actor)
+
+    assert action["type"] in ACTION_TYPES or action["type"] == "IDLE"
+    assert pickle.dumps(env) == env_before
+    assert agent.villager_last_action_details[actor] == action
+    assert planner.stats.decisions == 1
+    assert planner.stats.rollouts <= 6
+    if planner.stats.planned_decisions:
+        # Statistics are kept for reuse by the next decision
+        assert (actor, action_key(action)) in planner.action_stats
+
+
+def test_planner_runs_days_with_worker_processes(env_and_agent):
+    env, agent = env_and_agent
+    with RolloutPlanner(
+        env, agent, horizon_days=1, rollout_budget=4, max_workers=2
+    ) as planner:
+        actions, state = run_day(env, planner, 5)
+    assert len(actions) == 5
+    assert state["current_day"] == 0 and env.current_day == 1
+    stats = planner.stats.to_dict()
+    assert stats["decisions"] == 5
+    assert stats["decisions_per_second"] > 0
+
+
+def test_rollout_lets_pending_villagers_act_before_the_day_ends(env_and_agent):
+    env, agent = env_and_agent
+    actor, *others = [v.name for v in env.villagers]
+    run_rollout(
+        env, agent, actor, {"type": "IDLE"}, 1, seed=1, pending_names=others[:2]
+    )
+    assert env.current_day == 1
+    assert set(agent.villager_last_action_details) == {actor, *others[:2]}
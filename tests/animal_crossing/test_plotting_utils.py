@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from enigma_engines.animal_crossing.plotting_utils import (
+    downsample,
+    plot_multiple_runs,
+    plot_simulation_results,
+)
+
+
+@pytest.fixture(scope="module")
+def series():
+    rng = np.random.default_rng(0)
+    values = np.cumsum(rng.normal(size=50_000))
+    values[12_345] = values.max() + 100  # an isolated spike must survive
+    return values
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsample_respects_budget_and_keeps_extremes(series, method):
+    days, values = downsample(series, max_points=500, method=method)
+    assert len(values) <= 500
+    assert np.all(np.diff(days) > 0)
+    assert values.max() == series.max()
+    assert days[0] == 1 or method == "minmax"
+
+
+def test_headless_export_of_single_and_multiple_runs(tmp_path, series):
+    log = {"bells": series, "nook_miles": series, "friendship": series}
+    plot_simulation_results(log, output_path=str(tmp_path / "run.svg"))
+    plot_multiple_runs([log, log], output_path=str(tmp_path / "runs.png"))
+    assert (tmp_path / "run.svg").stat().st_size > 0
+    assert (tmp_path / "runs.png").stat().st_size > 0
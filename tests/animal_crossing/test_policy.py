@@ -0,0 +1,70 @@
+import random
+
+import numpy as np
+import pytest
+
+from enigma_engines.animal_crossing.core.agent import ACTION_TYPES
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+from enigma_engines.animal_crossing.core.policy import (
+    POLICY_FEATURES,
+    LinearQPolicy,
+    fit_linear_q,
+    train_distilled_policy,
+)
+from enigma_engines.animal_crossing.simulation import run_day
+
+
+@pytest.fixture(scope="module")
+def trained():
+    return train_distilled_policy(
+        num_episodes=2, eval_episodes=1, num_villagers=4, days=3, seed=5
+    )
+
+
+def test_fit_linear_q_recovers_linear_targets():
+    rng = np.random.default_rng(0)
+    features = rng.normal(2.0, 3.0, size=(200, 4))
+    targets = np.full((200, 3), np.nan)
+    targets[:, 0] = features @ [1.0, -2.0, 0.5, 0.0] + 3.0
+    targets[::2, 1] = 1.0  # Observed on half the rows only
+    weights, bias = fit_linear_q(features, targets, ridge=1e-6)
+
+    np.testing.assert_allclose(weights[0], [1.0, -2.0, 0.5, 0.0], atol=1e-5)
+    assert bias[0] == pytest.approx(3.0, abs=1e-4)
+    np.testing.assert_allclose(features @ weights[1] + bias[1], 1.0, atol=1e-6)
+    # Never-observed actions rank below every observed target
+    assert not weights[2].any() and bias[2] < targets[:, 0].min()
+
+
+def test_training_is_independent_of_worker_count(trained):
+    policy, report = trained
+    parallel, parallel_report = train_distilled_policy(
+        num_episodes=2,
+        eval_episodes=1,
+        num_villagers=4,
+        days=3,
+        seed=5,
+        max_workers=2,
+    )
+    assert policy.weights.shape == (len(ACTION_TYPES), len(POLICY_FEATURES))
+    np.testing.assert_array_equal(policy.weights, parallel.weights)
+    np.testing.assert_array_equal(policy.bias, parallel.bias)
+    assert report["train_samples"] == parallel_report["train_samples"] > 0
+    assert 0.0 <= report["eval_agreement"] <= 1.0
+
+
+def test_policy_plays_days_and_round_trips(trained, tmp_path):
+    policy, _ = trained
+    path = tmp_path / "policy.npz"
+    policy.save(str(path))
+    loaded = LinearQPolicy.load(str(path), policy.dataset)
+    np.testing.assert_array_equal(loaded.weights, policy.weights)
+
+    random.seed(9)
+    env = ACNHEnvironment(num_villagers=5, dataset=policy.dataset)
+    with pytest.raises(RuntimeError):
+        run_day(env, loaded, 5)
+    actions, _ = run_day(env, loaded.attach(env), 5)
+    assert len(actions) == 5
+    assert all(action["type"] in ACTION_TYPES for action in actions)
+    assert env.current_day == 1
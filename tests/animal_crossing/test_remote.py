@@ -0,0 +1,97 @@
+import asyncio
+import random
+
+import numpy as np
+import pytest
+
+from enigma_engines.animal_crossing.core.encoding import ObservationEncoder
+from enigma_engines.animal_crossing.core.environment import ACNHEnvironment
+from enigma_engines.animal_crossing.remote.client import (
+    EnvironmentClient,
+    RemoteEnvironmentError,
+    make_steps,
+)
+from enigma_engines.animal_crossing.remote.protocol import ADVANCE_DAY_ACTION
+from enigma_engines.animal_crossing.remote.server import EnvironmentServer
+
+MAX_VILLAGERS = 16
+
+
+@pytest.fixture(scope="module")
+def env_server():
+    return EnvironmentServer(max_villagers=MAX_VILLAGERS, max_batch_steps=64)
+
+
+def test_pipelined_steps_match_local_environment(env_server, tmp_path):
+    rng = np.random.default_rng(0)
+    batches = [
+        make_steps([0] * 4, rng.integers(0, 4, 4), rng.integers(0, 60, 4))
+        for _ in range(5)
+    ]
+    batches[2]["action_id"][1] = ADVANCE_DAY_ACTION
+
+    async def run():
+        server = await env_server.start(path=str(tmp_path / "acnh.sock"))
+        async with server:
+            client = await EnvironmentClient.connect(path=env_server.address)
+            async with client:
+                env_id, first = await client.create(4, seed=3)
+                batches_for_env = [batch.copy() for batch in batches]
+                for batch in batches_for_env:
+                    batch["env_id"] = env_id
+                # Every batch is written before any reply is read
+                replies = await asyncio.gather(
+                    *(client.step(batch) for batch in batches_for_env)
+                )
+                await client.close_env(env_id)
+                return first, replies
+
+    first, replies = asyncio.run(run())
+
+    random.seed(3)
+    env = ACNHEnvironment(
+        num_villagers=4,
+        dataset=env_server.dataset,
+        villager_addition_percentage=0.2,
+        max_total_villagers=MAX_VILLAGERS,
+    )
+    encoder = ObservationEncoder(max_villagers=MAX_VILLAGERS)
+    np.testing.assert_array_equal(first["villagers"], encoder.encode(env)["villagers"])
+    for batch, (rewards, observations) in zip(batches, replies):
+        assert len(rewards) == len(batch)
+        for row, (_, actor_slot, action_id) in enumerate(batch.tolist()):
+            if action_id == ADVANCE_DAY_ACTION:
+                env.step({"type": "ADVANCE_DAY"})
+            else:
+                action = env_server.decoder.decode(env, actor_slot, action_id)
+                if action["type"] != "IDLE":
+                    env.step(action, env.villagers[actor_slot])
+            expected = encoder.encode(env)
+            for key, value in expected.items():
+                np.testing.assert_array_equal(observations[key][row], value[0])
+    assert env_server.environments == {}
+
+
+def test_errors_are_reported_without_dropping_the_connection(env_server):
+    async def run():
+        server = await env_server.start(port=0)
+        async with server:
+            host, port = env_server.address.rsplit(":", 1)
+            async with await EnvironmentClient.connect(
+                host=host, port=int(port)
+            ) as client:
+                env_id, _ = await client.create(3, seed=1)
+                with pytest.raises(RemoteEnvironmentError, match="Unknown environment"):
+                    await client.step([(env_id, 0, 0), (env_id + 99, 0, 0)])
+                with pytest.raises(RemoteEnvironmentError, match="no villager"):
+                    await client.step([(env_id, 7, 0)])
+                too_many = [(env_id, 0, 0)] * (env_server.max_batch_steps + 1)
+                with pytest.raises(RemoteEnvironmentError, match="exceeds the limit"):
+                    await client.step(too_many)
+                talk_to_slot_1 = env_server.decoder.talk_offset + 1
+                rewards, observations = await client.step([(env_id, 0, talk_to_slot_1)])
+                assert rewards["friendship"][0] == pytest.approx(5 / 3)
+                assert observations["island"].shape == (1, client.shapes["island"][0])
+                return env_server.environments[env_id].current_day
+
+    assert asyncio.run(run()) == 0
@@ -0,0 +1,17 @@
+import io
+
+import pytest
+from rich.console import Console
+
+from enigma_engines.animal_crossing.rendering import BackgroundRenderer
+
+
+def test_render_error_is_reraised_instead_of_blocking_the_loop():
+    renderer = BackgroundRenderer(Console(file=io.StringIO()), None, max_pending=1)
+
+    # A state without the expected keys makes the progress line raise KeyError
+    with pytest.raises(KeyError):
+        for day_idx in range(100):
+            renderer.submit("progress", {}, day_idx)
+    with pytest.raises(KeyError):
+        renderer.close()
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from enigma_engines.animal_crossing.experiments import run_experiments
+from enigma_engines.animal_crossing.tuning import (
+    CHECKPOINT_DIRNAME,
+    config_id,
+    read_leaderboard,
+    run_tuning,
+    sample_configurations,
+)
+
+
+def test_sample_configurations_is_seeded_and_starts_from_defaults():
+    configs = sample_configurations(4, seed=3)
+    assert configs == sample_configurations(4, seed=3)
+    assert configs[0] == {}
+    for params in configs[1:]:
+        assert sum(params["weights"].values()) == pytest.approx(1.0, abs=0.01)
+        assert 30 <= params["friendship_target_min"] <= 100
+        assert 0.0 <= params["PLANTER_FOCUS_PERCENTAGE"] <= 0.5
+    assert len({config_id(params) for params in configs}) == 4
+
+
+def test_successive_halving_keeps_the_best_and_continues_exactly(tmp_path):
+    configs = [
+        {},
+        {"weights": {"friendship": 0.1, "bells": 0.1, "nook_miles": 0.8}},
+        {"FORCE_GIFT_SCORE_BONUS_FACTOR": 1.0, "friendship_target_min": 30},
+    ]
+    env_params = {"num_villagers": 3, "villager_addition_percentage": 0.0}
+    board = run_tuning(
+        str(tmp_path / "tuning"),
+        configs=configs,
+        seeds=[0],
+        rung_days=(1, 3),
+        reduction_factor=3,
+        env_params=env_params,
+        max_workers=2,
+    )
+    assert board == read_leaderboard(str(tmp_path / "tuning"))
+    assert [entry["days"] for entry in board] == [3, 1, 1]
+    assert board[1]["objective"] >= board[2]["objective"]
+    checkpoints = os.listdir(tmp_path / "tuning" / CHECKPOINT_DIRNAME)
+    assert checkpoints == [f"{board[0]['config_id']}_0.ckpt"]
+
+    # Resuming from the rung checkpoint matches an uninterrupted 3-day run
+    winner = board[0]["params"]
+    grid = {key: [value] for key, value in env_params.items()}
+    grid.update({f"agent.{key}": [value] for key, value in winner.items()})
+    (record,) = run_experiments(
+        grid, seeds=[0], days=3, results_dir=str(tmp_path / "direct"), max_workers=1
+    )
+    assert board[0]["bells"] == record["final_bells"]
+    assert board[0]["nook_miles"] == record["final_nook_miles"]
+    assert board[0]["avg_friendship"] == pytest.approx(record["final_avg_friendship"])
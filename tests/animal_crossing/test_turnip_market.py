@@ -0,0 +1,35 @@
+import numpy as np
+
+from enigma_engines.animal_crossing.core.turnip_market import (
+    SATURDAY,
+    SUNDAY,
+    TurnipExpectationTable,
+    load_or_build_turnip_table,
+)
+
+
+def test_continuation_values_shrink_through_the_week():
+    table = TurnipExpectationTable.build(num_samples=2000, num_buckets=11)
+    assert np.all(table.values[SATURDAY] == 0)
+    # Fewer remaining days can only lower the value of holding
+    for weekday in range(SATURDAY):
+        assert np.all(table.values[weekday] >= table.values[weekday + 1])
+    assert np.all(table.values[SUNDAY] >= table.values[0])
+    # A saturated market is worth less than a recovered one
+    assert table.expected_best_remaining(0, 0.2) < table.expected_best_remaining(0, 1.0)
+
+
+def test_lookup_clips_out_of_range_saturation():
+    table = TurnipExpectationTable.build(num_samples=500, num_buckets=5)
+    assert table.expected_best_remaining(2, -3.0) == table.values[2, 0]
+    assert table.expected_best_remaining(2, 9.0) == table.values[2, -1]
+
+
+def test_table_is_cached_and_rebuilt_when_params_change(tmp_path):
+    path = str(tmp_path / "turnips.npz")
+    built = load_or_build_turnip_table(path, num_samples=500, num_buckets=5)
+    loaded = load_or_build_turnip_table(path, num_samples=500, num_buckets=5)
+    np.testing.assert_array_equal(built.values, loaded.values)
+
+    rebuilt = load_or_build_turnip_table(path, num_samples=500, num_buckets=7)
+    assert rebuilt.values.shape == (7, 7)
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from enigma_engines.animal_crossing.core.villager import ACNHVillager
+from enigma_engines.animal_crossing.core.villager_store import VillagerStore
+
+
+def test_proxies_read_and_write_store_columns():
+    store = VillagerStore(capacity=1)
+    villagers = [ACNHVillager(name, store=store) for name in ("Audie", "Raymond")]
+    assert store.capacity >= 2  # grew past the initial capacity
+    assert [v.slot for v in villagers] == [0, 1]
+
+    villagers[0].friendship_level = 40
+    assert villagers[1].receive_gift({"friendship_points": 3}, current_day=2) == 3
+    assert villagers[1].receive_gift({"friendship_points": 3}, current_day=2) == 0
+
+    np.testing.assert_array_equal(store.friendship[: store.size], [40, 13])
+    assert store.mean_friendship() == 26.5
+    assert store.friendship_by_name() == {"Audie": 40, "Raymond": 13}
+    np.testing.assert_array_equal(store.gifted_on(2), [False, True])
+    np.testing.assert_array_equal(store.friendship_urgency(20), [1.0, 5])
+
+    standalone = ACNHVillager("Marshal")
+    assert standalone.store is not store and standalone.friendship_level == 10
+
+
+def test_daily_logs_reset_by_epoch():
+    store = VillagerStore()
+    villager = ACNHVillager("Audie", store=store)
+    villager.log_sale("Sea bass", 2, 800, "Fish")
+    assert len(villager.daily_activity_log["sold_items"]) == 1
+
+    store.reset_daily_logs()
+    assert villager.daily_activity_log == {"sold_items": []}
+
+
+def test_lowest_friendship_slots_excludes_actor_and_breaks_ties_by_slot():
+    store = VillagerStore()
+    for name, friendship in [("A", 50), ("B", 10), ("C", 30), ("D", 10), ("E", 90)]:
+        store.allocate(name, friendship=friendship)
+
+    np.testing.assert_array_equal(store.lowest_friendship_slots(3), [1, 3, 2])
+    np.testing.assert_array_equal(
+        store.lowest_friendship_slots(3, exclude_slot=1), [3, 2, 0]
+    )
+    assert len(store.lowest_friendship_slots(10, exclude_slot=0)) == 4
+
+
+def test_relationship_matrix_ranks_decays_and_aggregates():
+    store = VillagerStore(capacity=2)
+    for name, friendship in [("A", 50), ("B", 10), ("C", 30), ("D", 10)]:
+        store.allocate(name, friendship=friendship)
+    assert store.relationships.shape[0] >= store.size
+
+    # No bonds yet: neglect ties fall back to friendship, then slot
+    np.testing.assert_array_equal(
+        store.most_neglected(0, 3), store.lowest_friendship_slots(3, exclude_slot=0)
+    )
+    np.testing.assert_array_equal(store.most_neglected(0, 1), [1])
+    store.add_relationship(0, 1, 8)
+    store.add_relationship(0, 2, 3)
+    store.add_relationship(3, 0, 4)
+    store.add_relationship(2, 2, 99)  # Self-bonds are ignored
+    np.testing.assert_array_equal(store.best_friends(0, 2), [1, 2])
+    np.testing.assert_array_equal(store.most_neglected(0, 3), [3, 2, 1])
+    # Single picks skip the sort but rank the same way
+    np.testing.assert_array_equal(store.best_friends(0, 1), [1])
+    np.testing.assert_array_equal(store.most_neglected(0, 1), [3])
+
+    store.decay_relationships(0.5)
+    assert store.relationships[0, 1] == 4
+    np.testing.assert_allclose(store.relationships_given(), [5.5 / 3, 0, 0, 2 / 3])
+    np.testing.assert_allclose(store.relationships_received(), [2 / 3, 4 / 3, 0.5, 0])
+    assert store.mean_relationship() == pytest.approx(7.5 / 12)
+
+
+def test_remove_compacts_columns_and_relationships():
+    store = VillagerStore(capacity=4)
+    villagers = [ACNHVillager(name, store=store) for name in ("A", "B", "C")]
+    for index, villager in enumerate(villagers):
+        villager.friendship_level = 10 * (index + 1)
+    store.add_relationship(0, 1, 1.0)
+    store.add_relationship(1, 2, 2.0)
+    store.add_relationship(2, 0, 4.0)
+
+    store.remove(1)
+
+    assert store.size == 2
+    assert store.names == ["A", "C"]
+    assert store.friendship[:2].tolist() == [10, 30]
+    np.testing.assert_array_equal(
+        store.relationships[:3, :3], [[0, 0, 0], [4, 0, 0], [0, 0, 0]]
+    )
+    assert store.relationship_total == pytest.approx(4.0)
+    with pytest.raises(ValueError):
+        store.remove(2)
+
+
+def test_counter_columns_follow_inventory_sales_and_removal():
+    store = VillagerStore(capacity=1)
+    audie, raymond = (ACNHVillager(name, store=store) for name in ("Audie", "Raymond"))
+    audie.add_to_inventory("Sea bass", 3)
+    raymond.add_to_inventory("Koi", 2)
+    assert audie.remove_from_inventory("Sea bass", 2)
+    audie.log_sale("Sea bass", 2, 800, "Fish")
+    store.fishing_attempts[1] = 4
+    np.testing.assert_array_equal(store.inventory_items[:2], [1, 2])
+    np.testing.assert_array_equal(store.items_sold[:2], [2, 0])
+    assert store.fishing_attempts_by_name() == {"Raymond": 4}
+
+    store.reset_daily_logs()
+    np.testing.assert_array_equal(store.items_sold[:2], [0, 0])
+    assert store.fishing_attempts_by_name() == {}
+    assert audie.inventory == {"Sea bass": 1}
+
+    store.remove(0)
+    raymond.slot -= 1
+    raymond.inventory = {"Koi": 5, "Tuna": 1}
+    np.testing.assert_array_equal(store.inventory_items[:1], [6])